@@ -1,14 +1,35 @@
-from .job_parser import parse_job_posting
-from .optimizer import optimize_resume
-from .combined_reviewer import combined_review, compute_ats_score
-from .name_extractor import extract_name
-from .hallucination_detector import detect_hallucinations
-
-__all__ = [
-    "parse_job_posting",
-    "optimize_resume",
-    "combined_review",
-    "compute_ats_score",
-    "extract_name",
-    "detect_hallucinations",
-]
+"""LLM agents.
+
+Imported on first attribute access (PEP 562): pydantic-ai and the provider
+SDKs are only loaded once an agent is actually used.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .combined_reviewer import combined_review, compute_ats_score
+    from .hallucination_detector import detect_hallucinations
+    from .job_parser import parse_job_posting
+    from .name_extractor import extract_name
+    from .optimizer import optimize_resume
+
+_LAZY = {
+    "parse_job_posting": ".job_parser",
+    "optimize_resume": ".optimizer",
+    "combined_review": ".combined_reviewer",
+    "compute_ats_score": ".combined_reviewer",
+    "extract_name": ".name_extractor",
+    "detect_hallucinations": ".hallucination_detector",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = list(_LAZY)
@@ -3,9 +3,10 @@ from datetime import date
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 
+from hr_breaker.agents.factory import cached_agent
 from hr_breaker.config import get_model_settings
 from hr_breaker.models import FilterResult, OptimizedResume
-from hr_breaker.provider import get_agent_model
+from hr_breaker.provider import get_agent_model, hedgeable
 
 
 class AIGeneratedResult(BaseModel):
@@ -69,6 +70,7 @@ When listing indicators, quote specific problematic text.
 """
 
 
+@cached_agent
 def get_ai_generated_agent() -> Agent:
     agent = Agent(
         get_agent_model(),
@@ -96,16 +98,18 @@ async def detect_ai_generated(optimized: OptimizedResume) -> FilterResult:
     else:
         content = "(no content)"
 
+    # Instructions before the resume: only the resume varies between calls
     prompt = f"""Analyze this resume text for signs of AI generation.
+Look for patterns that indicate AI generation while ignoring normal resume conventions.
 
 === RESUME TEXT ===
 {content}
-=== END ===
-
-Look for patterns that indicate AI generation while ignoring normal resume conventions."""
+=== END ==="""
 
     agent = get_ai_generated_agent()
-    result = await agent.run(prompt)
+    # Always on the pro model: a flash "pass" would weaken this gate
+    with hedgeable():
+        result = await agent.run(prompt)
     r = result.output
 
     issues = []
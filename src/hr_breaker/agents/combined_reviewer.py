@@ -1,12 +1,13 @@
 from datetime import date
 
-import fitz
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent, BinaryContent, PromptedOutput
 
+from hr_breaker.agents.factory import cached_agent
 from hr_breaker.config import get_model_settings
-from hr_breaker.models import JobPosting, OptimizedResume
-from hr_breaker.provider import get_vision_model
+from hr_breaker.executor import run_cpu
+from hr_breaker.models import JobPosting, OptimizedResume, RenderResult, ResumeData
+from hr_breaker.provider import get_vision_model, prompt_cache_settings
 from hr_breaker.services.renderer import get_renderer, RenderError
 
 
@@ -136,6 +137,7 @@ Return ALL fields:
 """
 
 
+@cached_agent
 def get_combined_reviewer_agent() -> Agent:
     agent = Agent(
         get_vision_model(),
@@ -158,6 +160,8 @@ def pdf_to_image(pdf_bytes: bytes) -> tuple[bytes, int]:
 
     Returns (image_bytes, page_count).
     """
+    import fitz
+
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
     try:
         page_count = len(doc)
@@ -168,6 +172,13 @@ def pdf_to_image(pdf_bytes: bytes) -> tuple[bytes, int]:
         doc.close()
 
 
+def _render(content: str | ResumeData) -> RenderResult:
+    renderer = get_renderer()
+    if isinstance(content, str):
+        return renderer.render(content)
+    return renderer.render_data(content)
+
+
 async def combined_review(
     optimized: OptimizedResume,
     job: JobPosting,
@@ -181,15 +192,10 @@ async def combined_review(
     Returns (result, pdf_bytes, page_count, render_warnings).
     pdf_bytes is None if rendering failed.
     """
-    renderer = get_renderer()
-
-    # Render PDF
+    # Render PDF (off the event loop)
     content = optimized.html if optimized.html is not None else optimized.data
     try:
-        if isinstance(content, str):
-            render_result = renderer.render(content)
-        else:
-            render_result = renderer.render_data(content)
+        render_result = await run_cpu(_render, content)
         pdf_bytes = render_result.pdf_bytes
         render_warnings = render_result.warnings
         page_count = render_result.page_count
@@ -213,7 +219,7 @@ async def combined_review(
 
     # Convert to image
     try:
-        image_bytes, page_count = pdf_to_image(pdf_bytes)
+        image_bytes, page_count = await run_cpu(pdf_to_image, pdf_bytes)
     except Exception as e:
         return (
             CombinedReviewResult(
@@ -242,9 +248,13 @@ async def combined_review(
     else:
         resume_text = "(no content)"
 
-    # Build prompt with both image and text
+    # Stable prefix (instructions, job) first, then this iteration's resume,
+    # so the provider can reuse its prompt cache across iterations
     prompt = f"""COMBINED RESUME REVIEW
 
+Perform BOTH visual quality check AND ATS screening. Return all fields.
+The resume text is for ATS evaluation, the attached image for visual evaluation.
+
 === JOB POSTING ===
 Position: {job.title}
 Company: {job.company}
@@ -259,8 +269,6 @@ Keywords: {', '.join(job.keywords)}
 
 === RESUME IMAGE (for visual evaluation) ===
 See attached image.
-
-Perform BOTH visual quality check AND ATS screening. Return all fields.
 """
 
     agent = get_combined_reviewer_agent()
@@ -268,7 +276,8 @@ Perform BOTH visual quality check AND ATS screening. Return all fields.
         [
             prompt,
             BinaryContent(data=image_bytes, media_type="image/png"),
-        ]
+        ],
+        model_settings=prompt_cache_settings(f"reviewer:{job.title}@{job.company}"),
     )
 
     return result.output, pdf_bytes, page_count, render_warnings
@@ -0,0 +1,59 @@
+"""Build each agent once and reuse it across calls.
+
+Constructing an Agent resolves the provider model, builds the output schema
+and registers tools, so agent getters are wrapped in cached_agent(): the
+agent is built once per (getter arguments, settings, model resolution) and
+shared. Per-run context goes through deps (see OptimizerDeps), never
+closures, so a cached agent is safe to run concurrently.
+"""
+
+import functools
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import ParamSpec
+
+from pydantic_ai import Agent
+
+from hr_breaker.config import settings_version
+from hr_breaker.provider import model_version
+
+P = ParamSpec("P")
+
+MAX_CACHED_AGENTS = 64
+
+_agents: OrderedDict[tuple, Agent] = OrderedDict()
+_lock = threading.Lock()
+
+
+def cached_agent(build: Callable[P, Agent]) -> Callable[P, Agent]:
+    """Decorator: memoize an agent getter (arguments must be hashable)."""
+
+    @functools.wraps(build)
+    def get(*args: P.args, **kwargs: P.kwargs) -> Agent:
+        key = (
+            build.__qualname__,
+            args,
+            tuple(sorted(kwargs.items())),
+            settings_version(),
+            model_version(),
+        )
+        with _lock:
+            agent = _agents.get(key)
+            if agent is not None:
+                _agents.move_to_end(key)
+                return agent
+        agent = build(*args, **kwargs)
+        with _lock:
+            # A concurrent first call may have built it too; keep the first
+            agent = _agents.setdefault(key, agent)
+            while len(_agents) > MAX_CACHED_AGENTS:
+                _agents.popitem(last=False)
+        return agent
+
+    return get
+
+
+def clear_agent_cache() -> None:
+    with _lock:
+        _agents.clear()
@@ -3,9 +3,10 @@ from datetime import date
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 
+from hr_breaker.agents.factory import cached_agent
 from hr_breaker.config import get_model_settings
 from hr_breaker.models import FilterResult, OptimizedResume, ResumeSource
-from hr_breaker.provider import get_agent_model
+from hr_breaker.provider import get_agent_model, hedgeable, prompt_cache_settings
 
 
 class HallucinationResult(BaseModel):
@@ -86,6 +87,7 @@ BLOCK (score below 0.5):
 """
 
 
+@cached_agent
 def get_hallucination_agent(no_shame: bool = False) -> Agent:
     prompt = LENIENT_PROMPT if no_shame else STRICT_PROMPT
     agent = Agent(
@@ -116,22 +118,30 @@ async def detect_hallucinations(
     else:
         optimized_content = "(no content)"
 
+    # Stable prefix (instructions, original) first, then this iteration's
+    # resume, so the provider can reuse its prompt cache across iterations
     prompt = f"""Compare these two resumes and score the optimized version for hallucinations.
 
+Return a no_hallucination_score (0.0-1.0) based on how faithful the optimized version is to the original.
+List any concerns but remember: light assumptions about related technologies are acceptable.
+
 === ORIGINAL RESUME (source of truth, may include commented-out content which is valid) ===
 {source.content}
 
 === OPTIMIZED RESUME (check for fabrication) ===
 {optimized_content}
 
-=== END ===
-
-Return a no_hallucination_score (0.0-1.0) based on how faithful the optimized version is to the original.
-List any concerns but remember: light assumptions about related technologies are acceptable."""
+=== END ==="""
 
     threshold = 0.6 if no_shame else 0.9
     agent = get_hallucination_agent(no_shame=no_shame)
-    result = await agent.run(prompt)
+    # Always on the pro model: this is the fabrication gate, a flash "pass"
+    # would weaken it
+    with hedgeable():
+        result = await agent.run(
+            prompt,
+            model_settings=prompt_cache_settings(f"hallucination:{source.checksum[:16]}"),
+        )
     r = result.output
 
     issues = []
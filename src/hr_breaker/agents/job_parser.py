@@ -1,8 +1,9 @@
 from pydantic_ai import Agent, PromptedOutput
 
+from hr_breaker.agents.factory import cached_agent
 from hr_breaker.config import get_model_settings
 from hr_breaker.models import JobPosting
-from hr_breaker.provider import get_flash_model
+from hr_breaker.provider import get_flash_model, hedgeable
 
 
 SYSTEM_PROMPT = """You are a job posting parser. Extract structured information from job postings.
@@ -27,6 +28,7 @@ Be thorough in extracting keywords - include all technologies, tools, frameworks
 """
 
 
+@cached_agent
 def get_job_parser_agent() -> Agent:
     return Agent(
         get_flash_model(),
@@ -41,7 +43,8 @@ def get_job_parser_agent() -> Agent:
 async def parse_job_posting(text: str) -> JobPosting:
     """Parse job posting text into structured data."""
     agent = get_job_parser_agent()
-    result = await agent.run(f"Parse this job posting:\n\n{text}")
+    with hedgeable():
+        result = await agent.run(f"Parse this job posting:\n\n{text}")
     job = result.output
     job.raw_text = text
     return job
@@ -1,8 +1,9 @@
 from pydantic import BaseModel
 from pydantic_ai import Agent, PromptedOutput
 
+from hr_breaker.agents.factory import cached_agent
 from hr_breaker.config import get_model_settings, get_settings
-from hr_breaker.provider import get_flash_model
+from hr_breaker.provider import get_flash_model, hedgeable
 
 
 class ExtractedName(BaseModel):
@@ -25,10 +26,9 @@ Ignore formatting commands - extract the actual name text only.
 """
 
 
-async def extract_name(content: str) -> tuple[str | None, str | None]:
-    """Extract first and last name from resume content using LLM."""
-    settings = get_settings()
-    agent = Agent(
+@cached_agent
+def get_name_extractor_agent() -> Agent:
+    return Agent(
         get_flash_model(),
         output_type=PromptedOutput(ExtractedName),
         system_prompt=SYSTEM_PROMPT
@@ -36,7 +36,14 @@ async def extract_name(content: str) -> tuple[str | None, str | None]:
         model_settings=get_model_settings(),
         retries=5,
     )
+
+
+async def extract_name(content: str) -> tuple[str | None, str | None]:
+    """Extract first and last name from resume content using LLM."""
+    settings = get_settings()
+    agent = get_name_extractor_agent()
     # Only send first N chars - name should be at the top
     snippet = content[: settings.agent_name_extractor_chars]
-    result = await agent.run(f"Extract the name from this resume:\n\n{snippet}")
+    with hedgeable():
+        result = await agent.run(f"Extract the name from this resume:\n\n{snippet}")
     return result.output.first_name, result.output.last_name
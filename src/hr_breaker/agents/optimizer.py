@@ -1,26 +1,60 @@
+import asyncio
+import hashlib
 import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from datetime import date
+from typing import Any, TypeVar
 
 from pydantic import BaseModel
-from pydantic_ai import Agent, BinaryContent, PromptedOutput
+from pydantic_ai import (
+    Agent,
+    BinaryContent,
+    ModelRetry,
+    PromptedOutput,
+    RunContext,
+    UnexpectedModelBehavior,
+)
+from pydantic_ai.models import Model
+from pydantic_graph import End
 
 from hr_breaker.agents.combined_reviewer import pdf_to_image
+from hr_breaker.agents.factory import cached_agent
 from hr_breaker.config import get_model_settings, get_settings
+from hr_breaker.executor import run_cpu
 from hr_breaker.filters.data_validator import validate_html
-from hr_breaker.provider import get_agent_model
+from hr_breaker.provider import (
+    choose_route,
+    get_agent_model,
+    prompt_cache_settings,
+    run_routed,
+)
 from hr_breaker.filters.keyword_matcher import check_keywords
+from hr_breaker.metrics import record_cache
 from hr_breaker.models import (
     IterationContext,
     JobPosting,
     OptimizedResume,
+    RenderResult,
     ResumeSource,
 )
 from hr_breaker.services.length_estimator import estimate_content_length
 from hr_breaker.services.renderer import HTMLRenderer, RenderError, get_template_dir
-from hr_breaker.utils import extract_text_from_html
+from hr_breaker.tracing import current_span, span, traced
+from hr_breaker.utils import (
+    PatchError,
+    PatchOp,
+    annotate_ids,
+    apply_patch,
+    extract_text_from_html,
+)
+from hr_breaker.utils.html_patch import ID_ATTR
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def _load_resume_guide() -> str:
     """Load the HTML generation guide for the optimizer."""
@@ -112,16 +146,221 @@ STRICT RULES - NEVER VIOLATE:
 """
 
 
+REFINER_BASE = r"""
+You are a resume optimization expert. You are refining an HTML resume that was already optimized for a job posting but failed some checks.
+
+INPUT: The job posting, the user's original resume, the Last Attempt HTML and the filter results.
+Every block element of the Last Attempt carries a data-id attribute (e.g. data-id="section-3", data-id="li-12").
+
+OUTPUT: A patch against the Last Attempt, NOT a new document:
+- ops: list of edits, each {{"op": ..., "id": ..., "html": ...}}
+  - "replace": replace the element with that data-id by `html` (one or more elements)
+  - "delete": remove the element (html is ignored)
+  - "insert_before" / "insert_after": insert `html` next to the element
+- changes: list of changes made (for tracking)
+
+PATCH RULES:
+- ids refer to the Last Attempt as given; each id may be replaced or deleted at most once
+- Prefer the smallest target: replace a single <li> rather than its <ul>, an entry rather than its section
+- `html` follows the HTML guide below; do not include data-id attributes in it
+- Everything not touched by an op is kept exactly as it is
+- An empty ops list keeps the Last Attempt unchanged
+
+CONTENT RULES:
+- Change ONLY what is needed to pass the failed filters
+- Feature keywords matching job requirements IF they exist in the original resume
+- Keep the resume to one page; preserve contact info and URLs from the original
+- Try to preserve the original writing style if possible.
+
+{content_rules}
+
+TOOLS:
+- Use check_patch(ops) before returning: it applies the patch to the Last Attempt and returns
+  whether it applies, the rendered page_count (authoritative), keyword coverage and structure issues
+- Do not return until check_patch confirms applies=true and fits_one_page=true
+
+{resume_guide}
+"""
+
+
 class OptimizerResult(BaseModel):
     html: str
     changes: list[str]
 
 
-def get_optimizer_agent(
-    job: JobPosting, source: ResumeSource, no_shame: bool = False
-) -> Agent:
-    """Create optimizer agent with job/source context for filter tools."""
+class OptimizerPatch(BaseModel):
+    ops: list[PatchOp]
+    changes: list[str]
+
+
+def html_key(html: str) -> str:
+    """Hash of html with whitespace runs collapsed."""
+    return hashlib.sha256(" ".join(html.split()).encode()).hexdigest()
+
+
+def _render_or_error(html: str) -> RenderResult | RenderError:
+    try:
+        return HTMLRenderer().render(html)
+    except RenderError as e:
+        return e
+
+
+class ToolMemo:
+    """Tool results of one agent run, keyed on tool and normalized html.
+
+    The model often checks the same html several times (and preview plus
+    page count render it twice); repeats are answered from here. Results are
+    stored as tasks, so identical calls made concurrently in one turn share
+    a single computation. Renders (on the CPU executor) are shared between
+    tools. calls/hits count lookups per tool; each lookup is also recorded
+    as a "tool:<name>" cache metric.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[tuple[str, str], asyncio.Future] = {}
+        self.calls: Counter[str] = Counter()
+        self.hits: Counter[str] = Counter()
+
+    async def _lookup(
+        self, tool: str, html: str, fn: Callable[[], Awaitable[T]]
+    ) -> tuple[bool, T]:
+        key = (tool, html_key(html))
+        task = self._results.get(key)
+        hit = task is not None
+        self.calls[tool] += 1
+        self.hits[tool] += hit
+        if task is None:
+            task = self._results[key] = asyncio.ensure_future(fn())
+        # Shielded: one caller being cancelled doesn't fail the others
+        return hit, await asyncio.shield(task)
+
+    async def call(self, tool: str, html: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """fn() on the first call for (tool, html), the same result after."""
+        s = current_span()
+        hit, result = await self._lookup(tool, html, fn)
+        record_cache(f"tool:{tool}", hit)
+        if s is not None:
+            s.set(cached=hit)
+        return result
+
+    async def render(self, html: str) -> RenderResult | RenderError:
+        """Rendered html, or the RenderError it failed with."""
+        _, result = await self._lookup(
+            "render", html, lambda: run_cpu(_render_or_error, html)
+        )
+        return result
+
+    def record(self) -> None:
+        """Log per-tool counts and add totals to the current span."""
+        if not self.calls:
+            return
+        logger.debug(
+            "Tool calls (hits): %s",
+            ", ".join(f"{t} {n} ({self.hits[t]})" for t, n in sorted(self.calls.items())),
+        )
+        s = current_span()
+        if s is not None:
+            s.set(
+                tool_calls=sum(self.calls.values()) - self.calls["render"],
+                tool_cache_hits=sum(self.hits.values()) - self.hits["render"],
+            )
+
+
+@dataclass
+class OptimizerDeps:
+    """Per-run context for the optimizer's tools."""
+
+    job: JobPosting
+    source: ResumeSource
+    memo: ToolMemo = field(default_factory=ToolMemo, kw_only=True)
+
+
+@dataclass
+class RefinerDeps(OptimizerDeps):
+    """OptimizerDeps plus the Last Attempt the patch applies to."""
+
+    base_html: str  # annotated with data-ids
+
+
+def _content_length_report(
+    html: str, rendered: RenderResult | RenderError | None = None
+) -> dict:
+    """Report page count plus rough length estimates for html.
+
+    Renders html unless `rendered` (its render result or error) is given.
+    """
     settings = get_settings()
+    est = estimate_content_length(html)
+
+    # Actually render PDF to check real page count
+    if rendered is None:
+        rendered = _render_or_error(html)
+    if isinstance(rendered, RenderError):
+        return {
+            "fits_one_page": False,
+            "error": f"Render failed: {rendered}",
+            "estimates": {
+                "chars": est.chars,
+                "words": est.words,
+                "note": "Estimates only - fix render error first",
+            },
+        }
+
+    page_count = rendered.page_count
+    fits_one_page = page_count == 1
+    result = {
+        "fits_one_page": fits_one_page,
+        "page_count": page_count,
+        "estimates": {
+            "chars": est.chars,
+            "words": est.words,
+            "limits": {
+                "chars": settings.resume_max_chars,
+                "words": settings.resume_max_words,
+            },
+            "note": "Character/word counts are rough estimates, page_count is authoritative",
+        },
+    }
+    if not fits_one_page:
+        result["suggestion"] = (
+            f"Content spans {page_count} pages. Remove ~{est.overflow_words} words (estimate)"
+        )
+    logger.debug(
+        "check_content_length called: %d pages, %d chars, %d words, fits=%s",
+        page_count,
+        est.chars,
+        est.words,
+        fits_one_page,
+    )
+    return result
+
+
+def _structure_report(html: str) -> dict:
+    """Report validate_html() findings for html."""
+    valid, issues = validate_html(html)
+    logger.debug("validate_structure called: valid=%s, issues=%d", valid, len(issues))
+    return {"valid": valid, "issues": issues}
+
+
+def _keyword_report(html: str, job: JobPosting) -> dict:
+    """Keyword coverage of html against the job, missing keywords by TF-IDF."""
+    resume_text = extract_text_from_html(html)
+    result = check_keywords(resume_text, job)
+    logger.debug(
+        "check_keywords called: score=%.2f, missing=%d",
+        result.score,
+        len(result.missing_keywords),
+    )
+    return {
+        "passed": result.passed,
+        "score": round(result.score, 2),
+        "missing_keywords": result.missing_keywords,
+    }
+
+
+@cached_agent
+def get_optimizer_agent(no_shame: bool = False) -> Agent:
+    """Optimizer agent; tools read the job/source from OptimizerDeps."""
     resume_guide = _load_resume_guide()
     content_rules = OPTIMIZER_LENIENT_RULES if no_shame else OPTIMIZER_STRICT_RULES
     system_prompt = OPTIMIZER_BASE.format(
@@ -129,6 +368,7 @@ def get_optimizer_agent(
     )
     agent = Agent(
         get_agent_model(),
+        deps_type=OptimizerDeps,
         output_type=PromptedOutput(OptimizerResult),
         system_prompt=system_prompt
         + "\nIMPORTANT: Return ONLY a JSON object matching the requested schema.",
@@ -140,109 +380,325 @@ def get_optimizer_agent(
     def add_current_date() -> str:
         return f"Today's date: {date.today().strftime('%B %Y')}"
 
-    @agent.tool_plain
-    def check_content_length(html: str) -> dict:
+    @agent.tool
+    @traced("tool:check_content_length")
+    async def check_content_length(ctx: RunContext[OptimizerDeps], html: str) -> dict:
         """Check if HTML content fits one page by rendering PDF. Call before finalizing."""
-        est = estimate_content_length(html)
+        memo = ctx.deps.memo
 
-        # Actually render PDF to check real page count
-        try:
-            renderer = HTMLRenderer()
-            render_result = renderer.render(html)
-            page_count = render_result.page_count
-            fits_one_page = page_count == 1
-        except RenderError as e:
-            return {
-                "fits_one_page": False,
-                "error": f"Render failed: {e}",
-                "estimates": {
-                    "chars": est.chars,
-                    "words": est.words,
-                    "note": "Estimates only - fix render error first",
-                },
-            }
+        async def report() -> dict:
+            return await run_cpu(_content_length_report, html, await memo.render(html))
 
-        result = {
-            "fits_one_page": fits_one_page,
-            "page_count": page_count,
-            "estimates": {
-                "chars": est.chars,
-                "words": est.words,
-                "limits": {
-                    "chars": settings.resume_max_chars,
-                    "words": settings.resume_max_words,
-                },
-                "note": "Character/word counts are rough estimates, page_count is authoritative",
-            },
-        }
-        if not fits_one_page:
-            result["suggestion"] = (
-                f"Content spans {page_count} pages. Remove ~{est.overflow_words} words (estimate)"
-            )
-        logger.debug(
-            "check_content_length called: %d pages, %d chars, %d words, fits=%s",
-            page_count,
-            est.chars,
-            est.words,
-            fits_one_page,
-        )
-        return result
+        return await memo.call("check_content_length", html, report)
 
-    @agent.tool_plain
-    def preview_resume(html: str) -> BinaryContent:
+    @agent.tool
+    @traced("tool:preview_resume")
+    async def preview_resume(ctx: RunContext[OptimizerDeps], html: str) -> BinaryContent:
         """Render HTML to PDF and return preview image. Use to visually check layout."""
         logger.debug("preview_resume called")
-        renderer = HTMLRenderer()
-        result = renderer.render(html)
-        image_bytes, _ = pdf_to_image(result.pdf_bytes)
-        return BinaryContent(data=image_bytes, media_type="image/png")
+        memo = ctx.deps.memo
+
+        async def preview() -> BinaryContent:
+            rendered = await memo.render(html)
+            if isinstance(rendered, RenderError):
+                raise rendered
+            image_bytes, _ = await run_cpu(pdf_to_image, rendered.pdf_bytes)
+            return BinaryContent(data=image_bytes, media_type="image/png")
 
-    @agent.tool_plain
-    def check_keywords_tool(html: str) -> dict:
+        return await memo.call("preview_resume", html, preview)
+
+    @agent.tool
+    @traced("tool:check_keywords_tool")
+    async def check_keywords_tool(ctx: RunContext[OptimizerDeps], html: str) -> dict:
         """Check keyword coverage vs job posting. Returns missing keywords ranked by TF-IDF importance."""
-        resume_text = extract_text_from_html(html)
-        result = check_keywords(resume_text, job)
-        logger.debug(
-            "check_keywords called: score=%.2f, missing=%d",
-            result.score,
-            len(result.missing_keywords),
+        return await ctx.deps.memo.call(
+            "check_keywords_tool",
+            html,
+            lambda: run_cpu(_keyword_report, html, ctx.deps.job),
         )
-        return {
-            "passed": result.passed,
-            "score": round(result.score, 2),
-            "missing_keywords": result.missing_keywords,
-        }
 
-    @agent.tool_plain
-    def validate_structure(html: str) -> dict:
+    @agent.tool
+    @traced("tool:validate_structure")
+    async def validate_structure(ctx: RunContext[OptimizerDeps], html: str) -> dict:
         """Check HTML structure - headers, sections, no scripts."""
-        valid, issues = validate_html(html)
-        logger.debug(
-            "validate_structure called: valid=%s, issues=%d", valid, len(issues)
+        return await ctx.deps.memo.call(
+            "validate_structure", html, lambda: run_cpu(_structure_report, html)
         )
-        return {"valid": valid, "issues": issues}
 
     return agent
 
 
-async def optimize_resume(
-    source: ResumeSource,
-    job: JobPosting,
-    context: IterationContext,
-    no_shame: bool = False,
-) -> OptimizedResume:
-    """Optimize resume for job posting."""
-    prompt = f"""## Original Resume:
-{context.original_resume}
+async def _run_agent(
+    agent: Agent,
+    prompt: str,
+    deps: OptimizerDeps,
+    model_settings: dict[str, Any],
+    model: Model | str | None = None,
+) -> Any:
+    """agent.run() with every tool-call turn traced as a "tool_turn" span.
+
+    A turn's tool calls run concurrently; the span measures the whole turn
+    (its tool spans nest under it). `model` overrides the agent's model
+    (see provider.run_routed()).
+    """
+    try:
+        async with agent.iter(
+            prompt, deps=deps, model_settings=model_settings, model=model
+        ) as run:
+            node = run.next_node
+            turn = 0
+            while not isinstance(node, End):
+                calls = (
+                    node.model_response.tool_calls
+                    if Agent.is_call_tools_node(node)
+                    else []
+                )
+                if not calls:
+                    node = await run.next(node)
+                    continue
+                turn += 1
+                with span(
+                    "tool_turn",
+                    turn=turn,
+                    calls=len(calls),
+                    tools=",".join(sorted({c.tool_name for c in calls})),
+                ):
+                    node = await run.next(node)
+    finally:
+        deps.memo.record()
+    return run.result.output
+
+
+def _apply_checked(base_html: str, ops: list[PatchOp]) -> str:
+    """Apply a patch and validate the result; raises PatchError."""
+    html = apply_patch(base_html, ops)
+    valid, issues = validate_html(html)
+    if not valid:
+        raise PatchError(f"patched resume is invalid: {'; '.join(issues)}")
+    return html
+
+
+@cached_agent
+def get_refiner_agent(no_shame: bool = False) -> Agent:
+    """Refinement agent: returns an OptimizerPatch against RefinerDeps.base_html."""
+    content_rules = OPTIMIZER_LENIENT_RULES if no_shame else OPTIMIZER_STRICT_RULES
+    system_prompt = REFINER_BASE.format(
+        content_rules=content_rules, resume_guide=_load_resume_guide()
+    )
+    agent = Agent(
+        get_agent_model(),
+        deps_type=RefinerDeps,
+        output_type=PromptedOutput(OptimizerPatch),
+        system_prompt=system_prompt
+        + "\nIMPORTANT: Return ONLY a JSON object matching the requested schema.",
+        model_settings=get_model_settings(),
+        retries=5,
+    )
+
+    @agent.system_prompt
+    def add_current_date() -> str:
+        return f"Today's date: {date.today().strftime('%B %Y')}"
+
+    @agent.tool
+    @traced("tool:check_patch")
+    async def check_patch(ctx: RunContext[RefinerDeps], ops: list[PatchOp]) -> dict:
+        """Apply ops to the Last Attempt and check the result: page count, keyword coverage, structure. Call before finalizing."""
+        try:
+            html = await run_cpu(_apply_checked, ctx.deps.base_html, ops)
+        except PatchError as e:
+            return {"applies": False, "error": str(e)}
+        memo = ctx.deps.memo
+
+        async def check() -> dict:
+            rendered, keywords = await asyncio.gather(
+                memo.render(html), run_cpu(_keyword_report, html, ctx.deps.job)
+            )
+            return {
+                "applies": True,
+                **await run_cpu(_content_length_report, html, rendered),
+                "keywords": keywords,
+            }
+
+        return await memo.call("check_patch", html, check)
 
-## Job Posting:
+    @agent.output_validator
+    async def patch_applies(
+        ctx: RunContext[RefinerDeps], output: OptimizerPatch
+    ) -> OptimizerPatch:
+        try:
+            await run_cpu(_apply_checked, ctx.deps.base_html, output.ops)
+        except PatchError as e:
+            raise ModelRetry(f"Patch does not apply: {e}") from e
+        return output
+
+    return agent
+
+
+def _job_and_resume(job: JobPosting, context: IterationContext) -> str:
+    """Prompt block shared by every optimizer/refiner call of a run."""
+    return f"""## Job Posting:
 Title: {job.title}
 Company: {job.company}
 Requirements: {', '.join(job.requirements)}
 Keywords: {', '.join(job.keywords)}
 Description: {job.description}
+
+## Original Resume:
+{context.original_resume}
 """
 
+
+async def _refine_resume(
+    source: ResumeSource,
+    job: JobPosting,
+    context: IterationContext,
+    base_html: str,
+    no_shame: bool,
+    model_settings: dict[str, Any] | None,
+    model: Model | str | None = None,
+) -> OptimizedResume:
+    """Refinement iteration as a patch against the annotated last attempt."""
+    estimate = estimate_content_length(context.last_attempt or "")
+    prompt = f"""Return JSON with:
+- ops: Patch operations against the Last Attempt (by data-id)
+- changes: List of changes made (for tracking)
+
+Output ONLY valid JSON.
+
+{_job_and_resume(job, context)}
+## Last Attempt (Iteration {context.iteration}):
+{base_html}
+
+## Current Content Stats:
+- Current: {estimate.chars} chars, {estimate.words} words
+"""
+    if context.validation:
+        prompt += f"""
+## Filter Results:
+{context.format_filter_results()}
+
+IMPORTANT: Patch ONLY what's needed to pass the failed filter(s).
+- Do NOT rewrite, rephrase, or restructure content that isn't causing failures
+- Do NOT add new spelling mistakes, keywords, or stylistic changes if they were already added before
+"""
+
+    agent = get_refiner_agent(no_shame=no_shame)
+    output = await _run_agent(
+        agent,
+        prompt,
+        RefinerDeps(job=job, source=source, base_html=base_html),
+        prompt_cache_settings(f"refiner:{source.checksum[:16]}", model_settings),
+        model,
+    )
+    logger.debug("Refiner patch: %d ops", len(output.ops))
+    return OptimizedResume(
+        html=await run_cpu(_apply_checked, base_html, output.ops),
+        iteration=context.iteration,
+        changes=output.changes,
+        source_checksum=source.checksum,
+    )
+
+
+async def optimize_resume(
+    source: ResumeSource,
+    job: JobPosting,
+    context: IterationContext,
+    no_shame: bool = False,
+    model_settings: dict[str, Any] | None = None,
+    optimizer_mode: str | None = None,
+) -> OptimizedResume:
+    """Optimize resume for job posting.
+
+    model_settings are merged over the agent defaults for this call only
+    (e.g. temperature/seed when sampling speculative candidates).
+
+    The prompt is a stable prefix (output spec, job, original resume) that is
+    byte-identical across iterations and candidates of a run, followed by the
+    per-iteration suffix, so providers can serve the prefix from their
+    prompt cache.
+
+    With refine_mode "patch", refinement iterations (a valid HTML last
+    attempt) ask for an OptimizerPatch against the last attempt instead of a
+    whole document and apply it here; if the model can't produce a patch
+    that applies, the iteration falls back to a full rewrite.
+
+    With optimizer_mode (default from settings) "sections", the first
+    iteration is written section by section concurrently (see section_optimizer); resumes that can't be
+    split, or a failed section call, fall back to a single call.
+
+    With model_routing "adaptive", refinements that only have to fix
+    keyword/length/structure filters run on the flash model, escalating to
+    pro on failure (see provider.choose_route()).
+    """
+    failed = (
+        [r.filter_name for r in context.validation.results if not r.passed]
+        if context.validation
+        else []
+    )
+    route = choose_route(
+        "optimizer",
+        iteration=context.iteration,
+        failed_filters=failed,
+        prompt_chars=len(context.original_resume) + len(context.last_attempt or ""),
+    )
+    return await run_routed(
+        "optimizer",
+        route,
+        lambda model: _optimize(
+            source,
+            job,
+            context,
+            no_shame,
+            model_settings,
+            model,
+            optimizer_mode or get_settings().optimizer_mode,
+        ),
+    )
+
+
+async def _optimize(
+    source: ResumeSource,
+    job: JobPosting,
+    context: IterationContext,
+    no_shame: bool,
+    model_settings: dict[str, Any] | None,
+    model: Model | str | None,
+    optimizer_mode: str,
+) -> OptimizedResume:
+    settings = get_settings()
+    if not context.last_attempt and optimizer_mode == "sections":
+        from hr_breaker.agents.section_optimizer import optimize_sections
+
+        try:
+            optimized = await optimize_sections(
+                source, job, context, no_shame, model_settings, model
+            )
+        except UnexpectedModelBehavior as e:
+            logger.warning("Section optimization failed, using a single call: %s", e)
+        else:
+            if optimized is not None:
+                return optimized
+            logger.debug("Resume has no recognizable sections, using a single call")
+
+    if context.last_attempt and settings.refine_mode == "patch":
+        base_html = annotate_ids(context.last_attempt)
+        if ID_ATTR in base_html and validate_html(context.last_attempt)[0]:
+            try:
+                return await _refine_resume(
+                    source, job, context, base_html, no_shame, model_settings, model
+                )
+            except (UnexpectedModelBehavior, PatchError) as e:
+                logger.warning("Patch refinement failed, rewriting in full: %s", e)
+
+    prompt = f"""Return JSON with:
+- html: The HTML body content (no wrapper tags, just the content for <body>)
+- changes: List of changes made (for tracking)
+
+Output ONLY valid JSON. The html field should contain the raw HTML string.
+
+{_job_and_resume(job, context)}"""
+
+    # Variable suffix: everything below changes per iteration
     if context.last_attempt:
         estimate = estimate_content_length(context.last_attempt)
         prompt += f"""
@@ -269,19 +725,17 @@ IMPORTANT: Make MINIMAL changes to fix ONLY the failed filters.
 - Preserve everything that already works
 """
 
-    prompt += """
-Return JSON with:
-- html: The HTML body content (no wrapper tags, just the content for <body>)
-- changes: List of changes made (for tracking)
-
-Output ONLY valid JSON. The html field should contain the raw HTML string.
-"""
-
-    agent = get_optimizer_agent(job, source, no_shame=no_shame)
-    result = await agent.run(prompt)
+    agent = get_optimizer_agent(no_shame=no_shame)
+    output = await _run_agent(
+        agent,
+        prompt,
+        OptimizerDeps(job=job, source=source),
+        prompt_cache_settings(f"optimizer:{source.checksum[:16]}", model_settings),
+        model,
+    )
     return OptimizedResume(
-        html=result.output.html,
+        html=output.html,
         iteration=context.iteration,
-        changes=result.output.changes,
+        changes=output.changes,
         source_checksum=source.checksum,
     )
@@ -0,0 +1,289 @@
+"""Section-parallel optimization (settings.optimizer_mode = "sections").
+
+The first optimizer call writes the whole resume, token by token, and is the
+longest call of a run. Here the source resume is split into sections
+(services.section_splitter); the header, summary, every experience entry and
+every other section are written by concurrent calls, each with a word
+budget, and the fragments are assembled locally into the resume body. A fit
+pass (a patch refinement, see optimizer.get_refiner_agent) brings an
+overflowing result back to one page.
+"""
+
+import asyncio
+import itertools
+import logging
+from datetime import date
+from html import escape
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_ai import (
+    Agent,
+    ModelRetry,
+    PromptedOutput,
+    RunContext,
+    UnexpectedModelBehavior,
+)
+from pydantic_ai.models import Model
+
+from hr_breaker.agents.factory import cached_agent
+from hr_breaker.agents.optimizer import (
+    OPTIMIZER_LENIENT_RULES,
+    OPTIMIZER_STRICT_RULES,
+    _content_length_report,
+    _job_and_resume,
+    _load_resume_guide,
+    _refine_resume,
+)
+from hr_breaker.config import get_model_settings
+from hr_breaker.executor import run_cpu
+from hr_breaker.filters.data_validator import validate_html
+from hr_breaker.models import (
+    FilterResult,
+    IterationContext,
+    JobPosting,
+    OptimizedResume,
+    ResumeSource,
+    ValidationResult,
+)
+from hr_breaker.provider import get_agent_model, prompt_cache_settings
+from hr_breaker.services.section_splitter import (
+    ResumeSection,
+    section_budgets,
+    split_sections,
+)
+from hr_breaker.tracing import span
+from hr_breaker.utils import PatchError, annotate_ids
+
+logger = logging.getLogger(__name__)
+
+SECTION_BASE = r"""
+You are a resume optimization expert. A resume is being optimized for a job posting one part at a time: the header, the summary, each experience entry and each other section are written by separate calls and assembled into one HTML resume afterwards.
+
+INPUT: The job posting, the user's whole original resume (for context) and the part you must write.
+
+OUTPUT: HTML for that part ONLY, using the classes from the guide below. Do NOT include <html>, <head> or <body> tags or any other part of the resume.
+
+CONTENT RULES:
+- When describing job experiences, show concrete results: focus on impact, not tasks.
+- Include specific technologies within achievement descriptions.
+- Feature keywords matching job requirements IF they exist in the original resume.
+- Stay within the part's word budget: all parts together must fit one page.
+- Do not repeat content that belongs to other parts.
+- Try to preserve the original writing style if possible.
+- Preserve URLs from the original resume and use full URLs (include https://).
+
+{content_rules}
+
+{resume_guide}
+"""
+
+# What each kind of part must look like (checked by the output validator)
+SECTION_SHAPES = {
+    "header": (
+        'the <header class="header"> element: name and contact line, keeping '
+        "every contact detail and URL",
+        '<header class="header"',
+    ),
+    "experience": (
+        'ONE <div class="entry"> element for this position, without a <section> wrapper',
+        'class="entry"',
+    ),
+}
+DEFAULT_SHAPE = (
+    'ONE complete <section class="section"> element with its <h2 class="section-title">',
+    '<section class="section"',
+)
+
+
+class SectionResult(BaseModel):
+    html: str
+    changes: list[str]
+
+
+@cached_agent
+def get_section_agent(no_shame: bool = False) -> Agent:
+    """Section writer; deps is the ResumeSection being written."""
+    content_rules = OPTIMIZER_LENIENT_RULES if no_shame else OPTIMIZER_STRICT_RULES
+    agent = Agent(
+        get_agent_model(),
+        deps_type=ResumeSection,
+        output_type=PromptedOutput(SectionResult),
+        system_prompt=SECTION_BASE.format(
+            content_rules=content_rules, resume_guide=_load_resume_guide()
+        )
+        + "\nIMPORTANT: Return ONLY a JSON object matching the requested schema.",
+        model_settings=get_model_settings(),
+        retries=3,
+    )
+
+    @agent.system_prompt
+    def add_current_date() -> str:
+        return f"Today's date: {date.today().strftime('%B %Y')}"
+
+    @agent.output_validator
+    def has_shape(ctx: RunContext[ResumeSection], output: SectionResult) -> SectionResult:
+        shape, marker = SECTION_SHAPES.get(ctx.deps.kind, DEFAULT_SHAPE)
+        if marker not in output.html:
+            raise ModelRetry(f"html must be {shape}")
+        if ctx.deps.kind == "experience" and "<section" in output.html:
+            raise ModelRetry(f"html must be {shape}")
+        return output
+
+    return agent
+
+
+def _section_prompt(
+    section: ResumeSection, budget: int, job: JobPosting, context: IterationContext
+) -> str:
+    shape, _ = SECTION_SHAPES.get(section.kind, DEFAULT_SHAPE)
+    label = section.kind if section.kind != "other" else section.title
+    length = (
+        "keep it as in the original" if section.kind == "header" else f"about {budget} words"
+    )
+    source_text = section.text or "(not in the original: write it from the Original Resume)"
+    # Same output spec + job + resume prefix for every part of the run
+    return f"""Return JSON with:
+- html: The HTML for the requested part only
+- changes: List of changes made (for tracking)
+
+Output ONLY valid JSON. The html field should contain the raw HTML string.
+
+{_job_and_resume(job, context)}
+## Part To Write: {label} ({section.title or "header"})
+HTML: {shape}
+Length budget: {length}
+
+Source text of this part:
+{source_text}
+"""
+
+
+def assemble_sections(sections: list[ResumeSection], fragments: list[str]) -> str:
+    """Join section fragments into a resume body.
+
+    Experience entries of one source section are wrapped in a single
+    <section> with the source heading; other fragments are used as they are.
+    """
+    parts = []
+    for _, group in itertools.groupby(zip(sections, fragments), key=lambda p: p[0].group):
+        items = list(group)
+        first = items[0][0]
+        if first.kind == "experience":
+            entries = "\n".join(fragment for _, fragment in items)
+            parts.append(
+                '<section class="section">\n'
+                f'<h2 class="section-title">{escape(first.title)}</h2>\n'
+                f'<div class="section-content">\n{entries}\n</div>\n'
+                "</section>"
+            )
+        else:
+            parts.extend(fragment for _, fragment in items)
+    return "\n".join(parts)
+
+
+async def _fit_pass(
+    source: ResumeSource,
+    job: JobPosting,
+    context: IterationContext,
+    html: str,
+    no_shame: bool,
+    model_settings: dict[str, Any] | None,
+    model: Model | str | None = None,
+) -> tuple[str, list[str]]:
+    """Patch the assembled resume down to one page if it overflows."""
+    if not validate_html(html)[0]:
+        return html, []
+    report = await run_cpu(_content_length_report, html)
+    if report["fits_one_page"] or "error" in report:
+        return html, []
+    overflow = FilterResult(
+        filter_name="ContentLengthChecker",
+        passed=False,
+        score=0.0,
+        threshold=1.0,
+        issues=[report["suggestion"], "Resume must fit on one page"],
+    )
+    fit_context = context.model_copy(
+        update={"last_attempt": html, "validation": ValidationResult(results=[overflow])}
+    )
+    try:
+        with span("fit_pass", iteration=context.iteration, pages=report["page_count"]):
+            fitted = await _refine_resume(
+                source,
+                job,
+                fit_context,
+                annotate_ids(html),
+                no_shame,
+                model_settings,
+                model,
+            )
+    except (UnexpectedModelBehavior, PatchError) as e:
+        logger.warning("Fit pass failed, keeping the assembled resume: %s", e)
+        return html, []
+    return fitted.html, fitted.changes
+
+
+async def optimize_sections(
+    source: ResumeSource,
+    job: JobPosting,
+    context: IterationContext,
+    no_shame: bool = False,
+    model_settings: dict[str, Any] | None = None,
+    model: Model | str | None = None,
+) -> OptimizedResume | None:
+    """Optimize the resume section by section, concurrently.
+
+    Returns None if the original resume can't be split into sections.
+    Raises UnexpectedModelBehavior if a section call fails (the other calls
+    are cancelled).
+    """
+    sections = split_sections(context.original_resume)
+    if not sections:
+        return None
+    # Header first, then the summary (written from the whole resume if the
+    # original has none), then the rest in source order
+    summaries = [s for s in sections if s.kind == "summary"] or [
+        ResumeSection("summary", "Summary", "", -1)
+    ]
+    sections = [sections[0], *summaries] + [
+        s for s in sections[1:] if s.kind != "summary"
+    ]
+    budgets = section_budgets(sections)
+
+    agent = get_section_agent(no_shame=no_shame)
+    settings = prompt_cache_settings(f"sections:{source.checksum[:16]}", model_settings)
+
+    async def write(index: int, section: ResumeSection, budget: int) -> SectionResult:
+        with span("optimizer_section", index=index, kind=section.kind, budget=budget):
+            result = await agent.run(
+                _section_prompt(section, budget, job, context),
+                deps=section,
+                model_settings=settings,
+                model=model,
+            )
+        return result.output
+
+    tasks = [
+        asyncio.ensure_future(write(i, section, budget))
+        for i, (section, budget) in enumerate(zip(sections, budgets))
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    logger.debug("Optimized %d sections concurrently", len(results))
+
+    html = assemble_sections(sections, [r.html for r in results])
+    changes = [change for r in results for change in r.changes]
+    html, fit_changes = await _fit_pass(
+        source, job, context, html, no_shame, model_settings, model
+    )
+    return OptimizedResume(
+        html=html,
+        iteration=context.iteration,
+        changes=changes + fit_changes,
+        source_checksum=source.checksum,
+    )
@@ -0,0 +1,437 @@
+"""Offline end-to-end benchmark with a deterministic fake LLM.
+
+Runs the real pipeline (job parsing, optimizer with its tools, rendering,
+every filter) over a corpus of resumes and jobs, with all agent models
+replaced by pydantic-ai FunctionModels that return canned outputs after a
+configurable latency. Embeddings are a deterministic bag-of-words hash.
+
+Measures per-stage latency (from tracing spans), total latency, throughput
+at the given concurrency, peak memory and PDF render counts. Results are
+JSON, so a run can be compared against a saved baseline (compare()).
+
+Corpus layout (see benchmarks/corpus):
+    cases.json          [{"name", "resume", "job", "job_posting", ...}]
+    resumes/*.txt, jobs/*.txt
+
+Each case may also give "first_name"/"last_name", "optimized_html" and
+"outputs": {"<output model name>": {...}} to override canned outputs.
+"""
+
+import asyncio
+import hashlib
+import json
+import platform
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Any
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.usage import RequestUsage
+
+from hr_breaker.config import get_settings
+from hr_breaker.metrics import RENDERS
+from hr_breaker.tracing import Span, add_span_listener, remove_span_listener, span
+from hr_breaker.usage import record_response
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class BenchCase:
+    name: str
+    resume: str
+    job_text: str
+    job_posting: dict[str, Any]
+    first_name: str | None = None
+    last_name: str | None = None
+    optimized_html: str | None = None
+    outputs: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+def load_corpus(corpus_dir: Path) -> list[BenchCase]:
+    """Load benchmark cases from corpus_dir/cases.json."""
+    entries = json.loads((corpus_dir / "cases.json").read_text(encoding="utf-8"))
+    return [
+        BenchCase(
+            name=entry["name"],
+            resume=(corpus_dir / entry["resume"]).read_text(encoding="utf-8"),
+            job_text=(corpus_dir / entry["job"]).read_text(encoding="utf-8"),
+            job_posting=entry["job_posting"],
+            first_name=entry.get("first_name"),
+            last_name=entry.get("last_name"),
+            optimized_html=entry.get("optimized_html"),
+            outputs=entry.get("outputs", {}),
+        )
+        for entry in entries
+    ]
+
+
+def resume_to_html(resume: str) -> str:
+    """Minimal valid resume body: first line as name, blank-line blocks as sections."""
+    blocks = [b.strip().splitlines() for b in re.split(r"\n\s*\n", resume.strip())]
+    name = blocks[0][0] if blocks and blocks[0] else "Candidate"
+    parts = [f'<header class="header"><h1 class="name">{escape(name)}</h1>']
+    parts.extend(f"<p>{escape(line)}</p>" for line in blocks[0][1:] if blocks)
+    parts.append("</header>")
+    for block in blocks[1:]:
+        parts.append('<section class="section">')
+        parts.append(f'<h2 class="section-title">{escape(block[0])}</h2>')
+        parts.extend(f"<p>{escape(line)}</p>" for line in block[1:])
+        parts.append("</section>")
+    return "\n".join(parts)
+
+
+def hash_embedding(text: str, dimensions: int = 64) -> list[float]:
+    """Deterministic bag-of-words embedding: word counts hashed into buckets."""
+    vector = [0.0] * dimensions
+    for word in re.findall(r"[a-z0-9+#]+", text.lower()):
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % dimensions] += 1.0
+    return vector
+
+
+# Canned outputs for agents whose answer does not depend on the case
+DEFAULT_OUTPUTS: dict[str, dict[str, Any]] = {
+    "HallucinationResult": {
+        "no_hallucination_score": 0.95,
+        "concerns": [],
+        "reasoning": "Canned benchmark output",
+    },
+    "AIGeneratedResult": {
+        "is_ai_generated": False,
+        "ai_probability": 0.1,
+        "indicators": [],
+    },
+    "CombinedReviewResult": {
+        "looks_professional": True,
+        "keyword_score": 0.8,
+        "experience_score": 0.8,
+        "education_score": 0.8,
+        "overall_fit_score": 0.8,
+        "disqualified": False,
+    },
+}
+
+_current_case: ContextVar[BenchCase | None] = ContextVar(
+    "hr_breaker_bench_case", default=None
+)
+
+
+def _sample(schema: dict[str, Any], defs: dict[str, Any]) -> Any:
+    """Smallest value valid for a JSON schema (fallback for unknown outputs)."""
+    if "$ref" in schema:
+        return _sample(defs[schema["$ref"].split("/")[-1]], defs)
+    if "anyOf" in schema:
+        return _sample(schema["anyOf"][0], defs)
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            name: _sample(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+            if name in schema.get("required", [])
+        }
+    if kind == "array":
+        return []
+    if kind in ("number", "integer"):
+        return schema.get("maximum", schema.get("minimum", 0))
+    if kind == "boolean":
+        return False
+    if kind == "null":
+        return None
+    return ""
+
+
+class FakeLLM:
+    """Deterministic stand-in for every agent model and the embeddings API."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+        exercise_tools: bool = True,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.exercise_tools = exercise_tools
+        self._random = random.Random(seed)
+
+    async def _sleep(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def model(self, model_name: str) -> FunctionModel:
+        async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+            with span("llm_request", model=model_name, key_index=0) as s:
+                await self._sleep()
+                response = self._response(messages, info, model_name)
+                s.set(
+                    input_tokens=response.usage.input_tokens,
+                    output_tokens=response.usage.output_tokens,
+                )
+            record_response(response)
+            return response
+
+        return FunctionModel(respond, model_name=f"fake-{model_name}")
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        await self._sleep()
+        return [hash_embedding(text) for text in texts]
+
+    def output(self, title: str, schema: dict[str, Any]) -> dict[str, Any]:
+        """Canned output for the agent whose output model is `title`."""
+        case = _current_case.get()
+        value = _sample(schema, schema.get("$defs", {}))
+        value.update(DEFAULT_OUTPUTS.get(title, {}))
+        if case is not None:
+            if title == "JobPosting":
+                value.update(case.job_posting)
+            elif title == "ExtractedName":
+                value.update(first_name=case.first_name, last_name=case.last_name)
+            elif title == "OptimizerResult":
+                value.update(
+                    html=case.optimized_html or resume_to_html(case.resume),
+                    changes=["Canned benchmark rewrite"],
+                )
+            value.update(case.outputs.get(title, {}))
+        return value
+
+    def _response(
+        self, messages: list[ModelMessage], info: AgentInfo, model_name: str
+    ) -> ModelResponse:
+        prompt_chars = sum(
+            len(str(part.content))
+            for message in messages
+            for part in message.parts
+            if hasattr(part, "content")
+        )
+        tools_called = any(
+            isinstance(part, ToolReturnPart)
+            for message in messages
+            for part in message.parts
+        )
+        params = info.model_request_parameters
+
+        if info.output_tools:
+            tool = info.output_tools[0]
+            schema = tool.parameters_json_schema
+            args = self.output(schema.get("title", ""), schema)
+            html = args.get("html")
+            parts: list = [ToolCallPart(tool.name, args)]
+        else:
+            schema = params.output_object.json_schema if params.output_object else {}
+            args = self.output(schema.get("title", ""), schema)
+            html = args.get("html")
+            parts = [TextPart(json.dumps(args))]
+
+        # Optimizer: call each html-checking tool once before answering
+        # (refiner: each patch-checking tool)
+        tool_args = None
+        if html:
+            tool_args = {"html": html}
+        elif "ops" in args:
+            tool_args = {"ops": args["ops"]}
+        if self.exercise_tools and tool_args and not tools_called:
+            tool_calls = [
+                ToolCallPart(t.name, tool_args)
+                for t in info.function_tools
+                if set(t.parameters_json_schema.get("properties", {})) == set(tool_args)
+            ]
+            if tool_calls:
+                parts = tool_calls
+
+        output_chars = sum(
+            len(json.dumps(p.args if isinstance(p, ToolCallPart) else p.content))
+            for p in parts
+        )
+        return ModelResponse(
+            parts=parts,
+            model_name=f"fake-{model_name}",
+            usage=RequestUsage(
+                input_tokens=prompt_chars // 4, output_tokens=output_chars // 4
+            ),
+        )
+
+
+@contextmanager
+def _scratch_checkpoints() -> Iterator[None]:
+    """Checkpoint into a temporary directory, not the real run store."""
+    settings = get_settings()
+    original = settings.checkpoint_dir
+    with tempfile.TemporaryDirectory(prefix="hr-breaker-bench-") as tmp:
+        settings.checkpoint_dir = Path(tmp)
+        try:
+            yield
+        finally:
+            settings.checkpoint_dir = original
+
+
+def _render_count() -> float:
+    return RENDERS.value(kind="html") + RENDERS.value(kind="data")
+
+
+async def run_benchmark(
+    cases: list[BenchCase],
+    fake: FakeLLM | None = None,
+    concurrency: int = 1,
+    repeat: int = 1,
+    max_iterations: int | None = None,
+    parallel: bool = True,
+    trace_memory: bool = True,
+) -> dict[str, Any]:
+    """Run every case `repeat` times, at most `concurrency` runs at a time."""
+    from hr_breaker.agents import extract_name
+    from hr_breaker.llm_governor import BATCH, llm_priority
+    from hr_breaker.models import ResumeSource
+    from hr_breaker.orchestration import optimize_for_job
+    from hr_breaker.provider import override_models
+    from hr_breaker.tracing import summarize
+
+    fake = fake or FakeLLM()
+    spans: list[Span] = []
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_case(case: BenchCase, attempt: int) -> dict[str, Any]:
+        async with semaphore:
+            _current_case.set(case)
+            start = time.perf_counter()
+            with (
+                span("bench_case", case=case.name, attempt=attempt),
+                llm_priority(BATCH, session=f"bench:{case.name}:{attempt}"),
+            ):
+                first_name, last_name = await extract_name(case.resume)
+                source = ResumeSource(
+                    content=case.resume, first_name=first_name, last_name=last_name
+                )
+                _, validation, _ = await optimize_for_job(
+                    source,
+                    case.job_text,
+                    max_iterations=max_iterations,
+                    parallel=parallel,
+                    priority=BATCH,
+                )
+            return {
+                "case": case.name,
+                "attempt": attempt,
+                "seconds": time.perf_counter() - start,
+                "passed": validation.passed if validation else False,
+            }
+
+    add_span_listener(spans.append)
+    renders_before = _render_count()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with override_models(fake.model, fake.embed), _scratch_checkpoints():
+            runs = await asyncio.gather(
+                *(run_case(case, r) for r in range(repeat) for case in cases)
+            )
+    finally:
+        total = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+        remove_span_listener(spans.append)
+
+    # Iterations per run, counted from each case's trace
+    iterations_by_trace: dict[str, int] = {}
+    for s in spans:
+        if s.name == "iteration":
+            iterations_by_trace[s.trace_id] = iterations_by_trace.get(s.trace_id, 0) + 1
+    case_traces = {
+        (s.attributes["case"], s.attributes["attempt"]): s.trace_id
+        for s in spans
+        if s.name == "bench_case"
+    }
+    for run in runs:
+        trace_id = case_traces.get((run["case"], run["attempt"]))
+        run["iterations"] = iterations_by_trace.get(trace_id, 0)
+
+    latencies = sorted(r["seconds"] for r in runs)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cases": [c.name for c in cases],
+            "repeat": repeat,
+            "concurrency": concurrency,
+            "max_iterations": max_iterations or get_settings().max_iterations,
+            "parallel": parallel,
+            "latency": fake.latency,
+            "jitter": fake.jitter,
+        },
+        "total_seconds": total,
+        "runs_per_minute": len(runs) / total * 60 if total else 0.0,
+        "run_p50": latencies[len(latencies) // 2] if latencies else 0.0,
+        "run_max": latencies[-1] if latencies else 0.0,
+        "renders": int(_render_count() - renders_before),
+        "memory_peak_mb": peak / 1_000_000 if peak is not None else None,
+        # ru_maxrss is KiB on Linux
+        "max_rss_mb": (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            if resource
+            else None
+        ),
+        "runs": runs,
+        "stages": summarize(s.to_dict() for s in spans if s.name != "bench_case"),
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.10
+) -> list[dict[str, Any]]:
+    """Rows comparing current vs baseline; `regressed` if slower by > threshold."""
+    rows = []
+
+    def add(metric: str, before: float | None, after: float | None, lower_is_better=True):
+        if not before or after is None:
+            return
+        change = (after - before) / before
+        worse = change if lower_is_better else -change
+        rows.append({
+            "metric": metric,
+            "baseline": before,
+            "current": after,
+            "change": change,
+            "regressed": worse > threshold,
+        })
+
+    add("total_seconds", baseline.get("total_seconds"), current.get("total_seconds"))
+    add(
+        "runs_per_minute",
+        baseline.get("runs_per_minute"),
+        current.get("runs_per_minute"),
+        lower_is_better=False,
+    )
+    add("memory_peak_mb", baseline.get("memory_peak_mb"), current.get("memory_peak_mb"))
+    add("renders", baseline.get("renders"), current.get("renders"))
+    before_stages = {s["stage"]: s for s in baseline.get("stages", [])}
+    for stage in current.get("stages", []):
+        before = before_stages.get(stage["stage"])
+        if before:
+            add(f"{stage['stage']} p50", before["p50"], stage["p50"])
+            add(f"{stage['stage']} p95", before["p95"], stage["p95"])
+    return rows
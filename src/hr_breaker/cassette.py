@@ -0,0 +1,300 @@
+"""Record and replay HTTP traffic (LLM, embeddings, scrapers) to a cassette.
+
+A cassette is a gzip-compressed JSON file of request/response exchanges,
+captured at the httpx transport layer: the OpenAI-compatible models built
+by the provider layer, the embeddings client and the httpx/Wayback
+scrapers all get their transport from here. Playwright traffic is not
+captured.
+
+In replay mode no network is used. Requests are matched by method, URL and
+body (JSON bodies compared with sorted keys; API keys are ignored), and
+identical requests are served in recorded order, so key rotation and
+retries replay too. Latency is either the originally measured one or zero.
+
+Activate with HR_BREAKER_CASSETTE (+ _MODE, _LATENCY), the CLI's
+--record/--replay, or use_cassette().
+"""
+
+import asyncio
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from hr_breaker.config import get_settings, logger
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Same timeouts pydantic-ai uses for its shared client
+_LLM_TIMEOUT = httpx.Timeout(timeout=600, connect=5)
+_SKIPPED_HEADERS = {"set-cookie", "content-length", "transfer-encoding"}
+
+
+def _body_key(content: bytes) -> str:
+    try:
+        normalized = json.dumps(json.loads(content), sort_keys=True).encode()
+    except ValueError:
+        normalized = content
+    return hashlib.sha256(normalized).hexdigest()
+
+
+def _request_key(request: httpx.Request) -> str:
+    return f"{request.method} {request.url} {_body_key(request.content)}"
+
+
+class Cassette:
+    """Recorded exchanges plus the transports that record or replay them."""
+
+    def __init__(self, path: Path, mode: str = REPLAY, latency: str = "original"):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if latency not in ("original", "zero"):
+            raise ValueError(f"Unknown replay latency: {latency}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._entries: list[dict[str, Any]] = []
+        self._queues: dict[str, deque[dict[str, Any]]] = {}
+        self._last: dict[str, dict[str, Any]] = {}
+        if mode == REPLAY:
+            self._load()
+        self._sync_transport = _SyncTransport(self)
+        self._async_transport = _AsyncTransport(self)
+        self._llm_client: httpx.AsyncClient | None = None
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            self._entries = json.load(f)["entries"]
+        for entry in self._entries:
+            self._queues.setdefault(entry["key"], deque()).append(entry)
+
+    def save(self) -> None:
+        if self.mode != RECORD:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {"version": 1, "entries": list(self._entries)}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+        tmp.replace(self.path)
+        logger.info(f"Cassette saved: {self.path} ({len(data['entries'])} exchanges)")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(
+        self, request: httpx.Request, response: httpx.Response, raw: bytes, elapsed: float
+    ) -> None:
+        entry = {
+            "key": _request_key(request),
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": [
+                [k, v]
+                for k, v in response.headers.multi_items()
+                if k.lower() not in _SKIPPED_HEADERS
+            ],
+            "body": base64.b64encode(raw).decode(),
+            "elapsed": elapsed,
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+    def lookup(self, request: httpx.Request) -> tuple[httpx.Response, float]:
+        """Recorded response for request and the latency to simulate."""
+        key = _request_key(request)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+            else:
+                # More identical requests than recorded: repeat the last answer
+                entry = self._last.get(key)
+        if entry is None:
+            logger.warning(f"Cassette miss: {request.method} {request.url}")
+            error = {
+                "message": f"No cassette entry for {request.method} {request.url}",
+                "code": "cassette_miss",
+            }
+            return httpx.Response(404, json={"error": error}, request=request), 0.0
+        response = httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=base64.b64decode(entry["body"]),
+            request=request,
+        )
+        delay = entry["elapsed"] if self.latency == "original" else 0.0
+        return response, delay
+
+    def transport(self) -> httpx.BaseTransport:
+        return self._sync_transport
+
+    def async_transport(self) -> httpx.AsyncBaseTransport:
+        return self._async_transport
+
+    def llm_client(self) -> httpx.AsyncClient:
+        """The one AsyncClient OpenAI-compatible clients share (see close())."""
+        with self._lock:
+            if self._llm_client is None:
+                self._llm_client = httpx.AsyncClient(
+                    transport=self._async_transport, timeout=_LLM_TIMEOUT
+                )
+            return self._llm_client
+
+    async def aclose(self) -> None:
+        """Close the LLM client and the connections used for recording."""
+        client, self._llm_client = self._llm_client, None
+        if client is not None:
+            await client.aclose()
+        await self._async_transport.close_real()
+        self._sync_transport.close_real()
+
+    def close(self) -> None:
+        """aclose() from sync code: now, or as a task of the running loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                asyncio.run(self.aclose())
+            except Exception as e:
+                logger.debug(f"Closing cassette clients failed: {e}")
+            return
+        task = loop.create_task(self.aclose())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+
+class _SyncTransport(httpx.BaseTransport):
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._real = httpx.HTTPTransport() if cassette.mode == RECORD else None
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        if self._real is None:
+            response, delay = self.cassette.lookup(request)
+            if delay:
+                time.sleep(delay)
+            return response
+        start = time.perf_counter()
+        response = self._real.handle_request(request)
+        try:
+            raw = b"".join(response.stream)
+        finally:
+            response.close()
+        self.cassette.record(request, response, raw, time.perf_counter() - start)
+        return httpx.Response(
+            response.status_code, headers=response.headers, content=raw, request=request
+        )
+
+    def close(self) -> None:
+        pass  # Shared by every client; lives as long as the cassette
+
+    def close_real(self) -> None:
+        if self._real is not None:
+            self._real.close()
+
+
+class _AsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._real = httpx.AsyncHTTPTransport() if cassette.mode == RECORD else None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        if self._real is None:
+            response, delay = self.cassette.lookup(request)
+            if delay:
+                await asyncio.sleep(delay)
+            return response
+        start = time.perf_counter()
+        response = await self._real.handle_async_request(request)
+        try:
+            raw = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        self.cassette.record(request, response, raw, time.perf_counter() - start)
+        return httpx.Response(
+            response.status_code, headers=response.headers, content=raw, request=request
+        )
+
+    async def aclose(self) -> None:
+        pass  # Shared by every client; lives as long as the cassette
+
+    async def close_real(self) -> None:
+        if self._real is not None:
+            await self._real.aclose()
+
+
+_active: Cassette | None = None
+_closing: set[asyncio.Task] = set()  # Cassette.close() tasks still running
+_from_settings = False
+_active_lock = threading.Lock()
+
+
+def active_cassette() -> Cassette | None:
+    """Cassette in use: use_cassette()'s, else HR_BREAKER_CASSETTE's (if set)."""
+    global _active, _from_settings
+    if _active is not None or _from_settings:
+        return _active
+    with _active_lock:
+        if _active is None and not _from_settings:
+            _from_settings = True
+            settings = get_settings()
+            if settings.cassette:
+                _active = Cassette(
+                    settings.cassette, settings.cassette_mode, settings.cassette_latency
+                )
+                atexit.register(_active.save)
+                atexit.register(_active.close)
+    return _active
+
+
+@contextmanager
+def use_cassette(
+    path: Path, mode: str = REPLAY, latency: str = "original"
+) -> Iterator[Cassette]:
+    """Record or replay all HTTP traffic inside the block (saved on exit)."""
+    global _active
+    cassette = Cassette(path, mode, latency)
+    previous, _active = _active, cassette
+    try:
+        yield cassette
+    finally:
+        _active = previous
+        cassette.close()
+        cassette.save()
+
+
+def is_replaying() -> bool:
+    cassette = active_cassette()
+    return cassette is not None and cassette.mode == REPLAY
+
+
+def http_transport() -> httpx.BaseTransport | None:
+    """Transport for sync httpx clients (scrapers); None = httpx default."""
+    cassette = active_cassette()
+    return cassette.transport() if cassette is not None else None
+
+
+def llm_http_client() -> httpx.AsyncClient | None:
+    """HTTP client for OpenAI-compatible clients; None = their default."""
+    cassette = active_cassette()
+    return cassette.llm_client() if cassette is not None else None
@@ -1,20 +1,20 @@
 """CLI interface for HR-Breaker."""
 
 import asyncio
+import json
 from pathlib import Path
 
 import click
 
-from hr_breaker.agents import extract_name, parse_job_posting
+from hr_breaker import metrics
 from hr_breaker.config import get_settings
-from hr_breaker.models import GeneratedPDF, ResumeSource
-from hr_breaker.orchestration import optimize_for_job
-from hr_breaker.services import (
-    PDFStorage,
-    scrape_job_posting,
-    ScrapingError,
-    CloudflareBlockedError,
-)
+from hr_breaker.models import GeneratedPDF, ResumeSource, RunBudget
+from hr_breaker.profiling import LoopWatchdog, RunProfiler
+from hr_breaker.services import CheckpointStore, PDFStorage, new_run_id
+
+# Commands import agents, orchestration, scrapers and the cassette layer where
+# they use them: loading pydantic-ai/sklearn/etc. up front would make every
+# command (`list`, `runs`, ...) take seconds to start.
 
 
 @click.group()
@@ -40,6 +40,70 @@ OUTPUT_DIR = Path("output")
 @click.option(
     "--no-shame", is_flag=True, help="Lenient mode: allow aggressive content stretching"
 )
+@click.option(
+    "--candidates",
+    "-k",
+    type=int,
+    default=None,
+    help="Optimizer candidates generated concurrently per iteration",
+)
+@click.option(
+    "--pipelined",
+    is_flag=True,
+    default=None,
+    help="Start the next optimizer call while LLM filters are still running",
+)
+@click.option(
+    "--sections",
+    is_flag=True,
+    help="Write the first draft section by section, concurrently",
+)
+@click.option(
+    "--deadline",
+    type=float,
+    default=None,
+    help="Wall-clock budget in seconds; returns the best result so far when reached",
+)
+@click.option(
+    "--max-cost",
+    type=float,
+    default=None,
+    help="Estimated LLM cost budget in USD",
+)
+@click.option(
+    "--run-id",
+    default=None,
+    help="Checkpoint ID for this run (default: generated)",
+)
+@click.option(
+    "--metrics-json",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Write this run's metrics (stage latencies, tokens, ...) as JSON",
+)
+@click.option(
+    "--record",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Record all LLM and scraper HTTP traffic to this cassette (.json.gz)",
+)
+@click.option(
+    "--replay",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Replay LLM and scraper traffic from this cassette (offline)",
+)
+@click.option(
+    "--replay-latency",
+    type=click.Choice(["original", "zero"]),
+    default="original",
+    show_default=True,
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Sample stacks and event-loop lag; writes a flamegraph profile to the debug dir",
+)
 def optimize(
     resume_path: Path,
     job_input: str,
@@ -48,22 +112,40 @@ def optimize(
     debug: bool,
     seq: bool,
     no_shame: bool,
+    candidates: int | None,
+    pipelined: bool | None,
+    sections: bool,
+    deadline: float | None,
+    max_cost: float | None,
+    run_id: str | None,
+    metrics_json: Path | None,
+    record: Path | None,
+    replay: Path | None,
+    replay_latency: str,
+    profile: bool,
 ):
     """Optimize resume for job posting.
 
     RESUME_PATH: Path to resume file (any text format: .tex, .md, .txt, etc.)
     JOB_INPUT: URL or path to file with job description
     """
+    if record and replay:
+        raise click.ClickException("Use either --record or --replay, not both")
     settings = get_settings()
-    if settings.llm_provider == "google" and not settings.google_api_key:
-        raise click.ClickException(
-            "GOOGLE_API_KEY not set in environment (required for Google provider)"
-        )
-    if settings.llm_provider == "openai" and not settings.openai_api_key:
-        raise click.ClickException(
-            "OPENAI_API_KEY not set in environment (required for OpenAI provider)"
-        )
-
+    # Replayed responses need no credentials
+    if not replay:
+        if settings.llm_provider == "google" and not settings.google_api_key:
+            raise click.ClickException(
+                "GOOGLE_API_KEY not set in environment (required for Google provider)"
+            )
+        if settings.llm_provider == "openai" and not settings.openai_api_key:
+            raise click.ClickException(
+                "OPENAI_API_KEY not set in environment (required for OpenAI provider)"
+            )
+
+    from hr_breaker.agents import extract_name, parse_job_posting
+    from hr_breaker.cassette import RECORD, REPLAY, use_cassette
+    from hr_breaker.orchestration import optimize_for_job
     from hr_breaker.services.pdf_parser import extract_text_from_pdf
 
     if resume_path.suffix.lower() == ".pdf":
@@ -71,35 +153,28 @@ def optimize(
     else:
         resume_content = resume_path.read_text()
 
+    if record or replay:
+        # Entered for the rest of the command, saved when it exits
+        click.get_current_context().with_resource(
+            use_cassette(record or replay, RECORD if record else REPLAY, replay_latency)
+        )
+
     # Get job text (sync - may need user interaction for Cloudflare)
     job_text = _get_job_text(job_input)
 
+    metrics.install()
     pdf_storage = PDFStorage()
     debug_dir: Path | None = None
+    budget = _budget(deadline, max_cost)
+    run_id = run_id or new_run_id()
+    if settings.checkpoints:
+        click.echo(f"Run ID: {run_id} (continue with: hr-breaker resume {run_id})")
 
     def on_iteration(i, optimized, validation):
-        status = "PASS" if validation.passed else "FAIL"
-        scores = ", ".join(
-            f"{r.filter_name}:{r.score:.2f}/{r.threshold:.2f}"
-            for r in validation.results
-        )
-        click.echo(f"  Iteration {i + 1}: {status} [{scores}]")
-
-        # Save intermediate PDF in debug mode
-        if debug and debug_dir:
-            debug_pdf = debug_dir / f"iteration_{i + 1}.pdf"
-            # Save HTML or JSON depending on what's available
-            if optimized.html:
-                debug_html = debug_dir / f"iteration_{i + 1}.html"
-                debug_html.write_text(optimized.html)
-            elif optimized.data:
-                debug_json = debug_dir / f"iteration_{i + 1}.json"
-                debug_json.write_text(optimized.data.model_dump_json(indent=2))
-            if optimized.pdf_bytes:
-                debug_pdf.write_bytes(optimized.pdf_bytes)
-                click.echo(f"    Debug: saved {debug_pdf}")
-            else:
-                click.echo("    Debug: no PDF (render failed)")
+        _echo_iteration(i, optimized, validation, debug_dir if debug else None)
+
+    profiler = RunProfiler() if profile else None
+    watchdog = LoopWatchdog() if debug else None
 
     # Run all async work in single event loop
     async def run_optimization():
@@ -111,7 +186,7 @@ def optimize(
         job = await parse_job_posting(job_text)
         click.echo(f"Job: {job.title} at {job.company}")
 
-        if debug:
+        if debug or profile:
             debug_dir = pdf_storage.generate_debug_dir(job.company, job.title)
 
         mode = "sequential" if seq else "parallel"
@@ -131,23 +206,403 @@ def optimize(
             job=job,
             parallel=parallel_mode,
             no_shame=no_shame,
+            candidates=candidates,
+            pipelined=pipelined,
+            optimizer_mode="sections" if sections else None,
+            budget=budget,
+            run_id=run_id,
+        )
+        return source, optimized, validation, job
+
+    run = run_optimization()
+    if profiler:
+        run = profiler.run(run)
+    if watchdog:
+        run = watchdog.run(run)
+    from hr_breaker.orchestration import BudgetExceeded
+
+    try:
+        source, optimized, validation, job = asyncio.run(run)
+    except BudgetExceeded as e:
+        raise click.ClickException(f"{e}. No result saved.") from e
+    if watchdog is not None and debug_dir is not None:
+        _echo_loop_stalls(watchdog, watchdog.write(debug_dir))
+    if profiler is not None and debug_dir is not None:
+        profiler.write(debug_dir)
+        lag = profiler.lag.summary()
+        click.echo(
+            f"Profile: {debug_dir / 'profile.folded'} ({profiler.sampler.samples} samples), "
+            f"event-loop lag max {lag['max'] * 1000:.0f}ms p95 {lag['p95'] * 1000:.0f}ms"
+        )
+    if metrics_json:
+        metrics_json.write_text(json.dumps(metrics.snapshot(), indent=2))
+        click.echo(f"Metrics saved: {metrics_json}")
+    _save_result(pdf_storage, source, optimized, validation, job, output)
+
+
+@cli.command()
+@click.argument("run_id")
+@click.option("--output", "-o", type=click.Path(path_type=Path), default=None)
+@click.option("--max-iterations", "-n", type=int, default=None)
+@click.option("--deadline", type=float, default=None)
+@click.option("--max-cost", type=float, default=None)
+def resume(
+    run_id: str,
+    output: Path | None,
+    max_iterations: int | None,
+    deadline: float | None,
+    max_cost: float | None,
+):
+    """Continue an interrupted run from its last checkpointed stage.
+
+    RUN_ID: ID printed by `optimize` (see `hr-breaker runs`)
+    """
+    from hr_breaker.orchestration import BudgetExceeded, resume_run
+
+    checkpoint = CheckpointStore().get(run_id)
+    if checkpoint is None:
+        raise click.ClickException(f"No checkpoint for run {run_id}")
+    done = sum(1 for e in checkpoint.iterations if e.validation is not None)
+    click.echo(f"Resuming run {run_id} ({done} iteration(s) checkpointed)")
+
+    try:
+        optimized, validation, job = asyncio.run(resume_run(
+            run_id,
+            max_iterations=max_iterations,
+            on_iteration=lambda i, o, v: _echo_iteration(i, o, v),
+            budget=_budget(deadline, max_cost),
+        ))
+    except BudgetExceeded as e:
+        raise click.ClickException(f"{e}. No result saved.") from e
+    _save_result(PDFStorage(), checkpoint.source, optimized, validation, job, output)
+
+
+@cli.command("runs")
+def list_runs():
+    """List checkpointed runs."""
+    checkpoints = CheckpointStore().list_all()
+    if not checkpoints:
+        click.echo("No checkpointed runs")
+        return
+
+    for c in checkpoints:
+        status = "done" if c.finished else "interrupted"
+        job = f"{c.job.title} @ {c.job.company}" if c.job else "(job not parsed)"
+        done = sum(1 for e in c.iterations if e.validation is not None)
+        click.echo(
+            f"{c.run_id} [{status}] {job} - {done}/{c.max_iterations} iterations "
+            f"({c.updated_at.strftime('%Y-%m-%d %H:%M')})"
         )
-        return first_name, last_name, source, optimized, validation, job
 
-    first_name, last_name, source, optimized, validation, job = asyncio.run(
-        run_optimization()
+
+@cli.command()
+@click.option(
+    "--corpus",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=Path("benchmarks/corpus"),
+    show_default=True,
+)
+@click.option("--repeat", "-r", type=int, default=1, help="Runs per case")
+@click.option("--concurrency", "-c", type=int, default=1, help="Concurrent runs")
+@click.option("--latency", type=float, default=0.0, help="Fake LLM latency (seconds)")
+@click.option("--jitter", type=float, default=0.0, help="Uniform +- latency jitter")
+@click.option("--max-iterations", "-n", type=int, default=None)
+@click.option("--seq", "-s", is_flag=True, help="Run filters sequentially")
+@click.option("--no-tools", is_flag=True, help="Fake optimizer skips its tool calls")
+@click.option("--output", "-o", type=click.Path(path_type=Path), default=None)
+@click.option(
+    "--compare",
+    "baseline_path",
+    type=click.Path(exists=True, path_type=Path),
+    default=None,
+    help="Baseline results JSON to compare against",
+)
+@click.option("--threshold", type=float, default=0.10, help="Regression threshold")
+def bench(
+    corpus: Path,
+    repeat: int,
+    concurrency: int,
+    latency: float,
+    jitter: float,
+    max_iterations: int | None,
+    seq: bool,
+    no_tools: bool,
+    output: Path | None,
+    baseline_path: Path | None,
+    threshold: float,
+):
+    """Offline end-to-end benchmark with a deterministic fake LLM."""
+    from datetime import datetime
+
+    from hr_breaker.benchmark import FakeLLM, compare, load_corpus, run_benchmark
+
+    cases = load_corpus(corpus)
+    click.echo(
+        f"Benchmarking {len(cases)} cases x{repeat}, concurrency {concurrency}, "
+        f"fake LLM latency {latency:.2f}s"
+    )
+    results = asyncio.run(run_benchmark(
+        cases,
+        FakeLLM(latency=latency, jitter=jitter, exercise_tools=not no_tools),
+        concurrency=concurrency,
+        repeat=repeat,
+        max_iterations=max_iterations,
+        parallel=not seq,
+    ))
+
+    click.echo(
+        f"Total {results['total_seconds']:.2f}s, "
+        f"{results['runs_per_minute']:.1f} runs/min, {results['renders']} renders, "
+        f"peak memory {results['memory_peak_mb']:.1f} MB"
+    )
+    click.echo(f"{'stage':<40} {'count':>6} {'p50':>8} {'p95':>8} {'total':>9}")
+    for row in results["stages"]:
+        click.echo(
+            f"{row['stage']:<40} {row['count']:>6} {row['p50']:>7.3f}s "
+            f"{row['p95']:>7.3f}s {row['total']:>8.2f}s"
+        )
+
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = Path("benchmarks/results") / f"bench_{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    click.echo(f"Results saved: {output}")
+
+    if baseline_path:
+        rows = compare(json.loads(baseline_path.read_text()), results, threshold)
+        click.echo(f"\nvs {baseline_path}:")
+        for row in rows:
+            flag = "  REGRESSED" if row["regressed"] else ""
+            click.echo(
+                f"{row['metric']:<44} {row['baseline']:>9.3f} -> "
+                f"{row['current']:>9.3f} ({row['change']:+.1%}){flag}"
+            )
+        if any(row["regressed"] for row in rows):
+            raise SystemExit(1)
+
+
+@cli.command("mock-openai")
+@click.option("--port", type=int, default=8089, show_default=True)
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--latency", type=float, default=0.0, help="Median latency (seconds)")
+@click.option("--jitter", type=float, default=0.0, help="Uniform +- range or lognormal sigma")
+@click.option(
+    "--distribution",
+    type=click.Choice(["fixed", "uniform", "lognormal"]),
+    default="fixed",
+    show_default=True,
+)
+@click.option("--rate-limit-rate", type=float, default=0.0, help="Probability of a 429")
+@click.option("--rpm", type=int, default=None, help="Requests per minute per key")
+@click.option(
+    "--exhausted-key", "exhausted_keys", multiple=True, help="Key that gets quota errors"
+)
+@click.option("--retry-after", type=float, default=1.0, show_default=True)
+@click.option(
+    "--no-prompt-cache", is_flag=True, help="Never report cached prompt tokens"
+)
+@click.option(
+    "--corpus",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=None,
+    help="Benchmark corpus to draw realistic outputs from",
+)
+@click.option(
+    "--outputs",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help='JSON {"<output model name>": {...}} of canned output overrides',
+)
+def mock_openai(
+    port: int,
+    host: str,
+    latency: float,
+    jitter: float,
+    distribution: str,
+    rate_limit_rate: float,
+    rpm: int | None,
+    exhausted_keys: tuple[str, ...],
+    retry_after: float,
+    no_prompt_cache: bool,
+    corpus: Path | None,
+    outputs: Path | None,
+):
+    """OpenAI-compatible mock server for load testing (no real quota used)."""
+    from hr_breaker.benchmark import load_corpus
+    from hr_breaker.mock_openai import MockConfig, MockOpenAIServer
+
+    config = MockConfig(
+        latency=latency,
+        jitter=jitter,
+        latency_distribution=distribution,
+        rate_limit_rate=rate_limit_rate,
+        rpm_per_key=rpm,
+        exhausted_keys=set(exhausted_keys),
+        retry_after=retry_after,
+        prompt_cache=not no_prompt_cache,
+        outputs=json.loads(outputs.read_text()) if outputs else {},
+        cases=load_corpus(corpus) if corpus else [],
+    )
+    server = MockOpenAIServer((host, port), config)
+    click.echo(f"Mock OpenAI API on http://{host}:{server.server_port}/v1")
+    click.echo(f"Stats: http://{host}:{server.server_port}/mock/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo(json.dumps(server.stats.snapshot(), indent=2))
+    finally:
+        server.server_close()
+
+
+@cli.command()
+def warmup():
+    """Pre-initialize renderer, fonts, filters and agents (e.g. on container start)."""
+    from hr_breaker.warmup import warmup as run_warmup
+
+    steps = asyncio.run(run_warmup())
+    for step in steps:
+        status = "ok" if step.ok else f"FAILED ({step.error})"
+        click.echo(f"  {step.name:<32} {step.seconds:>6.2f}s  {status}")
+    click.echo(f"Warm-up: {sum(s.seconds for s in steps):.2f}s")
+    failed = [s for s in steps if not s.ok]
+    if failed:
+        raise click.ClickException(f"{len(failed)} warm-up step(s) failed")
+
+
+@cli.command("metrics")
+@click.option(
+    "--url",
+    default=None,
+    help="Metrics server to read (default: http://localhost:HR_BREAKER_METRICS_PORT)",
+)
+@click.option("--prometheus", is_flag=True, help="Prometheus text instead of JSON")
+def show_metrics(url: str | None, prometheus: bool):
+    """Dump metrics of a running app (Streamlit deployment) from its metrics server."""
+    import httpx
+
+    url = (url or f"http://localhost:{get_settings().metrics_port}").rstrip("/")
+    path = "/metrics" if prometheus else "/metrics.json"
+    try:
+        resp = httpx.get(url + path, timeout=10.0)
+        resp.raise_for_status()
+    except httpx.HTTPError as e:
+        raise click.ClickException(f"Could not read metrics from {url}: {e}")
+    if prometheus:
+        click.echo(resp.text, nl=False)
+    else:
+        click.echo(json.dumps(resp.json(), indent=2))
+
+
+@cli.command("trace-summary")
+@click.argument(
+    "trace_file", type=click.Path(exists=True, path_type=Path), required=False
+)
+@click.option("--stage", "stages", multiple=True, help="Only show these stages")
+def trace_summary(trace_file: Path | None, stages: tuple[str, ...]):
+    """Show p50/p95 latency per stage across traced runs.
+
+    TRACE_FILE: JSONL trace file (default: HR_BREAKER_TRACE_FILE)
+    """
+    from hr_breaker.tracing import load_spans, summarize
+
+    trace_file = trace_file or get_settings().trace_file
+    if trace_file is None or not trace_file.exists():
+        raise click.ClickException(
+            "No trace file - set HR_BREAKER_TRACE_FILE or pass a path"
+        )
+    spans = load_spans(trace_file)
+    if stages:
+        spans = [s for s in spans if s["name"] in stages]
+    if not spans:
+        click.echo("No spans recorded")
+        return
+
+    runs = sum(1 for s in spans if s["name"] == "run")
+    click.echo(f"{len(spans)} spans from {runs} runs in {trace_file}")
+    click.echo(
+        f"{'stage':<40} {'count':>6} {'p50':>8} {'p95':>8} {'max':>8} {'total':>9}"
+    )
+    for row in summarize(spans):
+        click.echo(
+            f"{row['stage']:<40} {row['count']:>6} {row['p50']:>7.2f}s "
+            f"{row['p95']:>7.2f}s {row['max']:>7.2f}s {row['total']:>8.1f}s"
+        )
+
+
+def _echo_loop_stalls(watchdog: LoopWatchdog, path: Path) -> None:
+    sites = watchdog.by_call_site()
+    if not sites:
+        return
+    total = sum(site["total"] for site in sites)
+    click.echo(
+        f"Event loop blocked {total:.2f}s in {len(watchdog.stalls)} stalls "
+        f"> {watchdog.threshold * 1000:.0f}ms ({path}):"
     )
+    for site in sites[:5]:
+        click.echo(
+            f"  {site['total']:6.2f}s x{site['count']:<3} {site['call_site']} "
+            f"[{', '.join(site['stages'])}]"
+        )
 
+
+def _budget(deadline: float | None, max_cost: float | None) -> RunBudget:
+    """Run budget from settings, with CLI overrides."""
+    settings = get_settings()
+    return RunBudget(
+        deadline_seconds=(
+            deadline if deadline is not None else settings.run_deadline_seconds
+        ),
+        max_input_tokens=settings.run_max_input_tokens,
+        max_output_tokens=settings.run_max_output_tokens,
+        max_cost_usd=max_cost if max_cost is not None else settings.run_max_cost_usd,
+        max_llm_calls=settings.run_max_llm_calls,
+    )
+
+
+def _echo_iteration(i, optimized, validation, debug_dir: Path | None = None):
+    status = "PASS" if validation.passed else "FAIL"
+    scores = ", ".join(
+        f"{r.filter_name}:{r.score:.2f}/{r.threshold:.2f}"
+        for r in validation.results
+    )
+    click.echo(f"  Iteration {i + 1}: {status} [{scores}]")
+
+    # Save intermediate PDF in debug mode
+    if debug_dir:
+        debug_pdf = debug_dir / f"iteration_{i + 1}.pdf"
+        # Save HTML or JSON depending on what's available
+        if optimized.html:
+            debug_html = debug_dir / f"iteration_{i + 1}.html"
+            debug_html.write_text(optimized.html)
+        elif optimized.data:
+            debug_json = debug_dir / f"iteration_{i + 1}.json"
+            debug_json.write_text(optimized.data.model_dump_json(indent=2))
+        if optimized.pdf_bytes:
+            debug_pdf.write_bytes(optimized.pdf_bytes)
+            click.echo(f"    Debug: saved {debug_pdf}")
+        else:
+            click.echo("    Debug: no PDF (render failed)")
+
+
+def _save_result(
+    pdf_storage: PDFStorage,
+    source: ResumeSource,
+    optimized,
+    validation,
+    job,
+    output: Path | None,
+) -> None:
     if not validation.passed:
         click.echo("Warning: Not all filters passed")
 
-    # Save final PDF (reuse bytes from last iteration)
+    # Save final PDF (reuse bytes from best iteration)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     if output is None:
         output = (
             OUTPUT_DIR
             / pdf_storage.generate_path(
-                first_name, last_name, job.company, job.title
+                source.first_name, source.last_name, job.company, job.title
             ).name
         )
 
@@ -160,8 +615,8 @@ def optimize(
         source_checksum=source.checksum,
         company=job.company,
         job_title=job.title,
-        first_name=first_name,
-        last_name=last_name,
+        first_name=source.first_name,
+        last_name=source.last_name,
     )
     pdf_storage.save_record(pdf_record)
 
@@ -188,6 +643,12 @@ def list_history():
 
 def _get_job_text(job_input: str) -> str:
     """Get job text from URL or file path."""
+    from hr_breaker.services import (
+        CloudflareBlockedError,
+        ScrapingError,
+        scrape_job_posting,
+    )
+
     # Check if file
     path = Path(job_input)
     if path.exists():
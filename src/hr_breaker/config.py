@@ -1,5 +1,6 @@
 import logging
 import os
+from collections.abc import Callable
 from functools import lru_cache
 from pathlib import Path
 from typing import Any
@@ -57,9 +58,50 @@ class Settings(BaseModel):
     openai_embedding_dimensions: int | None = None
     cache_dir: Path = Path(".cache/resumes")
     output_dir: Path = Path("output")
+    checkpoints: bool = False  # Persist each run stage for resume_run() (opt-in)
+    checkpoint_dir: Path = Path(".cache/runs")
+    checkpoint_retention_days: float = 7.0  # Older checkpoints are deleted
+    checkpoint_max_runs: int = 50  # Only the newest are kept
+    trace_file: Path | None = None  # JSONL span export (None = off)
+    otlp_endpoint: str | None = None  # OTLP/HTTP collector, e.g. http://localhost:4318
+    metrics_port: int = 9108  # Side HTTP server for /metrics (0 = off)
+    metrics_host: str = "127.0.0.1"  # Unauthenticated: 0.0.0.0 exposes it
+    cpu_executor: str = "thread"  # Pool for CPU-bound filter work: thread | process
+    cpu_workers: int = min(4, os.cpu_count() or 1)
+    warmup: bool = True  # Warm up renderer/filters/agents when the web app starts
+    loop_stall_threshold: float = 0.1  # Debug-mode loop watchdog (seconds)
+    cassette: Path | None = None  # Record/replay HTTP traffic (None = off)
+    cassette_mode: str = "replay"  # record | replay
+    cassette_latency: str = "original"  # Replay latency: original | zero
     max_iterations: int = 5
+    plateau_patience: int = 0  # Plateau early stopping, off by default (0)
+    plateau_epsilon: float = 0.01
     pass_threshold: float = 0.7
     fast_mode: bool = True
+    pipelined: bool = False  # Overlap next optimizer call with LLM filters
+    refine_mode: str = "full"  # Refinement iterations: patch | full
+    optimizer_mode: str = "single"  # First iteration: single | sections
+    model_routing: str = "off"  # Flash vs pro per call: off (always pro) | adaptive
+    routing_flash_max_prompt_chars: int = 30000
+    hedge_requests: bool = False  # Duplicate slow short calls on another API key
+    hedge_budget: float = 0.05  # Max share of hedgeable requests that get a duplicate
+    llm_max_concurrency: int = 8  # LLM requests in flight per model (0 = unlimited)
+
+    # Speculative candidates (optimizer calls per iteration)
+    optimizer_candidates: int = 1
+    optimizer_candidate_temperatures: list[float] = [0.2, 0.7, 1.0]
+    optimizer_candidates_reviewed: int = 1
+
+    # Run budget (None = unlimited) and price overrides for cost estimates
+    run_deadline_seconds: float | None = None
+    run_max_input_tokens: int | None = None
+    run_max_output_tokens: int | None = None
+    run_max_cost_usd: float | None = None
+    run_max_llm_calls: int | None = None
+    llm_price_input_per_mtok: float | None = None
+    llm_price_output_per_mtok: float | None = None
+    llm_price_cached_input_per_mtok: float | None = None  # None = input price
+    embedding_price_per_mtok: float | None = None
 
     # Scraper settings
     scraper_httpx_timeout: float = 15.0
@@ -94,6 +136,16 @@ class Settings(BaseModel):
     agent_name_extractor_chars: int = 2000
 
 
+def _parse_floats(raw: str) -> list[float]:
+    return [float(p) for p in raw.replace(";", ",").split(",") if p.strip()]
+
+
+def _optional(cast: Callable[[str], Any], name: str) -> Any:
+    """Parse an optional env var; unset or empty means None."""
+    raw = os.getenv(name, "")
+    return cast(raw) if raw.strip() else None
+
+
 @lru_cache
 def get_settings() -> Settings:
     thinking_env = os.getenv("GEMINI_THINKING_BUDGET")
@@ -118,8 +170,62 @@ def get_settings() -> Settings:
         ),
         openai_embedding_dimensions=int(os.getenv("OPENAI_EMBEDDING_DIMENSIONS", "0"))
         or None,
+        checkpoints=os.getenv("HR_BREAKER_CHECKPOINTS", "false").lower()
+        in ("true", "1", "yes"),
+        checkpoint_dir=Path(os.getenv("HR_BREAKER_CHECKPOINT_DIR", ".cache/runs")),
+        checkpoint_retention_days=float(
+            os.getenv("HR_BREAKER_CHECKPOINT_RETENTION_DAYS", "7")
+        ),
+        checkpoint_max_runs=int(os.getenv("HR_BREAKER_CHECKPOINT_MAX_RUNS", "50")),
+        trace_file=_optional(Path, "HR_BREAKER_TRACE_FILE"),
+        otlp_endpoint=_optional(str, "HR_BREAKER_OTLP_ENDPOINT"),
+        metrics_port=int(os.getenv("HR_BREAKER_METRICS_PORT", "9108")),
+        metrics_host=os.getenv("HR_BREAKER_METRICS_HOST", "127.0.0.1"),
+        cpu_executor=os.getenv("HR_BREAKER_CPU_EXECUTOR", "thread").lower(),
+        cpu_workers=int(
+            os.getenv("HR_BREAKER_CPU_WORKERS", str(min(4, os.cpu_count() or 1)))
+        ),
+        warmup=os.getenv("HR_BREAKER_WARMUP", "true").lower() in ("true", "1", "yes"),
+        loop_stall_threshold=float(os.getenv("HR_BREAKER_LOOP_STALL_MS", "100")) / 1000,
+        cassette=_optional(Path, "HR_BREAKER_CASSETTE"),
+        cassette_mode=os.getenv("HR_BREAKER_CASSETTE_MODE", "replay").lower(),
+        cassette_latency=os.getenv("HR_BREAKER_CASSETTE_LATENCY", "original").lower(),
+        plateau_patience=int(os.getenv("PLATEAU_PATIENCE", "0")),
+        plateau_epsilon=float(os.getenv("PLATEAU_EPSILON", "0.01")),
         fast_mode=os.getenv("HR_BREAKER_FAST_MODE", "true").lower()
         in ("true", "1", "yes"),
+        pipelined=os.getenv("HR_BREAKER_PIPELINED", "false").lower()
+        in ("true", "1", "yes"),
+        refine_mode=os.getenv("HR_BREAKER_REFINE_MODE", "full").lower(),
+        optimizer_mode=os.getenv("HR_BREAKER_OPTIMIZER_MODE", "single").lower(),
+        model_routing=os.getenv("HR_BREAKER_MODEL_ROUTING", "off").lower(),
+        routing_flash_max_prompt_chars=int(
+            os.getenv("HR_BREAKER_ROUTING_FLASH_MAX_PROMPT_CHARS", "30000")
+        ),
+        hedge_requests=os.getenv("HR_BREAKER_HEDGE_REQUESTS", "false").lower()
+        in ("true", "1", "yes"),
+        hedge_budget=float(os.getenv("HR_BREAKER_HEDGE_BUDGET", "0.05")),
+        llm_max_concurrency=int(os.getenv("HR_BREAKER_LLM_MAX_CONCURRENCY", "8")),
+        # Speculative candidates
+        optimizer_candidates=int(os.getenv("OPTIMIZER_CANDIDATES", "1")),
+        optimizer_candidate_temperatures=_parse_floats(
+            os.getenv("OPTIMIZER_CANDIDATE_TEMPERATURES", "0.2,0.7,1.0")
+        ),
+        optimizer_candidates_reviewed=int(
+            os.getenv("OPTIMIZER_CANDIDATES_REVIEWED", "1")
+        ),
+        # Run budget
+        run_deadline_seconds=_optional(float, "RUN_DEADLINE_SECONDS"),
+        run_max_input_tokens=_optional(int, "RUN_MAX_INPUT_TOKENS"),
+        run_max_output_tokens=_optional(int, "RUN_MAX_OUTPUT_TOKENS"),
+        run_max_cost_usd=_optional(float, "RUN_MAX_COST_USD"),
+        run_max_llm_calls=_optional(int, "RUN_MAX_LLM_CALLS"),
+        llm_price_input_per_mtok=_optional(float, "LLM_PRICE_INPUT_PER_MTOK"),
+        llm_price_output_per_mtok=_optional(float, "LLM_PRICE_OUTPUT_PER_MTOK"),
+        llm_price_cached_input_per_mtok=_optional(
+            float, "LLM_PRICE_CACHED_INPUT_PER_MTOK"
+        ),
+        embedding_price_per_mtok=_optional(float, "EMBEDDING_PRICE_PER_MTOK"),
         # Scraper settings
         scraper_httpx_timeout=float(os.getenv("SCRAPER_HTTPX_TIMEOUT", "15")),
         scraper_wayback_timeout=float(os.getenv("SCRAPER_WAYBACK_TIMEOUT", "10")),
@@ -161,6 +267,11 @@ def get_settings() -> Settings:
     )
 
 
+def settings_version() -> int:
+    """Changes whenever any setting does (for caches built from settings)."""
+    return hash(get_settings().model_dump_json())
+
+
 def get_model_settings() -> dict[str, Any] | None:
     """Get GoogleModelSettings with thinking config if budget is set."""
     settings = get_settings()
@@ -0,0 +1,66 @@
+"""Shared executor for CPU-bound work (rendering, PDF parsing, TF-IDF).
+
+Work run through run_cpu() leaves the event loop, so local filters overlap
+with LLM/embedding requests instead of blocking them. HR_BREAKER_CPU_EXECUTOR
+picks a thread pool (default) or a process pool, HR_BREAKER_CPU_WORKERS its
+size.
+
+Thread pool: spans opened inside the work nest under the caller's. Process
+pool: callables and arguments must be picklable (module-level functions,
+filter instances, models), and spans/metrics recorded in a worker process
+are not collected.
+"""
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from hr_breaker.config import get_settings
+
+T = TypeVar("T")
+
+_executor: Executor | None = None
+_lock = threading.Lock()
+
+
+def get_cpu_executor() -> Executor:
+    """The process-wide CPU executor, created on first use."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            settings = get_settings()
+            if settings.cpu_executor == "process":
+                # spawn: forking a process with live threads is unsafe
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.cpu_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.cpu_workers, thread_name_prefix="hr-breaker-cpu"
+                )
+        return _executor
+
+
+def shutdown_cpu_executor() -> None:
+    """Shut the executor down; the next run_cpu() creates a new one."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run fn(*args, **kwargs) in the shared CPU executor."""
+    executor = get_cpu_executor()
+    if isinstance(executor, ProcessPoolExecutor):
+        call = functools.partial(fn, *args, **kwargs)
+    else:
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(executor, call)
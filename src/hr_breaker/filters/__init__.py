@@ -1,15 +1,48 @@
-from .base import BaseFilter
+"""Filter plugins.
+
+Filters are imported on first attribute access (PEP 562) so that importing
+the package doesn't pull in their dependencies; FilterRegistry loads the
+built-in filters itself on first lookup.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+from .base import BaseFilter, CPUFilter
 from .registry import FilterRegistry
-from .content_length import ContentLengthChecker
-from .data_validator import DataValidator
-from .llm_checker import LLMChecker
-from .keyword_matcher import KeywordMatcher, check_keywords
-from .vector_similarity_matcher import VectorSimilarityMatcher
-from .hallucination_checker import HallucinationChecker
-from .ai_generated_checker import AIGeneratedChecker
+
+if TYPE_CHECKING:
+    from .ai_generated_checker import AIGeneratedChecker
+    from .content_length import ContentLengthChecker
+    from .data_validator import DataValidator
+    from .hallucination_checker import HallucinationChecker
+    from .keyword_matcher import KeywordMatcher, check_keywords
+    from .llm_checker import LLMChecker
+    from .vector_similarity_matcher import VectorSimilarityMatcher
+
+_LAZY = {
+    "ContentLengthChecker": ".content_length",
+    "DataValidator": ".data_validator",
+    "LLMChecker": ".llm_checker",
+    "KeywordMatcher": ".keyword_matcher",
+    "VectorSimilarityMatcher": ".vector_similarity_matcher",
+    "HallucinationChecker": ".hallucination_checker",
+    "AIGeneratedChecker": ".ai_generated_checker",
+    "check_keywords": ".keyword_matcher",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "BaseFilter",
+    "CPUFilter",
     "FilterRegistry",
     "ContentLengthChecker",
     "DataValidator",
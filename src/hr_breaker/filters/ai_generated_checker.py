@@ -11,6 +11,7 @@ class AIGeneratedChecker(BaseFilter):
 
     name = "AIGeneratedChecker"
     priority = 7
+    local = False
 
     @property
     def threshold(self) -> float:
@@ -1,14 +1,22 @@
 from abc import ABC, abstractmethod
 
+from hr_breaker.executor import run_cpu
 from hr_breaker.models import FilterResult, JobPosting, OptimizedResume, ResumeSource
 
 
 class BaseFilter(ABC):
-    """Abstract base class for resume filters."""
+    """Abstract base class for resume filters.
+
+    Filters that await I/O (LLM/embedding calls) implement evaluate(),
+    offloading any CPU-heavy part with run_cpu(). Filters whose work is all
+    CPU-bound subclass CPUFilter instead.
+    """
 
     name: str = "BaseFilter"
     priority: int = 50  # Lower runs first, 100 = run last (after all others pass)
     threshold: float = 0.5  # Score threshold for passing
+    local: bool = True  # False for filters that call LLM/embedding APIs
+    weight: float = 1.0  # Weight in the aggregate score used to rank results
 
     def __init__(self, no_shame: bool = False):
         self.no_shame = no_shame
@@ -22,3 +30,28 @@ class BaseFilter(ABC):
     ) -> FilterResult:
         """Evaluate the optimized resume against the job posting."""
         pass
+
+
+class CPUFilter(BaseFilter):
+    """Filter whose work is all CPU-bound: implement evaluate_sync().
+
+    evaluate() runs it in the shared CPU executor, off the event loop.
+    """
+
+    async def evaluate(
+        self,
+        optimized: OptimizedResume,
+        job: JobPosting,
+        source: ResumeSource,
+    ) -> FilterResult:
+        return await run_cpu(self.evaluate_sync, optimized, job, source)
+
+    @abstractmethod
+    def evaluate_sync(
+        self,
+        optimized: OptimizedResume,
+        job: JobPosting,
+        source: ResumeSource,
+    ) -> FilterResult:
+        """Evaluate the optimized resume against the job posting."""
+        pass
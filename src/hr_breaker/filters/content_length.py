@@ -1,9 +1,7 @@
 """Content length checker - runs first to fail fast on oversized content."""
 
-import fitz
-
 from hr_breaker.config import get_settings, logger
-from hr_breaker.filters.base import BaseFilter
+from hr_breaker.filters.base import CPUFilter
 from hr_breaker.filters.registry import FilterRegistry
 from hr_breaker.models import FilterResult, JobPosting, OptimizedResume, ResumeSource
 from hr_breaker.services.renderer import get_renderer, RenderError
@@ -14,6 +12,8 @@ def check_page2_overflow(pdf_bytes: bytes) -> str | None:
 
     Returns error message if overflow detected, None otherwise.
     """
+    import fitz
+
     settings = get_settings()
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
     if len(doc) < 2:
@@ -29,14 +29,14 @@ def check_page2_overflow(pdf_bytes: bytes) -> str | None:
 
 
 @FilterRegistry.register
-class ContentLengthChecker(BaseFilter):
+class ContentLengthChecker(CPUFilter):
     """Pre-render length check. Runs BEFORE everything to fail fast."""
 
     name = "ContentLengthChecker"
     priority = 0  # Runs BEFORE everything
     threshold = 1.0
 
-    async def evaluate(
+    def evaluate_sync(
         self,
         optimized: OptimizedResume,
         job: JobPosting,
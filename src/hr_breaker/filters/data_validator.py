@@ -2,7 +2,7 @@
 
 import re
 
-from hr_breaker.filters.base import BaseFilter
+from hr_breaker.filters.base import CPUFilter
 from hr_breaker.filters.registry import FilterRegistry
 from hr_breaker.models import FilterResult, JobPosting, OptimizedResume, ResumeSource
 
@@ -76,14 +76,14 @@ def validate_resume_data(optimized: OptimizedResume) -> tuple[bool, list[str]]:
 
 
 @FilterRegistry.register
-class DataValidator(BaseFilter):
+class DataValidator(CPUFilter):
     """Validates OptimizedResume structure before rendering. Runs first."""
 
     name = "DataValidator"
     priority = 1  # Run first
     threshold = 1.0  # Must pass fully
 
-    async def evaluate(
+    def evaluate_sync(
         self,
         optimized: OptimizedResume,
         job: JobPosting,
@@ -11,6 +11,8 @@ class HallucinationChecker(BaseFilter):
 
     name = "HallucinationChecker"
     priority = 3
+    local = False
+    weight = 2.0
 
     @property
     def threshold(self) -> float:
@@ -1,10 +1,8 @@
 import re
 from dataclasses import dataclass
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-
 from hr_breaker.config import get_settings
-from hr_breaker.filters.base import BaseFilter
+from hr_breaker.filters.base import CPUFilter
 from hr_breaker.filters.registry import FilterRegistry
 from hr_breaker.models import FilterResult, JobPosting, OptimizedResume, ResumeSource
 
@@ -31,6 +29,9 @@ def check_keywords(
     Returns:
         KeywordCheckResult with score, passed status, and missing keywords ranked by TF-IDF importance
     """
+    # sklearn takes ~2s to import; only load it once keywords are checked
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
     settings = get_settings()
     if threshold is None:
         threshold = settings.filter_keyword_threshold
@@ -64,8 +65,9 @@ def check_keywords(
     if not significant_keywords:
         return KeywordCheckResult(score=1.0, passed=True, missing_keywords=[])
 
+    # Sorted: set order varies per process (hash seed), e.g. in the process pool
     matched, missing = [], []
-    for keyword in significant_keywords:
+    for keyword in sorted(significant_keywords):
         pattern = rf"\b{re.escape(keyword)}\b"
         if re.search(pattern, resume_lower):
             matched.append(keyword)
@@ -73,12 +75,10 @@ def check_keywords(
             missing.append(keyword)
 
     matched_weight = sum(tfidf_scores.get(kw, 0.1) for kw in matched)
-    total_weight = sum(tfidf_scores.get(kw, 0.1) for kw in significant_keywords)
+    total_weight = sum(tfidf_scores.get(kw, 0.1) for kw in sorted(significant_keywords))
     score = matched_weight / total_weight if total_weight > 0 else 1.0
 
-    missing_sorted = sorted(
-        missing, key=lambda kw: tfidf_scores.get(kw, 0), reverse=True
-    )
+    missing_sorted = sorted(missing, key=lambda kw: (-tfidf_scores.get(kw, 0), kw))
 
     return KeywordCheckResult(
         score=float(score),
@@ -88,7 +88,7 @@ def check_keywords(
 
 
 @FilterRegistry.register
-class KeywordMatcher(BaseFilter):
+class KeywordMatcher(CPUFilter):
     """Keyword matching filter using TF-IDF weighted scoring."""
 
     name = "KeywordMatcher"
@@ -98,7 +98,7 @@ class KeywordMatcher(BaseFilter):
     def threshold(self) -> float:
         return get_settings().filter_keyword_threshold
 
-    async def evaluate(
+    def evaluate_sync(
         self,
         optimized: OptimizedResume,
         job: JobPosting,
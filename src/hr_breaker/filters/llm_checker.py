@@ -11,6 +11,8 @@ class LLMChecker(BaseFilter):
 
     name = "LLMChecker"
     priority = 5
+    local = False
+    weight = 2.0
 
     @property
     def threshold(self) -> float:
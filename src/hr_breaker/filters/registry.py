@@ -1,12 +1,26 @@
+import importlib
 from typing import Type
 
 from hr_breaker.filters.base import BaseFilter
 
+# Modules whose filters register on import; loaded on first registry lookup
+# since hr_breaker.filters no longer imports them eagerly
+BUILTIN_FILTER_MODULES = [
+    "hr_breaker.filters.content_length",
+    "hr_breaker.filters.data_validator",
+    "hr_breaker.filters.llm_checker",
+    "hr_breaker.filters.keyword_matcher",
+    "hr_breaker.filters.vector_similarity_matcher",
+    "hr_breaker.filters.hallucination_checker",
+    "hr_breaker.filters.ai_generated_checker",
+]
+
 
 class FilterRegistry:
     """Registry for filter plugins."""
 
     _filters: dict[str, Type[BaseFilter]] = {}
+    _builtins_loaded = False
 
     @classmethod
     def register(cls, filter_class: Type[BaseFilter]) -> Type[BaseFilter]:
@@ -14,14 +28,25 @@ class FilterRegistry:
         cls._filters[filter_class.name] = filter_class
         return filter_class
 
+    @classmethod
+    def _load_builtins(cls) -> None:
+        if cls._builtins_loaded:
+            return
+        cls._builtins_loaded = True
+        for module in BUILTIN_FILTER_MODULES:
+            importlib.import_module(module)
+
     @classmethod
     def get(cls, name: str) -> Type[BaseFilter] | None:
+        cls._load_builtins()
         return cls._filters.get(name)
 
     @classmethod
     def all(cls) -> list[Type[BaseFilter]]:
+        cls._load_builtins()
         return list(cls._filters.values())
 
     @classmethod
     def names(cls) -> list[str]:
+        cls._load_builtins()
         return list(cls._filters.keys())
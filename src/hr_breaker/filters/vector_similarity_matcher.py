@@ -1,10 +1,14 @@
 import asyncio
 
+from hr_breaker.cassette import is_replaying, llm_http_client
 from hr_breaker.config import get_settings
 from hr_breaker.filters.base import BaseFilter
 from hr_breaker.filters.registry import FilterRegistry
 from hr_breaker.models import FilterResult, JobPosting, OptimizedResume, ResumeSource
 from hr_breaker.openai_keys import get_openai_api_keys
+from hr_breaker.provider import get_embedder_override
+from hr_breaker.tracing import span
+from hr_breaker.usage import record_embedding
 
 
 @FilterRegistry.register
@@ -13,6 +17,7 @@ class VectorSimilarityMatcher(BaseFilter):
 
     name = "VectorSimilarityMatcher"
     priority = 6
+    local = False
 
     @property
     def threshold(self) -> float:
@@ -39,6 +44,16 @@ class VectorSimilarityMatcher(BaseFilter):
         resume_text = optimized.pdf_text
         job_text = f"{job.title} {job.description} {' '.join(job.requirements)}"
 
+        last_err: Exception | None = None
+        embeddings: list[list[float]] | None = None
+
+        # Stand-in embeddings (offline benchmark)
+        embedder = get_embedder_override()
+        if embedder is not None:
+            with span("embedding_request", model="override"):
+                embeddings = await embedder([resume_text, job_text])
+            return self._similarity_result(embeddings)
+
         # Prefer OpenAI keys. For local OpenAI-compatible servers (Ollama),
         # allow a placeholder key and use a local embedding model.
         api_keys = get_openai_api_keys()
@@ -50,6 +65,8 @@ class VectorSimilarityMatcher(BaseFilter):
             embed_model = "nomic-embed-text"
             embed_dimensions = None
             api_keys = ["ollama"]
+        elif not api_keys and is_replaying():
+            api_keys = ["replay"]
 
         if not api_keys:
             return FilterResult(
@@ -61,24 +78,34 @@ class VectorSimilarityMatcher(BaseFilter):
                 suggestions=["Set OPENAI_API_KEYS / OPENAI_API_KEY in .env.openai_keys"],
             )
 
-        last_err: Exception | None = None
-        embeddings: list[list[float]] | None = None
-
-        for key in api_keys:
+        for key_index, key in enumerate(api_keys):
             try:
                 from openai import AsyncOpenAI
 
-                client = AsyncOpenAI(api_key=key, base_url=settings.openai_base_url)
+                client = AsyncOpenAI(
+                    api_key=key,
+                    base_url=settings.openai_base_url,
+                    http_client=llm_http_client(),
+                )
 
                 kwargs = {"model": embed_model}
                 if embed_dimensions is not None:
                     kwargs["dimensions"] = embed_dimensions
 
-                e1_resp, e2_resp = await asyncio.gather(
-                    client.embeddings.create(input=resume_text, **kwargs),
-                    client.embeddings.create(input=job_text, **kwargs),
-                )
+                with span(
+                    "embedding_request", model=embed_model, key_index=key_index
+                ) as s:
+                    e1_resp, e2_resp = await asyncio.gather(
+                        client.embeddings.create(input=resume_text, **kwargs),
+                        client.embeddings.create(input=job_text, **kwargs),
+                    )
+                    s.set(input_tokens=sum(
+                        r.usage.prompt_tokens if r.usage else 0
+                        for r in (e1_resp, e2_resp)
+                    ))
                 embeddings = [e1_resp.data[0].embedding, e2_resp.data[0].embedding]
+                for resp in (e1_resp, e2_resp):
+                    record_embedding(resp.usage.prompt_tokens if resp.usage else 0)
                 break
             except Exception as e:
                 last_err = e
@@ -93,7 +120,9 @@ class VectorSimilarityMatcher(BaseFilter):
                 issues=[f"Embedding API error (skipped): {last_err}"],
                 suggestions=[],
             )
+        return self._similarity_result(embeddings)
 
+    def _similarity_result(self, embeddings: list[list[float]]) -> FilterResult:
         # Cosine similarity
         e1, e2 = embeddings[0], embeddings[1]
         dot = sum(a * b for a, b in zip(e1, e2))
@@ -0,0 +1,203 @@
+"""Process-wide concurrency governor for LLM requests.
+
+Streamlit sessions, CLI runs and benchmarks in one process share the same
+API keys. Every request through RotatingOpenAIModel first takes a slot from
+the governor: at most HR_BREAKER_LLM_MAX_CONCURRENCY requests per model are
+in flight (0 = unlimited), and waiting requests are admitted by priority
+class (interactive, then batch, then background) and, within a class,
+round-robin across sessions, so one large batch can't starve other users.
+
+Priority and session are taken from the context: llm_priority() sets them for
+a block (optimize_for_job_stream() does so for each run), and tasks started
+inside inherit them. Requests from several event loops (one per Streamlit
+session) are governed together.
+
+Queue depth, in-flight requests and queue waits are exported as metrics.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from hr_breaker.config import get_settings
+from hr_breaker.metrics import LLM_IN_FLIGHT, LLM_QUEUE_DEPTH, LLM_QUEUE_WAIT_SECONDS
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BATCH, BACKGROUND)  # Highest first
+
+_priority: ContextVar[str] = ContextVar("hr_breaker_llm_priority", default=INTERACTIVE)
+_session: ContextVar[str] = ContextVar("hr_breaker_llm_session", default="")
+
+
+@contextmanager
+def llm_priority(priority: str, session: str | None = None) -> Iterator[None]:
+    """Tag LLM requests in the block with a priority class and session.
+
+    session defaults to the enclosing one.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority!r}, expected one of {PRIORITIES}")
+    priority_token = _priority.set(priority)
+    session_token = _session.set(session if session is not None else _session.get())
+    try:
+        yield
+    finally:
+        _session.reset(session_token)
+        _priority.reset(priority_token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@dataclass
+class _Waiter:
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    granted: bool = False
+
+
+@dataclass
+class _ModelQueue:
+    """Slots of one model: in-flight count and waiters by priority and session."""
+
+    active: int = 0
+    waiting: dict[str, OrderedDict[str, deque[_Waiter]]] = field(
+        default_factory=lambda: {p: OrderedDict() for p in PRIORITIES}
+    )
+
+
+def _wake(waiter: _Waiter) -> None:
+    if not waiter.future.done():
+        waiter.future.set_result(None)
+
+
+class LLMGovernor:
+    """Bounded per-model concurrency with priority classes and fair queueing."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._models: dict[str, _ModelQueue] = {}
+
+    def depth(self, model: str, priority: str | None = None) -> int:
+        """Requests waiting for a slot of `model` (of one priority, or all)."""
+        with self._lock:
+            queue = self._models.get(model)
+            if queue is None:
+                return 0
+            priorities = [priority] if priority else PRIORITIES
+            return sum(len(w) for p in priorities for w in queue.waiting[p].values())
+
+    @asynccontextmanager
+    async def slot(self, model: str) -> AsyncIterator[float]:
+        """Hold one of `model`'s request slots; yields the seconds waited."""
+        limit = get_settings().llm_max_concurrency
+        priority, session = _priority.get(), _session.get()
+        start = time.perf_counter()
+        waiter = None
+        with self._lock:
+            queue = self._models.setdefault(model, _ModelQueue())
+            queued = any(queue.waiting[p] for p in PRIORITIES)
+            if limit > 0 and (queue.active >= limit or queued):
+                loop = asyncio.get_running_loop()
+                waiter = _Waiter(loop, loop.create_future())
+                queue.waiting[priority].setdefault(session, deque()).append(waiter)
+                LLM_QUEUE_DEPTH.inc(model=model, priority=priority)
+            else:
+                queue.active += 1
+        if waiter is not None:
+            try:
+                await waiter.future
+            except BaseException:
+                with self._lock:
+                    if not waiter.granted:
+                        self._remove(queue, priority, session, waiter)
+                        LLM_QUEUE_DEPTH.dec(model=model, priority=priority)
+                        waiter = None
+                if waiter is not None:
+                    # Granted just as it was cancelled: pass the slot on
+                    self._release(model, queue)
+                raise
+        waited = time.perf_counter() - start if waiter is not None else 0.0
+        LLM_QUEUE_WAIT_SECONDS.observe(waited, model=model, priority=priority)
+        LLM_IN_FLIGHT.inc(model=model)
+        try:
+            yield waited
+        finally:
+            LLM_IN_FLIGHT.dec(model=model)
+            self._release(model, queue)
+
+    def try_acquire(self, model: str) -> bool:
+        """Take one of `model`'s slots only if one is free now, without queueing.
+
+        Nothing is taken if requests are already waiting. A taken slot must
+        be given back with release().
+        """
+        limit = get_settings().llm_max_concurrency
+        with self._lock:
+            queue = self._models.setdefault(model, _ModelQueue())
+            queued = any(queue.waiting[p] for p in PRIORITIES)
+            if limit > 0 and (queue.active >= limit or queued):
+                return False
+            queue.active += 1
+        LLM_IN_FLIGHT.inc(model=model)
+        return True
+
+    def release(self, model: str) -> None:
+        """Give back a slot taken with try_acquire()."""
+        LLM_IN_FLIGHT.dec(model=model)
+        with self._lock:
+            queue = self._models[model]
+        self._release(model, queue)
+
+    @staticmethod
+    def _remove(queue: _ModelQueue, priority: str, session: str, waiter: _Waiter) -> None:
+        sessions = queue.waiting[priority]
+        waiters = sessions.get(session)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del sessions[session]
+
+    def _release(self, model: str, queue: _ModelQueue) -> None:
+        """Free a slot, handing it to the next waiter if there is one.
+
+        The next waiter is the oldest of the session after the last one
+        served in the highest non-empty priority class (round-robin).
+        """
+        with self._lock:
+            for priority in PRIORITIES:
+                sessions = queue.waiting[priority]
+                if not sessions:
+                    continue
+                session, waiters = next(iter(sessions.items()))
+                waiter = waiters.popleft()
+                del sessions[session]
+                if waiters:
+                    sessions[session] = waiters  # To the back of the rotation
+                waiter.granted = True
+                LLM_QUEUE_DEPTH.dec(model=model, priority=priority)
+                break
+            else:
+                queue.active -= 1
+                return
+        # The slot stays counted in queue.active for the woken waiter
+        try:
+            waiter.loop.call_soon_threadsafe(_wake, waiter)
+        except RuntimeError:
+            # Its event loop is closed: nobody will take the slot
+            self._release(model, queue)
+
+
+_governor = LLMGovernor()
+
+
+def get_governor() -> LLMGovernor:
+    return _governor
@@ -2,20 +2,35 @@ import asyncio
 import subprocess
 import sys
 import tempfile
+import threading
+from contextlib import aclosing
 from pathlib import Path
 
 import nest_asyncio
 import streamlit as st
+from streamlit.runtime.scriptrunner import RerunException, StopException
 
+from hr_breaker import metrics
 from hr_breaker.auth import logout_button, require_auth
 from hr_breaker.agents import extract_name, parse_job_posting
-from hr_breaker.config import get_settings
-from hr_breaker.models import GeneratedPDF, ResumeSource, ValidationResult
-from hr_breaker.orchestration import optimize_for_job
+from hr_breaker.config import get_settings, logger
+from hr_breaker.models import (
+    FilterFinished,
+    GeneratedPDF,
+    IterationFinished,
+    OptimizerStarted,
+    RenderFinished,
+    ResumeSource,
+    RunFinished,
+    ValidationResult,
+)
+from hr_breaker.orchestration import optimize_for_job_stream
 from hr_breaker.openai_keys import get_openai_api_keys, mask_keys
+from hr_breaker.profiling import LoopWatchdog, RunProfiler
 from hr_breaker.services import (
     PDFStorage,
     ResumeCache,
+    new_run_id,
     scrape_job_posting,
     CloudflareBlockedError,
 )
@@ -43,21 +58,88 @@ def run_async(coro):
     return loop.run_until_complete(coro)
 
 
+def stop_clicked(interrupt: RerunException) -> bool:
+    """Whether a rerun interrupting the run was requested by its Stop button.
+
+    The button's on_click would only run when the next script run starts, so
+    the click is read from the widget states the rerun carries.
+    """
+    states = interrupt.rerun_data.widget_states
+    return states is not None and any(
+        w.id.endswith("-stop_run") and w.trigger_value for w in states.widgets
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_server():
+    """Start the metrics side server once per process."""
+    metrics.install()
+    if not settings.metrics_port:
+        return None
+    try:
+        return metrics.start_server(settings.metrics_port, settings.metrics_host)
+    except OSError as e:
+        logger.warning(f"Metrics server not started: {e}")
+        return None
+
+
+start_metrics_server()
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup():
+    """Warm up renderer, filters and agents once per process, off the UI thread."""
+    if not settings.warmup:
+        return None
+    from hr_breaker.warmup import warmup
+
+    def run():
+        # Own loop: nest_asyncio's asyncio.run expects one set on this thread
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(warmup())
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=run, name="hr-breaker-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+start_warmup()
+
+
+# Set by a st.cache_* body when it runs; cached bodies run on the calling
+# session's thread, so each lookup sees only its own miss
+_cache_lookup = threading.local()
+
+
+def with_cache_metrics(cache_name: str, cached_fn, *args):
+    """Call a st.cache_* function, counting a hit unless its body ran (a miss)."""
+    _cache_lookup.missed = False
+    result = cached_fn(*args)
+    metrics.record_cache(cache_name, hit=not _cache_lookup.missed)
+    return result
+
+
 @st.cache_data(show_spinner=False)
 def cached_scrape_job(url: str) -> str:
     """Cached job scraping by URL."""
+    _cache_lookup.missed = True
     return scrape_job_posting(url)
 
 
 @st.cache_data(show_spinner=False)
 def cached_extract_name(content: str) -> tuple[str | None, str | None]:
     """Cached name extraction by resume content hash."""
+    _cache_lookup.missed = True
     return run_async(extract_name(content))
 
 
 @st.cache_resource(show_spinner=False)
 def cached_parse_job(text: str):
     """Cached job parsing by job text hash."""
+    _cache_lookup.missed = True
     return run_async(parse_job_posting(text))
 
 
@@ -111,7 +193,19 @@ with st.sidebar:
     sequential_mode = st.checkbox(
         "Sequential", value=False, help="Run filters sequentially with early exit"
     )
-    debug_mode = st.checkbox("Debug", value=False, help="Save each iteration PDF")
+    pipelined_mode = st.checkbox(
+        "Pipelined",
+        value=settings.pipelined,
+        help="Start the next optimizer call while LLM filters are still running",
+    )
+    debug_mode = st.checkbox(
+        "Debug", value=False, help="Save each iteration PDF and log event-loop stalls"
+    )
+    profile_mode = st.checkbox(
+        "Profile",
+        value=False,
+        help="Sample stacks and event-loop lag; writes a flamegraph profile to the debug dir",
+    )
     no_shame_mode = st.checkbox(
         "No Shame",
         value=False,
@@ -120,6 +214,13 @@ with st.sidebar:
     max_iterations = st.number_input(
         "Max iterations", min_value=1, max_value=10, value=settings.max_iterations
     )
+    candidates = st.number_input(
+        "Candidates",
+        min_value=1,
+        max_value=5,
+        value=max(1, settings.optimizer_candidates),
+        help="Optimizer candidates per iteration (more = faster to pass, more tokens)",
+    )
 
     st.divider()
 
@@ -250,7 +351,9 @@ with col_resume:
 
         if resume_content:
             with st.spinner("Extracting name..."):
-                first_name, last_name = cached_extract_name(resume_content)
+                first_name, last_name = with_cache_metrics(
+                    "name_extract", cached_extract_name, resume_content
+                )
             source = ResumeSource(
                 content=resume_content, first_name=first_name, last_name=last_name
             )
@@ -302,7 +405,9 @@ with col_job:
                 st.session_state["last_job_url"] = job_url
                 with st.spinner("Fetching..."):
                     try:
-                        job_text = cached_scrape_job(job_url)
+                        job_text = with_cache_metrics(
+                            "job_scrape", cached_scrape_job, job_url
+                        )
                         st.session_state["job_text"] = job_text
                         st.session_state.pop("scrape_failed_url", None)
                         st.rerun()
@@ -346,25 +451,54 @@ if clicked:
     source = st.session_state["source_resume"]
     st.session_state["optimization_running"] = True
     error_occurred = None
+    interrupt = None
+
+    # With checkpoints on, a run interrupted by a rerun/crash is continued
+    # from its checkpoint
+    active_run = st.session_state.get("active_run")
+    if (
+        settings.checkpoints
+        and active_run
+        and active_run["checksum"] == source.checksum
+        and active_run["job_text"] == job_text
+    ):
+        run_id = active_run["run_id"]
+        st.info(f"Resuming interrupted run {run_id}")
+    else:
+        run_id = new_run_id()
+        st.session_state["active_run"] = {
+            "run_id": run_id,
+            "checksum": source.checksum,
+            "job_text": job_text,
+        }
 
     try:
         with st.spinner("Parsing job posting..."):
-            job = cached_parse_job(job_text)
+            job = with_cache_metrics("job_parse", cached_parse_job, job_text)
 
         # Setup debug dir if enabled
         debug_dir = None
-        if debug_mode:
+        if debug_mode or profile_mode:
             debug_dir = pdf_storage.generate_debug_dir(job.company, job.title)
 
         # Store iteration results for session state
         iteration_results = []
 
+        # Clicking Stop interrupts this script run at its next UI update;
+        # run_streaming() sees it was Stop, cancels the run and keeps its
+        # best result
+        st.button(
+            "⏹ Stop",
+            key="stop_run",
+            use_container_width=True,
+            help="Stop after the current stage, keeping the best result so far",
+        )
+        cancel = asyncio.Event()
+
         with st.status("Optimizing resume...", expanded=True) as status_container:
 
             def on_iteration(i, opt, val):
                 iteration_results.append((i, opt, val))
-                status_container.update(label=f"Iteration {i + 1}/{max_iterations}")
-                status_container.write(f"Iteration {i + 1} complete")
 
                 # Save debug files if enabled
                 if debug_mode and debug_dir:
@@ -375,18 +509,112 @@ if clicked:
                             opt.pdf_bytes
                         )
 
-            optimized, validation, job = run_async(
-                optimize_for_job(
+            def show_event(event):
+                if isinstance(event, OptimizerStarted):
+                    status_container.update(
+                        label=f"Iteration {event.iteration + 1}/{max_iterations}: optimizing..."
+                    )
+                elif isinstance(event, RenderFinished) and not event.success:
+                    status_container.write("PDF render failed")
+                elif isinstance(event, FilterFinished):
+                    icon = "[OK]" if event.result.passed else "[X]"
+                    status_container.write(
+                        f"{icon} {event.result.filter_name}: "
+                        f"{event.result.score:.2f}/{event.result.threshold:.2f}"
+                    )
+                elif isinstance(event, IterationFinished):
+                    status_container.update(
+                        label=f"Iteration {event.iteration + 1}/{max_iterations}"
+                    )
+                    status_container.write(f"Iteration {event.iteration + 1} complete")
+                elif isinstance(event, RunFinished):
+                    if event.budget_exhausted:
+                        status_container.write(
+                            f"Budget exhausted ({event.budget_exhausted}), "
+                            "showing best result so far"
+                        )
+                    elif event.plateaued:
+                        status_container.write(
+                            "Scores stopped improving, showing best "
+                            f"result (iteration {event.best_iteration + 1})"
+                        )
+
+            async def run_streaming():
+                """Consume the event stream, showing per-stage progress.
+
+                A Streamlit rerun/stop raised by a progress update ends the
+                UI updates; the rest of the stream is drained until
+                RunFinished and the interrupt is returned to be re-raised
+                once the result is saved. Only the Stop button (or a script
+                stop) sets `cancel`; other reruns let the run finish.
+                """
+                finished = None
+                interrupt = None
+                stream = optimize_for_job_stream(
                     source,
                     job_text,
                     max_iterations=max_iterations,
-                    on_iteration=on_iteration,
                     job=job,
                     parallel=not sequential_mode,
                     no_shame=no_shame_mode,
+                    candidates=candidates,
+                    pipelined=pipelined_mode,
+                    cancel=cancel,
+                    run_id=run_id,
                 )
+                async with aclosing(stream) as events:
+                    async for event in events:
+                        if isinstance(event, IterationFinished):
+                            on_iteration(
+                                event.iteration, event.optimized, event.validation
+                            )
+                        elif isinstance(event, RunFinished):
+                            finished = event
+                        if interrupt is not None:
+                            continue
+                        try:
+                            show_event(event)
+                        except StopException as e:
+                            interrupt = e
+                            cancel.set()
+                        except RerunException as e:
+                            interrupt = e
+                            if stop_clicked(e):
+                                cancel.set()
+                return finished, interrupt
+
+            profiler = RunProfiler() if profile_mode else None
+            watchdog = LoopWatchdog() if debug_mode else None
+            run = run_streaming()
+            if profiler:
+                run = profiler.run(run)
+            if watchdog:
+                run = watchdog.run(run)
+            finished, interrupt = run_async(run)
+            optimized, validation, job = (
+                finished.optimized,
+                finished.validation,
+                finished.job,
+            )
+            if watchdog and debug_dir:
+                watchdog.write(debug_dir)
+                stalls = watchdog.by_call_site()
+                if stalls:
+                    status_container.write(
+                        f"Event loop blocked {sum(s['total'] for s in stalls):.2f}s, "
+                        f"worst at {stalls[0]['call_site']} (see loop_stalls.json)"
+                    )
+            if profiler and debug_dir:
+                profiler.write(debug_dir)
+                lag = profiler.lag.summary()
+                status_container.write(
+                    f"Profile saved ({profiler.sampler.samples} samples), event-loop "
+                    f"lag max {lag['max'] * 1000:.0f}ms p95 {lag['p95'] * 1000:.0f}ms"
+                )
+            status_container.update(
+                label="Optimization stopped" if finished.cancelled else "Optimization complete",
+                state="complete",
             )
-            status_container.update(label="Optimization complete", state="complete")
 
         # Save PDF and store results in session state
         pdf_path = None
@@ -415,14 +643,22 @@ if clicked:
             "iterations": iteration_results,
             "pdf_path": pdf_path,
             "debug_dir": debug_dir,
+            "budget_exhausted": finished.budget_exhausted,
+            "cancelled": finished.cancelled,
         }
+        st.session_state.pop("active_run", None)
     except Exception as e:
+        # A failed run starts over on the next click; only interrupted ones
+        # resume
+        st.session_state.pop("active_run", None)
         error_occurred = e
     finally:
         st.session_state["optimization_running"] = False
 
     if error_occurred:
         st.error(f"Optimization failed: {error_occurred}")
+    elif interrupt is not None:
+        raise interrupt  # The rerun/stop Streamlit asked for, now served
     else:
         st.rerun()  # Rerun to show results and update history
 
@@ -441,7 +677,16 @@ if "last_result" in st.session_state:
     st.markdown(f"### Result: {job.title} at {job.company}")
 
     # Status message
-    if validation.passed:
+    if result.get("cancelled"):
+        st.info("Stopped early, showing the best result so far")
+    if validation is None and result.get("cancelled"):
+        st.warning("Stopped before any iteration completed, no result")
+    elif validation is None:
+        st.warning(
+            "Budget exhausted before any iteration completed "
+            f"({result.get('budget_exhausted') or 'unknown'}), no result"
+        )
+    elif validation.passed:
         st.success("All filters passed!")
     else:
         passed = [r.filter_name for r in validation.results if r.passed]
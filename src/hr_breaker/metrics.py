@@ -0,0 +1,323 @@
+"""Process-wide counters, gauges and histograms.
+
+Most metrics are derived from finished tracing spans (install() registers
+the listener): runs, iterations per run, filter pass/fail, stage latencies
+and LLM requests/tokens per model and API key. Cache lookups and in-flight
+renders are recorded directly.
+
+Exposed as Prometheus text and JSON by a small side HTTP server
+(start_server(), started by the Streamlit app) and dumped as JSON by the CLI.
+"""
+
+import bisect
+import json
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from hr_breaker.config import logger
+from hr_breaker.tracing import Span, add_span_listener
+
+Labels = tuple[tuple[str, str], ...]
+
+_lock = threading.Lock()
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+
+    def _prometheus_samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with _lock:
+            lines.extend(self._prometheus_samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _labels(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with _lock:
+            return self._values.get(_labels(labels), 0.0)
+
+    def _prometheus_samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(k)} {v:g}" for k, v in sorted(self._values.items())
+        ]
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with _lock:
+            return [{"labels": dict(k), "value": v} for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels: Any) -> Iterator[None]:
+        """Count the enclosed block as in flight."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...]):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: (bucket counts, sum, count)
+        self._values: dict[Labels, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _labels(labels)
+        with _lock:
+            counts, total, count = self._values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(counts):
+                counts[index] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def _prometheus_samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = (("le", f"{bound:g}"),)
+                lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+            inf = (("le", "+Inf"),)
+            lines.append(f"{self.name}_bucket{_format_labels(key, inf)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total:g}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with _lock:
+            return [
+                {
+                    "labels": dict(key),
+                    "count": count,
+                    "sum": total,
+                    "buckets": dict(zip((f"{b:g}" for b in self.buckets), counts)),
+                }
+                for key, (counts, total, count) in sorted(self._values.items())
+            ]
+
+
+_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+RUNS = Counter("hr_breaker_runs_total", "Optimization runs by outcome")
+RUN_ITERATIONS = Histogram(
+    "hr_breaker_run_iterations", "Iterations per run", (1, 2, 3, 4, 5, 6, 8, 10, 15, 20)
+)
+FILTER_RESULTS = Counter(
+    "hr_breaker_filter_results_total", "Filter evaluations by filter and result"
+)
+STAGE_SECONDS = Histogram(
+    "hr_breaker_stage_seconds", "Latency per traced stage", _LATENCY_BUCKETS
+)
+LLM_REQUESTS = Counter(
+    "hr_breaker_llm_requests_total", "LLM/embedding requests by model, key and status"
+)
+LLM_TOKENS = Counter(
+    "hr_breaker_llm_tokens_total", "Tokens by model, key and type (input/output/cache_read)"
+)
+CACHE_LOOKUPS = Counter("hr_breaker_cache_lookups_total", "Cache lookups by cache and result")
+RENDERS = Counter("hr_breaker_renders_total", "PDF renders by kind (html/data)")
+LOOP_STALLS = Histogram(
+    "hr_breaker_loop_stall_seconds",
+    "Event-loop stalls over the watchdog threshold by stage",
+    _LATENCY_BUCKETS,
+)
+LLM_CACHED_INPUT_RATIO = Histogram(
+    "hr_breaker_llm_cached_input_ratio",
+    "Share of each LLM request's input tokens read from the provider's prompt cache, by stage",
+    (0, 0.1, 0.25, 0.5, 0.75, 0.9, 1),
+)
+LLM_ROUTES = Counter(
+    "hr_breaker_llm_routes_total",
+    "Routed LLM calls by stage, route (flash/pro) and outcome "
+    "(ok/error, failed = flash result still failing next iteration)",
+)
+LLM_ROUTE_SECONDS = Histogram(
+    "hr_breaker_llm_route_seconds",
+    "Latency of routed LLM calls by stage and route",
+    _LATENCY_BUCKETS,
+)
+LLM_HEDGES = Counter(
+    "hr_breaker_llm_hedges_total",
+    "Slow hedgeable LLM requests by model and outcome (won/lost: the duplicate "
+    "answered first or not, skipped: over budget or no healthy spare key)",
+)
+LLM_QUEUE_DEPTH = Gauge(
+    "hr_breaker_llm_queue_depth",
+    "LLM requests waiting for a concurrency slot, by model and priority",
+)
+LLM_QUEUE_WAIT_SECONDS = Histogram(
+    "hr_breaker_llm_queue_wait_seconds",
+    "Time LLM requests waited for a concurrency slot, by model and priority",
+    _LATENCY_BUCKETS,
+)
+LLM_IN_FLIGHT = Gauge("hr_breaker_llm_in_flight", "LLM requests in flight by model")
+RENDERS_IN_FLIGHT = Gauge(
+    "hr_breaker_renders_in_flight", "PDF renders running or waiting to run"
+)
+
+ALL_METRICS: list[Counter | Histogram] = [
+    RUNS,
+    RUN_ITERATIONS,
+    FILTER_RESULTS,
+    STAGE_SECONDS,
+    LLM_REQUESTS,
+    LLM_TOKENS,
+    LLM_CACHED_INPUT_RATIO,
+    LLM_ROUTES,
+    LLM_ROUTE_SECONDS,
+    LLM_HEDGES,
+    LLM_QUEUE_DEPTH,
+    LLM_QUEUE_WAIT_SECONDS,
+    LLM_IN_FLIGHT,
+    CACHE_LOOKUPS,
+    RENDERS,
+    RENDERS_IN_FLIGHT,
+    LOOP_STALLS,
+]
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def observe_span(span: Span) -> None:
+    """Update metrics from a finished span."""
+    attrs = span.attributes
+    STAGE_SECONDS.observe(span.duration, stage=span.name)
+    if span.name == "run":
+        outcome = "error" if span.error else attrs.get("outcome", "unknown")
+        RUNS.inc(outcome=outcome)
+        if "iterations" in attrs:
+            RUN_ITERATIONS.observe(attrs["iterations"])
+    elif span.name.startswith("filter:") and "passed" in attrs:
+        FILTER_RESULTS.inc(
+            filter=span.name.removeprefix("filter:"),
+            result="pass" if attrs["passed"] else "fail",
+        )
+    elif span.name in ("llm_request", "embedding_request"):
+        labels = {"model": attrs.get("model", ""), "key": attrs.get("key_index", "")}
+        if not span.error:
+            status = "ok"
+        elif span.error.startswith("CancelledError"):
+            status = "cancelled"  # e.g. the slower of two hedged requests
+        else:
+            status = "error"
+        LLM_REQUESTS.inc(status=status, **labels)
+        for kind in ("input", "output", "cache_read"):
+            tokens = attrs.get(f"{kind}_tokens")
+            if tokens:
+                LLM_TOKENS.inc(tokens, type=kind, **labels)
+        if span.name == "llm_request" and attrs.get("input_tokens"):
+            LLM_CACHED_INPUT_RATIO.observe(
+                attrs.get("cache_read_tokens", 0) / attrs["input_tokens"],
+                stage=attrs.get("stage", ""),
+            )
+
+
+_installed = False
+
+
+def install() -> None:
+    """Start deriving metrics from tracing spans (idempotent)."""
+    global _installed
+    with _lock:
+        if _installed:
+            return
+        _installed = True
+    add_span_listener(observe_span)
+
+
+def render_prometheus() -> str:
+    return "\n".join(m.render() for m in ALL_METRICS) + "\n"
+
+
+def snapshot() -> dict[str, Any]:
+    """All metrics as JSON-serializable data."""
+    return {
+        m.name: {"type": m.kind, "help": m.help, "samples": m.snapshot()}
+        for m in ALL_METRICS
+    }
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        path = self.path.split("?")[0]
+        if path == "/metrics":
+            body = render_prometheus().encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body = json.dumps(snapshot()).encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Scrapes every few seconds would flood stderr
+
+
+def start_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread."""
+    install()
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="hr-breaker-metrics", daemon=True
+    ).start()
+    logger.info(f"Metrics server listening on {host}:{server.server_port}")
+    return server
@@ -0,0 +1,465 @@
+"""OpenAI-compatible mock server for load testing.
+
+Serves /v1/chat/completions (text, image inputs, function tools, tool and
+prompted structured output), /v1/embeddings and /v1/models with canned
+outputs from the benchmark's FakeLLM. Latency, 429 rate limits and quota
+errors are configurable, so key rotation, rate-limit handling and
+concurrency can be measured without spending real quota.
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1. Use
+127.0.0.1 rather than localhost: a "localhost" base URL switches the app
+to its Ollama mode (placeholder key, nomic-embed-text), which skips key
+rotation.
+
+Chat prompts of 1024+ tokens get OpenAI-style prefix caching: the longest
+previously seen prefix, in 128-token steps, is reported as
+prompt_tokens_details.cached_tokens.
+
+Also serves GET /mock/stats (requests by key and status, peak concurrency,
+images seen, prompt/cached tokens) and POST /mock/reset.
+"""
+
+import base64
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from hr_breaker.benchmark import (
+    BenchCase,
+    FakeLLM,
+    _current_case,
+    hash_embedding,
+    resume_to_html,
+)
+from hr_breaker.config import logger
+
+_PROMPTED_MARKER = "Always respond with a JSON object that's compatible with this schema:"
+# Roughly what OpenAI bills for a low-detail image
+_IMAGE_TOKENS = 85
+_PLACEHOLDER_RESUME = "Candidate\n\nExperience\nSoftware engineer"
+# Prefix caching granularity in characters (~4 per token): 1024-token
+# minimum, then 128-token increments
+_CACHE_MIN_CHARS = 1024 * 4
+_CACHE_STEP_CHARS = 128 * 4
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock server.
+
+    latency_distribution: "fixed" (always `latency`), "uniform"
+    (latency +- jitter) or "lognormal" (median `latency`, sigma `jitter`).
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    latency_distribution: str = "fixed"
+    # Probability that a request gets a transient 429 rate_limit_exceeded
+    rate_limit_rate: float = 0.0
+    # Requests per minute allowed per API key (None = unlimited)
+    rpm_per_key: int | None = None
+    # Keys that always get 429 insufficient_quota
+    exhausted_keys: set[str] = field(default_factory=set)
+    # If set, any other key gets 401 invalid_api_key
+    valid_keys: set[str] | None = None
+    retry_after: float = 1.0
+    models: list[str] = field(
+        default_factory=lambda: ["gpt-4o", "gpt-4o-mini", "text-embedding-3-small"]
+    )
+    # Extra canned outputs by output model name, merged over FakeLLM's
+    outputs: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # Cases to pick realistic outputs from (matched by resume name / job text)
+    cases: list[BenchCase] = field(default_factory=list)
+    # Report cached_tokens for repeated prompt prefixes
+    prompt_cache: bool = True
+    seed: int = 0
+
+
+class MockStats:
+    """Request counters, shared by all handler threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: dict[str, int] = {}
+            self.by_key: dict[str, dict[str, int]] = {}
+            self.images = 0
+            self.prompt_tokens = 0
+            self.cached_tokens = 0
+            self.in_flight = 0
+            self.peak_in_flight = 0
+
+    def start(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self, endpoint: str, key: str, status: int, images: int = 0) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            statuses = self.by_key.setdefault(key, {})
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            self.images += images
+
+    def tokens(self, prompt: int, cached: int) -> None:
+        with self._lock:
+            self.prompt_tokens += prompt
+            self.cached_tokens += cached
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "by_key": {k: dict(v) for k, v in self.by_key.items()},
+                "images": self.images,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+            }
+
+
+class _MockError(Exception):
+    def __init__(
+        self, status: int, code: str, message: str, headers: dict[str, str] | None = None
+    ):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.headers = headers or {}
+
+
+def _error_type(status: int) -> str:
+    if status == 429:
+        return "requests"
+    if status == 401:
+        return "invalid_request_error"
+    return "server_error"
+
+
+def _message_text(message: dict[str, Any]) -> tuple[str, int]:
+    """Text of a chat message and the number of valid images in it."""
+    content = message.get("content")
+    if isinstance(content, str):
+        return content, 0
+    if not isinstance(content, list):
+        return "", 0
+    texts, images = [], 0
+    for part in content:
+        if part.get("type") == "text":
+            texts.append(part.get("text", ""))
+        elif part.get("type") == "image_url":
+            url = part.get("image_url", {}).get("url", "")
+            if url.startswith("data:"):
+                try:
+                    base64.b64decode(url.split(",", 1)[1], validate=True)
+                except (IndexError, ValueError):
+                    raise _MockError(400, "invalid_image", "Invalid base64 image data")
+            images += 1
+    return "\n".join(texts), images
+
+
+def _prompted_schema(text: str) -> dict[str, Any] | None:
+    """JSON schema embedded by pydantic-ai's prompted output instructions."""
+    index = text.find(_PROMPTED_MARKER)
+    if index < 0:
+        return None
+    start = text.find("{", index)
+    try:
+        schema, _ = json.JSONDecoder().raw_decode(text, start)
+    except ValueError:
+        return None
+    return schema
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: MockConfig | None = None):
+        super().__init__(address, _MockHandler)
+        self.config = config or MockConfig()
+        self.stats = MockStats()
+        self.fake = FakeLLM(exercise_tools=False)
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._key_requests: dict[str, deque[float]] = {}
+        self._prefixes: set[bytes] = set()
+
+    def delay(self) -> float:
+        config = self.config
+        with self._lock:
+            if config.latency_distribution == "uniform":
+                delay = config.latency + self._random.uniform(-config.jitter, config.jitter)
+            elif config.latency_distribution == "lognormal" and config.latency > 0:
+                delay = self._random.lognormvariate(0.0, config.jitter) * config.latency
+            else:
+                delay = config.latency
+        return max(0.0, delay)
+
+    def check_key(self, key: str) -> None:
+        """Raise the error OpenAI would return for this key right now."""
+        config = self.config
+        if config.valid_keys is not None and key not in config.valid_keys:
+            raise _MockError(401, "invalid_api_key", "Incorrect API key provided")
+        if key in config.exhausted_keys:
+            raise _MockError(
+                429,
+                "insufficient_quota",
+                "You exceeded your current quota, please check your plan and billing details.",
+                {"x-should-retry": "false"},
+            )
+        retry_after = {"retry-after": f"{config.retry_after:g}"}
+        with self._lock:
+            if config.rate_limit_rate and self._random.random() < config.rate_limit_rate:
+                raise _MockError(
+                    429, "rate_limit_exceeded", "Rate limit reached (injected)", retry_after
+                )
+            if config.rpm_per_key:
+                now = time.monotonic()
+                window = self._key_requests.setdefault(key, deque())
+                while window and now - window[0] > 60:
+                    window.popleft()
+                if len(window) >= config.rpm_per_key:
+                    raise _MockError(
+                        429,
+                        "rate_limit_exceeded",
+                        f"Rate limit reached: {config.rpm_per_key} RPM",
+                        retry_after,
+                    )
+                window.append(now)
+
+    def cached_tokens(self, text: str) -> int:
+        """Tokens of the longest cached prefix of text; caches its prefixes."""
+        if not self.config.prompt_cache:
+            return 0
+        digest = hashlib.sha1()
+        prefixes = []
+        start = 0
+        for end in range(_CACHE_MIN_CHARS, len(text) + 1, _CACHE_STEP_CHARS):
+            digest.update(text[start:end].encode())
+            prefixes.append((end, digest.digest()))
+            start = end
+        cached = 0
+        with self._lock:
+            for end, prefix in prefixes:
+                if prefix not in self._prefixes:
+                    break
+                cached = end
+            self._prefixes.update(prefix for _, prefix in prefixes)
+        return cached // 4
+
+    def reset_prompt_cache(self) -> None:
+        with self._lock:
+            self._prefixes.clear()
+
+    def match_case(self, text: str) -> BenchCase | None:
+        for case in self.config.cases:
+            name_line = case.resume.strip().splitlines()[0]
+            if name_line in text or case.job_text.strip()[:200] in text:
+                return case
+        return None
+
+    def output(self, title: str, schema: dict[str, Any], text: str) -> dict[str, Any]:
+        token = _current_case.set(self.match_case(text))
+        try:
+            value = self.fake.output(title, schema)
+        finally:
+            _current_case.reset(token)
+        if title == "OptimizerResult" and not value.get("html"):
+            value["html"] = resume_to_html(_PLACEHOLDER_RESUME)
+        value.update(self.config.outputs.get(title, {}))
+        return value
+
+    def chat_completion(self, body: dict[str, Any]) -> tuple[dict[str, Any], int]:
+        """Response for a chat completion request and the number of images in it."""
+        if body.get("stream"):
+            raise _MockError(400, "unsupported", "Streaming is not supported by the mock")
+        texts, images = [], 0
+        tools_called = False
+        for message in body.get("messages", []):
+            text, n = _message_text(message)
+            texts.append(text)
+            images += n
+            tools_called = tools_called or message.get("role") == "tool"
+        text = "\n".join(texts)
+
+        output_tool = None
+        html_tools = []
+        for tool in body.get("tools", []):
+            function = tool.get("function", {})
+            if function.get("name", "").startswith("final_result"):
+                output_tool = function
+            elif set(function.get("parameters", {}).get("properties", {})) == {"html"}:
+                html_tools.append(function["name"])
+
+        message: dict[str, Any] = {"role": "assistant", "content": None}
+        if output_tool is not None:
+            schema = output_tool.get("parameters", {})
+            args = self.output(schema.get("title", ""), schema, text)
+            calls = [(output_tool["name"], args)]
+        else:
+            response_format = body.get("response_format") or {}
+            schema = response_format.get("json_schema", {}).get("schema")
+            schema = schema or _prompted_schema(text) or {}
+            args = self.output(schema.get("title", ""), schema, text)
+            calls = []
+            message["content"] = json.dumps(args) if schema else "OK"
+        # Optimizer: call each html-checking tool once before answering
+        if html_tools and args.get("html") and not tools_called:
+            calls = [(name, {"html": args["html"]}) for name in html_tools]
+            message["content"] = None
+        if calls:
+            message["tool_calls"] = [
+                {
+                    "id": f"call_{uuid.uuid4().hex[:12]}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(arguments)},
+                }
+                for name, arguments in calls
+            ]
+
+        completion = json.dumps(message)
+        prompt_tokens = len(text) // 4 + images * _IMAGE_TOKENS
+        cached_tokens = self.cached_tokens(text)
+        completion_tokens = len(completion) // 4
+        self.stats.tokens(prompt_tokens, cached_tokens)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", ""),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": "tool_calls" if calls else "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            },
+        }, images
+
+    def embeddings(self, body: dict[str, Any]) -> dict[str, Any]:
+        inputs = body.get("input", "")
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        dimensions = body.get("dimensions") or 64
+        tokens = sum(len(str(text)) // 4 for text in inputs)
+        return {
+            "object": "list",
+            "data": [
+                {
+                    "object": "embedding",
+                    "index": i,
+                    "embedding": hash_embedding(str(text), dimensions),
+                }
+                for i, text in enumerate(inputs)
+            ],
+            "model": body.get("model", ""),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    def models(self) -> dict[str, Any]:
+        return {
+            "object": "list",
+            "data": [
+                {"id": name, "object": "model", "created": 0, "owned_by": "hr-breaker-mock"}
+                for name in self.config.models
+            ],
+        }
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    server: MockOpenAIServer
+    protocol_version = "HTTP/1.1"
+
+    def _send(
+        self, status: int, payload: dict[str, Any], headers: dict[str, str] | None = None
+    ) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _key(self) -> str:
+        return self.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+
+    def do_GET(self) -> None:
+        path = self.path.split("?")[0].rstrip("/")
+        if path == "/v1/models":
+            self._send(200, self.server.models())
+        elif path == "/mock/stats":
+            self._send(200, self.server.stats.snapshot())
+        else:
+            self._send(404, {"error": {"message": f"Unknown path {path}"}})
+
+    def do_POST(self) -> None:
+        path = self.path.split("?")[0].rstrip("/")
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if path == "/mock/reset":
+            self.server.stats.reset()
+            self.server.reset_prompt_cache()
+            self._send(200, {"ok": True})
+            return
+        if path not in ("/v1/chat/completions", "/v1/embeddings"):
+            self._send(404, {"error": {"message": f"Unknown path {path}"}})
+            return
+
+        server = self.server
+        key = self._key()
+        images = 0
+        server.stats.start()
+        status = 200
+        try:
+            time.sleep(server.delay())
+            server.check_key(key)
+            body = json.loads(raw or b"{}")
+            if path == "/v1/embeddings":
+                payload = server.embeddings(body)
+            else:
+                payload, images = server.chat_completion(body)
+            self._send(200, payload)
+        except _MockError as e:
+            status = e.status
+            error = {"message": str(e), "type": _error_type(e.status), "code": e.code}
+            self._send(e.status, {"error": error}, e.headers)
+        except ValueError as e:
+            status = 400
+            self._send(400, {"error": {"message": f"Invalid JSON body: {e}"}})
+        finally:
+            server.stats.finish(path.removeprefix("/v1/"), key, status, images)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Load tests would flood stderr
+
+
+def start_mock_server(
+    config: MockConfig | None = None, port: int = 0, host: str = "127.0.0.1"
+) -> MockOpenAIServer:
+    """Serve the mock API from a daemon thread (port 0 picks a free port)."""
+    server = MockOpenAIServer((host, port), config)
+    threading.Thread(
+        target=server.serve_forever, name="hr-breaker-mock-openai", daemon=True
+    ).start()
+    logger.info(f"Mock OpenAI server listening on http://{host}:{server.server_port}/v1")
+    return server
@@ -10,6 +10,18 @@ from .resume_data import (
 from .job_posting import JobPosting
 from .feedback import FilterResult, ValidationResult, GeneratedPDF
 from .iteration import IterationContext
+from .budget import RunBudget, UsageTotals
+from .checkpoint import CheckpointIteration, RunCheckpoint
+from .events import (
+    RunEvent,
+    JobParsed,
+    OptimizerStarted,
+    OptimizerFinished,
+    RenderFinished,
+    FilterFinished,
+    IterationFinished,
+    RunFinished,
+)
 
 __all__ = [
     "ResumeSource",
@@ -25,4 +37,16 @@ __all__ = [
     "ValidationResult",
     "GeneratedPDF",
     "IterationContext",
+    "RunBudget",
+    "UsageTotals",
+    "CheckpointIteration",
+    "RunCheckpoint",
+    "RunEvent",
+    "JobParsed",
+    "OptimizerStarted",
+    "OptimizerFinished",
+    "RenderFinished",
+    "FilterFinished",
+    "IterationFinished",
+    "RunFinished",
 ]
@@ -0,0 +1,44 @@
+"""Run-level limits and the usage they are checked against."""
+
+import time
+
+from pydantic import BaseModel, Field
+
+
+class UsageTotals(BaseModel):
+    """LLM usage accumulated over one optimization run."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    llm_calls: int = 0
+    cost_usd: float = 0.0
+    started_at: float = Field(default_factory=time.monotonic)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+class RunBudget(BaseModel):
+    """Caps for a single optimize_for_job run. None means unlimited."""
+
+    deadline_seconds: float | None = None  # Wall-clock, from run start
+    max_input_tokens: int | None = None
+    max_output_tokens: int | None = None
+    max_cost_usd: float | None = None  # Estimated, see hr_breaker.usage
+    max_llm_calls: int | None = None
+
+    def exhausted_by(self, usage: UsageTotals) -> str | None:
+        """Return why the budget is exhausted, or None if there is room left."""
+        if self.deadline_seconds is not None and usage.elapsed_seconds >= self.deadline_seconds:
+            return f"deadline of {self.deadline_seconds:.0f}s reached"
+        if self.max_input_tokens is not None and usage.input_tokens >= self.max_input_tokens:
+            return f"input token budget ({self.max_input_tokens}) used"
+        if self.max_output_tokens is not None and usage.output_tokens >= self.max_output_tokens:
+            return f"output token budget ({self.max_output_tokens}) used"
+        if self.max_cost_usd is not None and usage.cost_usd >= self.max_cost_usd:
+            return f"cost budget (${self.max_cost_usd:.2f}) used"
+        if self.max_llm_calls is not None and usage.llm_calls >= self.max_llm_calls:
+            return f"LLM call budget ({self.max_llm_calls}) used"
+        return None
@@ -0,0 +1,51 @@
+"""Persisted state of an optimization run, for resuming after a crash."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from hr_breaker.models.feedback import ValidationResult
+from hr_breaker.models.job_posting import JobPosting
+from hr_breaker.models.resume import OptimizedResume, ResumeSource
+
+
+class CheckpointIteration(BaseModel):
+    """One iteration's optimizer output and, once filters ran, its validation."""
+
+    iteration: int
+    optimized: OptimizedResume  # Stored without pdf_bytes/pdf_text (re-rendered)
+    validation: ValidationResult | None = None  # None: filters not finished
+
+
+class RunCheckpoint(BaseModel):
+    """Everything needed to continue a run without repeating paid LLM calls."""
+
+    run_id: str
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+    source: ResumeSource
+    job_text: str | None = None
+    job: JobPosting | None = None
+    max_iterations: int
+    parallel: bool = False
+    no_shame: bool = False
+    candidates: int = 1
+    pipelined: bool = False
+    optimizer_mode: str = "single"
+    iterations: list[CheckpointIteration] = Field(default_factory=list)
+    finished: bool = False
+
+    def record(
+        self,
+        iteration: int,
+        optimized: OptimizedResume,
+        validation: ValidationResult | None = None,
+    ) -> None:
+        """Record an iteration's optimizer output or (re-recorded) its validation."""
+        entry = CheckpointIteration(
+            iteration=iteration, optimized=optimized, validation=validation
+        )
+        if self.iterations and self.iterations[-1].iteration == iteration:
+            self.iterations[-1] = entry
+        else:
+            self.iterations.append(entry)
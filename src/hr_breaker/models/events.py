@@ -0,0 +1,85 @@
+"""Progress events streamed by optimize_for_job_stream()."""
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+from hr_breaker.models.budget import UsageTotals
+from hr_breaker.models.feedback import FilterResult, ValidationResult
+from hr_breaker.models.job_posting import JobPosting
+from hr_breaker.models.resume import OptimizedResume
+
+
+class JobParsed(BaseModel):
+    """Job posting parsed (or provided) - emitted once, first."""
+
+    kind: Literal["job_parsed"] = "job_parsed"
+    job: JobPosting
+    run_id: str | None = None  # Checkpoint ID, for resume_run()
+
+
+class OptimizerStarted(BaseModel):
+    kind: Literal["optimizer_started"] = "optimizer_started"
+    iteration: int
+    candidate: int = 0
+
+
+class OptimizerFinished(BaseModel):
+    kind: Literal["optimizer_finished"] = "optimizer_finished"
+    iteration: int
+    candidate: int = 0
+    changes: list[str]
+
+
+class RenderFinished(BaseModel):
+    kind: Literal["render_finished"] = "render_finished"
+    iteration: int
+    candidate: int = 0
+    success: bool
+    optimized: OptimizedResume
+
+
+class FilterFinished(BaseModel):
+    """A single filter result, emitted as soon as that filter completes."""
+
+    kind: Literal["filter_finished"] = "filter_finished"
+    iteration: int
+    candidate: int = 0
+    result: FilterResult
+
+
+class IterationFinished(BaseModel):
+    kind: Literal["iteration_finished"] = "iteration_finished"
+    iteration: int
+    optimized: OptimizedResume
+    validation: ValidationResult
+
+
+class RunFinished(BaseModel):
+    """Final event with the best iteration's result.
+
+    optimized/validation are None if stopped before any iteration completed.
+    """
+
+    kind: Literal["run_finished"] = "run_finished"
+    run_id: str | None = None
+    optimized: OptimizedResume | None
+    validation: ValidationResult | None
+    job: JobPosting | None
+    iterations: int
+    best_iteration: int | None = None
+    plateaued: bool = False  # Stopped early: scores stopped improving
+    cancelled: bool = False
+    budget_exhausted: str | None = None  # Reason, if the RunBudget stopped the run
+    usage: UsageTotals | None = None
+
+
+RunEvent = (
+    JobParsed
+    | OptimizerStarted
+    | OptimizerFinished
+    | RenderFinished
+    | FilterFinished
+    | IterationFinished
+    | RunFinished
+)
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import itertools
-from collections.abc import AsyncIterator
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any
 
 from pydantic_ai.exceptions import ModelHTTPError
@@ -10,6 +16,13 @@ from pydantic_ai.models.openai import OpenAIModel
 from pydantic_ai.profiles import ModelProfile
 from pydantic_ai.providers.openai import OpenAIProvider
 
+from hr_breaker.cassette import is_replaying, llm_http_client
+from hr_breaker.config import get_settings, logger
+from hr_breaker.llm_governor import current_priority, get_governor
+from hr_breaker.metrics import LLM_HEDGES
+from hr_breaker.tracing import current_span, span
+from hr_breaker.usage import record_response
+
 
 def _is_retryable_openai_http_error(e: ModelHTTPError) -> bool:
     # Common retry candidates for key rotation: auth issues, rate limits, inactive billing.
@@ -26,11 +39,89 @@ def _is_retryable_openai_http_error(e: ModelHTTPError) -> bool:
     return False
 
 
+# Hedging (settings.hedge_requests): a hedgeable request still running after
+# the p90 latency of its (model, stage) gets a duplicate on another key
+
+_HEDGE_MIN_SAMPLES = 20  # Latencies needed before a stage's p90 is trusted
+_KEY_COOLDOWN = 60.0  # Seconds a key stays unhealthy after a retryable error
+
+_hedgeable: ContextVar[bool] = ContextVar("hr_breaker_hedgeable", default=False)
+
+
+@contextmanager
+def hedgeable() -> Iterator[None]:
+    """Mark the LLM requests in the block as short and idempotent (safe to hedge)."""
+    token = _hedgeable.set(True)
+    try:
+        yield
+    finally:
+        _hedgeable.reset(token)
+
+
+class _LatencyWindow:
+    """Recent successful request latencies per (model, stage)."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._size = size
+        self._lock = threading.Lock()
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+
+    def add(self, key: tuple[str, str], seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self._size)).append(seconds)
+
+    def quantile(self, key: tuple[str, str], q: float) -> float | None:
+        """None until _HEDGE_MIN_SAMPLES latencies were seen."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < _HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class _HedgeBudget:
+    """Caps hedges at a share of all hedgeable requests (process-wide)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def take(self, share: float) -> bool:
+        with self._lock:
+            if self.hedges + 1 > share * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+
+_latencies = _LatencyWindow()
+_hedge_budget = _HedgeBudget()
+_key_failed_at: dict[str, float] = {}
+
+
+def _key_healthy(key: str | None) -> bool:
+    failed_at = _key_failed_at.get(key or "")
+    return failed_at is None or time.monotonic() - failed_at > _KEY_COOLDOWN
+
+
 class RotatingOpenAIModel(Model):
     """OpenAI model wrapper that retries the same request with multiple API keys.
 
     This solves the "single source of truth" requirement by taking keys from env_file
     and avoids UI/config persistence issues. Rotation happens per request, round-robin.
+
+    Each request first takes one of the model's slots from the process-wide
+    LLM governor (see llm_governor).
+
+    With settings.hedge_requests, requests made inside hedgeable() that are
+    still running after their stage's p90 latency are duplicated on another
+    healthy key (within settings.hedge_budget and only if the governor has a
+    free slot for the duplicate); the first response wins.
     """
 
     def __init__(
@@ -63,16 +154,18 @@ class RotatingOpenAIModel(Model):
         provider = OpenAIProvider(
             base_url=self._base_url,
             api_key=api_key,
+            http_client=llm_http_client(),
         )
         return OpenAIModel(self._model_name, provider=provider, profile=self.profile)
 
-    def _iter_keys(self) -> list[str | None]:
+    def _iter_keys(self) -> list[tuple[int, str | None]]:
+        """(key_index, key) pairs to try, in round-robin order."""
         # If no keys provided (local OpenAI-compatible), still create a provider.
         if not self._api_keys:
-            return [None]
+            return [(0, None)]
         n = len(self._api_keys)
         start = next(self._rr) % n
-        return [self._api_keys[(start + i) % n] for i in range(n)]
+        return [((start + i) % n, self._api_keys[(start + i) % n]) for i in range(n)]
 
     async def request(  # type: ignore[override]
         self,
@@ -80,11 +173,37 @@ class RotatingOpenAIModel(Model):
         model_settings: Any,
         model_request_parameters: Any,
     ) -> Any:
+        # Stage (e.g. optimizer, filter:LLMChecker) and iteration of the caller,
+        # so prompt-cache hits can be compared per stage and iteration
+        parent = current_span()
+        context = {"stage": parent.name if parent else ""}
+        if parent and "iteration" in parent.attributes:
+            context["iteration"] = parent.attributes["iteration"]
+        context["priority"] = current_priority()
+        async with get_governor().slot(self._model_name) as waited:
+            if waited:
+                context["queue_wait"] = round(waited, 3)
+            return await self._request(
+                context, (messages, model_settings, model_request_parameters)
+            )
+
+    async def _request(self, context: dict[str, Any], args: tuple[Any, Any, Any]) -> Any:
+        """request() once a slot is held: hedging, then key rotation."""
         last_err: Exception | None = None
-        for key in self._iter_keys():
+        keys = self._iter_keys()
+        delay = self._hedge_delay(keys, context["stage"])
+        if delay is not None:
+            tried: list[tuple[int, str | None]] = []
             try:
-                model = self._make_model(key)
-                return await model.request(messages, model_settings, model_request_parameters)
+                return await self._hedged(keys, delay, tried, context, args)
+            except ModelHTTPError as e:
+                if not _is_retryable_openai_http_error(e):
+                    raise
+                last_err = e
+            keys = [k for k in keys if k not in tried]
+        for key_index, key in keys:
+            try:
+                return await self._attempt(key_index, key, context, args)
             except ModelHTTPError as e:
                 last_err = e
                 if _is_retryable_openai_http_error(e):
@@ -93,6 +212,114 @@ class RotatingOpenAIModel(Model):
         assert last_err is not None
         raise last_err
 
+    async def _attempt(
+        self,
+        key_index: int,
+        key: str | None,
+        context: dict[str, Any],
+        args: tuple[Any, Any, Any],
+    ) -> Any:
+        """One request with one key, traced as an "llm_request" span."""
+        start = time.perf_counter()
+        try:
+            with span(
+                "llm_request", model=self._model_name, key_index=key_index, **context
+            ) as s:
+                model = self._make_model(key)
+                response = await model.request(*args)
+                s.set(
+                    input_tokens=response.usage.input_tokens,
+                    output_tokens=response.usage.output_tokens,
+                    cache_read_tokens=response.usage.cache_read_tokens,
+                )
+        except ModelHTTPError as e:
+            if _is_retryable_openai_http_error(e):
+                _key_failed_at[key or ""] = time.monotonic()
+            raise
+        _latencies.add((self._model_name, context["stage"]), time.perf_counter() - start)
+        logger.debug(
+            f"LLM {self._model_name} [{context['stage']}]: "
+            f"{response.usage.input_tokens} in "
+            f"({response.usage.cache_read_tokens} cached), "
+            f"{response.usage.output_tokens} out"
+        )
+        record_response(response)
+        return response
+
+    def _hedge_delay(self, keys: list[tuple[int, str | None]], stage: str) -> float | None:
+        """Seconds to wait before hedging this request, None = don't hedge."""
+        if not (_hedgeable.get() and get_settings().hedge_requests):
+            return None
+        if len(keys) < 2 or is_replaying():
+            return None
+        _hedge_budget.count_request()
+        return _latencies.quantile((self._model_name, stage), 0.9)
+
+    async def _hedged(
+        self,
+        keys: list[tuple[int, str | None]],
+        delay: float,
+        tried: list[tuple[int, str | None]],
+        context: dict[str, Any],
+        args: tuple[Any, Any, Any],
+    ) -> Any:
+        """Request with keys[0]; past `delay`, race a duplicate on a healthy key.
+
+        The duplicate holds its own governor slot; without a free one it is
+        skipped. The first successful response wins and the other request is
+        cancelled; the cancelled one is billed anyway, so its usage is
+        recorded as the winner's (same prompt). Keys used are appended to
+        `tried`.
+        """
+        tried.append(keys[0])
+        primary = asyncio.ensure_future(self._attempt(*keys[0], context, args))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except BaseException:
+            primary.cancel()
+            raise
+        if done:
+            return primary.result()
+        spare = next((k for k in keys[1:] if _key_healthy(k[1])), None)
+        governor = get_governor()
+        if spare is None or not governor.try_acquire(self._model_name):
+            LLM_HEDGES.inc(model=self._model_name, outcome="skipped")
+            return await primary
+        if not _hedge_budget.take(get_settings().hedge_budget):
+            governor.release(self._model_name)
+            LLM_HEDGES.inc(model=self._model_name, outcome="skipped")
+            return await primary
+        tried.append(spare)
+        logger.debug(
+            f"LLM {self._model_name} [{context['stage']}]: no response after "
+            f"{delay:.2f}s, hedging on key {spare[0]}"
+        )
+        hedge = asyncio.ensure_future(
+            self._attempt(*spare, {**context, "hedge": True}, args)
+        )
+        hedge.add_done_callback(lambda _: governor.release(self._model_name))
+        pending = {primary, hedge}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        outcome = "won" if task is hedge else "lost"
+                        LLM_HEDGES.inc(model=self._model_name, outcome=outcome)
+                        response = task.result()
+                        for _ in pending:
+                            record_response(response)
+                        return response
+                    error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        assert error is not None
+        raise error
+
     async def request_stream(  # type: ignore[override]
         self,
         messages: list[Any],
@@ -101,18 +328,22 @@ class RotatingOpenAIModel(Model):
         run_context: Any = None,
     ) -> AsyncIterator[Any]:
         last_err: Exception | None = None
-        for key in self._iter_keys():
-            try:
-                model = self._make_model(key)
-                async for chunk in model.request_stream(
-                    messages, model_settings, model_request_parameters, run_context=run_context
-                ):
-                    yield chunk
-                return
-            except ModelHTTPError as e:
-                last_err = e
-                if _is_retryable_openai_http_error(e):
-                    continue
-                raise
+        async with get_governor().slot(self._model_name):
+            for _, key in self._iter_keys():
+                try:
+                    model = self._make_model(key)
+                    async for chunk in model.request_stream(
+                        messages,
+                        model_settings,
+                        model_request_parameters,
+                        run_context=run_context,
+                    ):
+                        yield chunk
+                    return
+                except ModelHTTPError as e:
+                    last_err = e
+                    if _is_retryable_openai_http_error(e):
+                        continue
+                    raise
         assert last_err is not None
         raise last_err
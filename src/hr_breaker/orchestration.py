@@ -3,13 +3,17 @@
 import asyncio
 import tempfile
 import time
-from collections.abc import Callable
-from contextlib import contextmanager
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing, contextmanager, suppress
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
 
 from hr_breaker.agents import optimize_resume, parse_job_posting
 from hr_breaker.config import get_settings, logger
+from hr_breaker.executor import run_cpu
 from hr_breaker.filters import (
+    BaseFilter,
     LLMChecker,
     DataValidator,
     FilterRegistry,
@@ -17,27 +21,55 @@ from hr_breaker.filters import (
     KeywordMatcher,
     VectorSimilarityMatcher,
 )
+from hr_breaker.llm_governor import INTERACTIVE, llm_priority
+from hr_breaker.metrics import RENDERS_IN_FLIGHT
 from hr_breaker.models import (
+    FilterFinished,
     FilterResult,
     IterationContext,
+    IterationFinished,
+    JobParsed,
     JobPosting,
     OptimizedResume,
+    OptimizerFinished,
+    OptimizerStarted,
+    RenderFinished,
     ResumeSource,
+    RunBudget,
+    RunCheckpoint,
+    RunEvent,
+    RunFinished,
+    UsageTotals,
     ValidationResult,
 )
+from hr_breaker.provider import routing_scope
+from hr_breaker.services.checkpoint import CheckpointStore, new_run_id
 from hr_breaker.services.pdf_parser import extract_text_from_pdf
-from hr_breaker.services.renderer import RenderError, HTMLRenderer
+from hr_breaker.services.renderer import RenderError, get_renderer
+from hr_breaker.tracing import Span, span
+from hr_breaker.usage import track_usage
 
 # Ensure filters are registered
 _ = DataValidator, LLMChecker, KeywordMatcher, VectorSimilarityMatcher, HallucinationChecker
 
 
 @contextmanager
-def log_time(operation: str):
-    start = time.perf_counter()
-    yield
-    elapsed = time.perf_counter() - start
-    logger.debug(f"{operation}: {elapsed:.2f}s")
+def log_time(operation: str, **attributes):
+    """Trace the block as a span and log its duration."""
+    with span(operation, **attributes) as s:
+        yield s
+    logger.debug(f"{operation}: {s.duration:.2f}s")
+
+
+def _filter_error_result(f: BaseFilter, error: Exception) -> FilterResult:
+    return FilterResult(
+        filter_name=f.name,
+        passed=False,
+        score=0.0,
+        threshold=getattr(f, 'threshold', 0.5),
+        issues=[f"Filter error: {type(error).__name__}: {error}"],
+        suggestions=["Check filter implementation"],
+    )
 
 
 async def run_filters(
@@ -46,34 +78,38 @@ async def run_filters(
     source: ResumeSource,
     parallel: bool = False,
     no_shame: bool = False,
+    filters: list[type[BaseFilter]] | None = None,
+    on_result: Callable[[FilterResult], None] | None = None,
 ) -> ValidationResult:
-    """Run filters, either sequentially (early exit) or in parallel."""
-    filters = FilterRegistry.all()
+    """Run filters, either sequentially (early exit) or in parallel.
+
+    filters restricts the run to a subset (default: every registered filter).
+    on_result is called with each FilterResult as soon as that filter finishes.
+    """
+    if filters is None:
+        filters = FilterRegistry.all()
 
     if parallel:
         # Run all filters concurrently
         start = time.perf_counter()
         filter_instances = [filter_cls(no_shame=no_shame) for filter_cls in filters]
-        tasks = [f.evaluate(optimized, job, source) for f in filter_instances]
-        raw_results = await asyncio.gather(*tasks, return_exceptions=True)
-        logger.debug(f"All filters (parallel): {time.perf_counter() - start:.2f}s")
 
-        # Convert exceptions to failed FilterResults
-        results = []
-        for f, result in zip(filter_instances, raw_results):
-            if isinstance(result, Exception):
-                logger.error(f"Filter {f.name} raised exception: {result}")
-                results.append(FilterResult(
-                    filter_name=f.name,
-                    passed=False,
-                    score=0.0,
-                    threshold=getattr(f, 'threshold', 0.5),
-                    issues=[f"Filter error: {type(result).__name__}: {result}"],
-                    suggestions=["Check filter implementation"],
-                ))
-            else:
-                results.append(result)
-        return ValidationResult(results=results)
+        async def evaluate(f: BaseFilter) -> FilterResult:
+            with span(f"filter:{f.name}") as s:
+                try:
+                    result = await f.evaluate(optimized, job, source)
+                except Exception as e:
+                    # Convert exceptions to failed FilterResults
+                    logger.error(f"Filter {f.name} raised exception: {e}")
+                    result = _filter_error_result(f, e)
+                s.set(score=result.score, passed=result.passed)
+            if on_result:
+                on_result(result)
+            return result
+
+        results = await asyncio.gather(*(evaluate(f) for f in filter_instances))
+        logger.debug(f"All filters (parallel): {time.perf_counter() - start:.2f}s")
+        return ValidationResult(results=list(results))
 
     # Sequential mode: sorted by priority, early exit on failure
     results = []
@@ -85,9 +121,11 @@ async def run_filters(
             continue
 
         f = filter_cls(no_shame=no_shame)
-        start = time.perf_counter()
-        result = await f.evaluate(optimized, job, source)
-        logger.debug(f"{filter_cls.name}: {time.perf_counter() - start:.2f}s")
+        with log_time(f"filter:{filter_cls.name}") as s:
+            result = await f.evaluate(optimized, job, source)
+            s.set(score=result.score, passed=result.passed)
+        if on_result:
+            on_result(result)
         results.append(result)
 
         # Early exit on failure (unless it's a final check)
@@ -97,95 +135,814 @@ async def run_filters(
     return ValidationResult(results=results)
 
 
-async def optimize_for_job(
+def _filter_weight(name: str) -> float:
+    filter_cls = FilterRegistry.get(name)
+    return filter_cls.weight if filter_cls is not None else 1.0
+
+
+def _aggregate_score(validation: ValidationResult) -> float:
+    """Weighted mean filter score, used to rank candidates and iterations.
+
+    Averaged over every registered filter, so filters skipped by sequential
+    early exit count as 0 and results with different coverage stay comparable.
+    """
+    weights = {f.name: f.weight for f in FilterRegistry.all()}
+    for r in validation.results:
+        weights.setdefault(r.filter_name, _filter_weight(r.filter_name))
+    total = sum(weights.values())
+    if not total:
+        return 0.0
+    return sum(weights[r.filter_name] * r.score for r in validation.results) / total
+
+
+def _rank_key(validation: ValidationResult) -> tuple[bool, float]:
+    return validation.passed, _aggregate_score(validation)
+
+
+def _candidate_model_settings(index: int, count: int) -> dict | None:
+    """Sampling settings for speculative candidate `index` of `count`.
+
+    A single candidate keeps the agent defaults. Otherwise each candidate gets
+    its own seed and a temperature from settings (cycled), so the K concurrent
+    calls explore different rewrites. Concurrent calls are also spread across
+    API keys by RotatingOpenAIModel's round-robin.
+    """
+    if count <= 1:
+        return None
+    settings = get_settings()
+    model_settings: dict = {"seed": index}
+    temperatures = settings.optimizer_candidate_temperatures
+    if temperatures:
+        model_settings["temperature"] = temperatures[index % len(temperatures)]
+    return model_settings
+
+
+def _attempt_text(optimized: OptimizedResume) -> str | None:
+    return optimized.html if optimized.html else (
+        optimized.data.model_dump_json() if optimized.data else None
+    )
+
+
+def _is_local_result(result: FilterResult) -> bool:
+    filter_cls = FilterRegistry.get(result.filter_name)
+    # PDFRender and unknown names are orchestration-level, i.e. local
+    return filter_cls is None or filter_cls.local
+
+
+def _render_failed_validation() -> ValidationResult:
+    # PDF rendering failed - treat as validation failure
+    return ValidationResult(
+        results=[
+            FilterResult(
+                filter_name="PDFRender",
+                passed=False,
+                score=0.0,
+                threshold=1.0,
+                issues=["Failed to render resume to PDF"],
+                suggestions=["Check resume data structure"],
+            )
+        ]
+    )
+
+
+class _RunCancelled(Exception):
+    """Raised at a stage boundary once the caller's cancel event is set."""
+
+
+class BudgetExceeded(Exception):
+    """The RunBudget ran out before any iteration completed: there is no result."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Budget exhausted before any iteration completed: {reason}")
+        self.reason = reason
+
+
+class _BudgetExhausted(Exception):
+    """Raised at a stage boundary once the RunBudget is used up."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _default_budget() -> RunBudget:
+    settings = get_settings()
+    return RunBudget(
+        deadline_seconds=settings.run_deadline_seconds,
+        max_input_tokens=settings.run_max_input_tokens,
+        max_output_tokens=settings.run_max_output_tokens,
+        max_cost_usd=settings.run_max_cost_usd,
+        max_llm_calls=settings.run_max_llm_calls,
+    )
+
+
+def _check_stage(
+    cancel: asyncio.Event | None, budget: RunBudget, usage: UsageTotals
+) -> None:
+    """Stop the run before a new stage if cancelled or out of budget."""
+    if cancel is not None and cancel.is_set():
+        raise _RunCancelled
+    reason = budget.exhausted_by(usage)
+    if reason:
+        raise _BudgetExhausted(reason)
+
+
+@dataclass
+class _Run:
+    """Per-run state shared by the pipeline stages."""
+
+    source: ResumeSource
+    job: JobPosting
+    parallel: bool
+    no_shame: bool
+    optimizer_mode: str
+    emit: Callable[[RunEvent], None]
+    budget: RunBudget
+    usage: UsageTotals
+    cancel: asyncio.Event | None = None
+    checkpoint: RunCheckpoint | None = None
+    store: CheckpointStore | None = None
+
+    def check_stage(self) -> None:
+        _check_stage(self.cancel, self.budget, self.usage)
+
+    def save_stage(
+        self,
+        iteration: int,
+        optimized: OptimizedResume,
+        validation: ValidationResult | None = None,
+    ) -> None:
+        """Checkpoint an iteration's optimizer output and/or validation."""
+        if self.checkpoint is None or self.store is None:
+            return
+        self.checkpoint.record(iteration, optimized, validation)
+        self.checkpoint.updated_at = datetime.now()
+        self.store.put(self.checkpoint)
+
+    def filters(self, local: bool) -> list[type[BaseFilter]]:
+        return [f for f in FilterRegistry.all() if f.local == local]
+
+    async def run_filters(
+        self,
+        optimized: OptimizedResume,
+        iteration: int,
+        candidate: int = 0,
+        filters: list[type[BaseFilter]] | None = None,
+        parallel: bool | None = None,
+    ) -> ValidationResult:
+        """run_filters() for this run, streaming each result as an event."""
+        self.check_stage()
+        if optimized.pdf_text is None:
+            validation = _render_failed_validation()
+            for r in validation.results:
+                self.emit(FilterFinished(iteration=iteration, candidate=candidate, result=r))
+            return validation
+        return await run_filters(
+            optimized,
+            self.job,
+            self.source,
+            parallel=self.parallel if parallel is None else parallel,
+            no_shame=self.no_shame,
+            filters=filters,
+            on_result=lambda r: self.emit(
+                FilterFinished(iteration=iteration, candidate=candidate, result=r)
+            ),
+        )
+
+
+async def _generate_candidate(
+    run: _Run,
+    ctx: IterationContext,
+    candidate: int = 0,
+    model_settings: dict | None = None,
+) -> OptimizedResume:
+    run.check_stage()
+    run.emit(OptimizerStarted(iteration=ctx.iteration, candidate=candidate))
+    with log_time("optimizer", iteration=ctx.iteration, candidate=candidate):
+        optimized = await optimize_resume(
+            run.source, run.job, ctx, no_shame=run.no_shame,
+            model_settings=model_settings, optimizer_mode=run.optimizer_mode,
+        )
+    logger.debug(f"Optimizer changes: {optimized.changes}")
+    run.emit(OptimizerFinished(
+        iteration=ctx.iteration, candidate=candidate, changes=optimized.changes
+    ))
+    # Render PDF and extract text for filters (like real ATS)
+    optimized = await run_cpu(_render_and_extract, optimized)
+    run.emit(RenderFinished(
+        iteration=ctx.iteration,
+        candidate=candidate,
+        success=optimized.pdf_text is not None,
+        optimized=optimized,
+    ))
+    return optimized
+
+
+async def _generate_candidates(
+    run: _Run, ctx: IterationContext, count: int
+) -> list[tuple[int, OptimizedResume]]:
+    """Generate `count` candidates concurrently; returns (index, candidate) pairs."""
+    generated = await asyncio.gather(
+        *(
+            _generate_candidate(run, ctx, k, _candidate_model_settings(k, count))
+            for k in range(count)
+        ),
+        return_exceptions=True,
+    )
+    # A failed optimizer call only loses its candidate
+    errors = [g for g in generated if isinstance(g, BaseException)]
+    usable = [(k, g) for k, g in enumerate(generated) if not isinstance(g, BaseException)]
+    for e in errors:
+        if isinstance(e, (_RunCancelled, _BudgetExhausted)):
+            raise e
+        logger.error(f"Candidate generation failed: {e}")
+    if not usable:
+        raise errors[0]
+    return usable
+
+
+async def _select_candidate(
+    run: _Run,
+    iteration: int,
+    candidates: list[tuple[int, OptimizedResume]],
+) -> tuple[OptimizedResume, ValidationResult]:
+    """Screen candidates with local filters, fully review the most promising.
+
+    Every candidate goes through the cheap local filters. Only the top
+    `optimizer_candidates_reviewed` by local score also get the remote (LLM)
+    filters; the best fully-reviewed candidate wins.
+    """
+    settings = get_settings()
+    local_filters = run.filters(local=True)
+    remote_filters = run.filters(local=False)
+
+    with log_time("local filters (all candidates)"):
+        screened = await asyncio.gather(*(
+            run.run_filters(c, iteration, k, filters=local_filters)
+            for k, c in candidates
+        ))
+    ranked = sorted(
+        zip(candidates, screened), key=lambda cv: _rank_key(cv[1]), reverse=True
+    )
+    shortlist = ranked[: max(1, settings.optimizer_candidates_reviewed)]
+    logger.debug(
+        "Candidate local scores: "
+        + ", ".join(f"{_aggregate_score(v):.2f}" for _, v in ranked)
+    )
+
+    async def review(
+        k: int, candidate: OptimizedResume, local: ValidationResult
+    ) -> ValidationResult:
+        # Mirror sequential early exit: failed local checks skip the LLM filters
+        if candidate.pdf_text is None or (not run.parallel and not local.passed):
+            return local
+        remote = await run.run_filters(candidate, iteration, k, filters=remote_filters)
+        return ValidationResult(results=local.results + remote.results)
+
+    with log_time("remote filters (shortlist)"):
+        reviewed = await asyncio.gather(
+            *(review(k, c, v) for (k, c), v in shortlist)
+        )
+    best_index = max(range(len(shortlist)), key=lambda i: _rank_key(reviewed[i]))
+    return shortlist[best_index][0][1], reviewed[best_index]
+
+
+def _next_iteration_starter(
+    run: _Run, iteration: int, last_attempt: str | None
+) -> Callable[[ValidationResult], Awaitable[OptimizedResume]]:
+    """Build a callback that starts iteration's optimizer call from partial feedback."""
+
+    async def start(feedback: ValidationResult) -> OptimizedResume:
+        ctx = IterationContext(
+            iteration=iteration,
+            original_resume=run.source.content,
+            last_attempt=last_attempt,
+            validation=feedback,
+        )
+        return await _generate_candidate(run, ctx)
+
+    return start
+
+
+async def _validate_pipelined(
+    run: _Run,
+    optimized: OptimizedResume,
+    iteration: int,
+    latest_remote: list[FilterResult],
+    start_next: Callable[[ValidationResult], Awaitable[OptimizedResume]] | None,
+) -> tuple[ValidationResult, asyncio.Task | None]:
+    """Validate with LLM filters in the background.
+
+    Local (deterministic) filters are awaited first. If one fails, the next
+    iteration is needed whatever the LLM filters say, so its optimizer call is
+    started right away with the local results plus the latest LLM results from
+    earlier iterations. The LLM filters for this candidate keep running and
+    are returned in the full validation (and reach the optimizer one
+    iteration later).
+
+    Returns (full_validation, started_next_optimizer_task_or_None).
+    """
+    if optimized.pdf_text is None:
+        return await run.run_filters(optimized, iteration), None
+
+    remote_task = asyncio.create_task(
+        run.run_filters(
+            optimized, iteration, filters=run.filters(local=False), parallel=True
+        )
+    )
+    next_task: asyncio.Task | None = None
+    try:
+        local = await run.run_filters(
+            optimized, iteration, filters=run.filters(local=True)
+        )
+        if not local.passed and start_next is not None:
+            logger.debug("Local filter failed - starting next optimizer call early")
+            early = ValidationResult(results=local.results + latest_remote)
+            next_task = asyncio.create_task(start_next(early))
+        remote = await remote_task
+    except BaseException:
+        remote_task.cancel()
+        if next_task is not None:
+            next_task.cancel()
+        raise
+    return ValidationResult(results=local.results + remote.results), next_task
+
+
+@dataclass
+class _Progress:
+    """Completed iterations of a run: best result so far and score history."""
+
+    best: OptimizedResume | None = None
+    best_validation: ValidationResult | None = None
+    best_iteration: int | None = None
+    iterations: int = 0
+    best_scores: list[float] = field(default_factory=list)
+
+    def record(
+        self, iteration: int, optimized: OptimizedResume, validation: ValidationResult
+    ) -> None:
+        self.iterations += 1
+        if self.best_validation is None or _rank_key(validation) > _rank_key(
+            self.best_validation
+        ):
+            self.best = optimized
+            self.best_validation = validation
+            self.best_iteration = iteration
+        score = _aggregate_score(validation)
+        previous = self.best_scores[-1] if self.best_scores else 0.0
+        self.best_scores.append(max(score, previous))
+
+    def plateaued(self, patience: int, epsilon: float) -> bool:
+        """True if the best score improved by less than epsilon over `patience` iterations."""
+        if patience <= 0 or len(self.best_scores) <= patience:
+            return False
+        return self.best_scores[-1] - self.best_scores[-1 - patience] < epsilon
+
+
+def _restore_iterations(
+    run: _Run, progress: _Progress
+) -> tuple[int, ValidationResult | None, str | None, OptimizedResume | None]:
+    """Replay checkpointed iterations into progress (re-emitting IterationFinished).
+
+    Returns (next_iteration, last_validation, last_attempt, pending) where
+    pending is a checkpointed optimizer output whose filters never finished.
+    """
+    if run.checkpoint is None:
+        return 0, None, None, None
+    start = 0
+    validation: ValidationResult | None = None
+    last_attempt: str | None = None
+    for entry in run.checkpoint.iterations:
+        if entry.validation is None:
+            logger.debug(f"Resuming iteration {entry.iteration + 1} at filters")
+            return entry.iteration, validation, last_attempt, entry.optimized
+        validation = entry.validation
+        last_attempt = _attempt_text(entry.optimized)
+        start = entry.iteration + 1
+        run.emit(IterationFinished(
+            iteration=entry.iteration, optimized=entry.optimized, validation=validation
+        ))
+        progress.record(entry.iteration, entry.optimized, validation)
+    if start:
+        logger.debug(f"Resuming after {start} checkpointed iterations")
+    return start, validation, last_attempt, None
+
+
+async def _run_iterations(
+    run: _Run,
+    max_iterations: int,
+    candidates: int,
+    pipelined: bool,
+    progress: _Progress,
+) -> bool:
+    """Iterate optimizer + filters until all filters pass or iterations run out.
+
+    Every completed iteration is recorded in progress and checkpointed, and
+    checkpointed iterations of a resumed run are replayed instead of re-run.
+    Stops early once the best score plateaus
+    (settings.plateau_patience/plateau_epsilon).
+
+    Returns True if stopped on a plateau.
+    """
+    settings = get_settings()
+    start, validation, last_attempt, pending = _restore_iterations(run, progress)
+    if validation is not None and validation.passed:
+        return False
+    if progress.plateaued(settings.plateau_patience, settings.plateau_epsilon):
+        return True
+
+    # Pipelined mode: optimizer call for the next iteration, started early
+    next_optimized: asyncio.Task | None = None
+    # Latest LLM filter results, folded into early-started optimizer calls
+    latest_remote: list[FilterResult] = []
+
+    try:
+        for i in range(start, max_iterations):
+            with span("iteration", iteration=i) as iteration_span:
+                logger.debug(f"Iteration {i + 1}/{max_iterations}")
+                ctx = IterationContext(
+                    iteration=i,
+                    original_resume=run.source.content,
+                    last_attempt=last_attempt,
+                    validation=validation,
+                )
+                # Multiple candidates are validated during selection
+                selected: ValidationResult | None = None
+                if pending is not None:
+                    # Checkpointed optimizer output: only rendering is repeated
+                    optimized = await run_cpu(_render_and_extract, pending)
+                    pending = None
+                elif next_optimized is not None:
+                    optimized = await next_optimized
+                    next_optimized = None
+                elif candidates == 1:
+                    optimized = await _generate_candidate(run, ctx)
+                else:
+                    generated = await _generate_candidates(run, ctx, candidates)
+                    optimized, selected = await _select_candidate(run, i, generated)
+                run.save_stage(i, optimized, selected)
+
+                # Store last attempt for feedback (html or data depending on mode)
+                last_attempt = _attempt_text(optimized)
+
+                if pipelined:
+                    start_next = None
+                    if i + 1 < max_iterations:
+                        start_next = _next_iteration_starter(
+                            run, i + 1, last_attempt
+                        )
+                    validation, next_optimized = await _validate_pipelined(
+                        run, optimized, i, latest_remote, start_next
+                    )
+                    latest_remote = [
+                        r for r in validation.results if not _is_local_result(r)
+                    ] or latest_remote
+                elif selected is not None:
+                    validation = selected
+                else:
+                    validation = await run.run_filters(optimized, i)
+                run.save_stage(i, optimized, validation)
+
+                run.emit(IterationFinished(
+                    iteration=i, optimized=optimized, validation=validation
+                ))
+                progress.record(i, optimized, validation)
+                iteration_span.set(
+                    score=_aggregate_score(validation), passed=validation.passed
+                )
+
+                if validation.passed:
+                    break
+                patience = settings.plateau_patience
+                if progress.plateaued(patience, settings.plateau_epsilon):
+                    logger.debug(
+                        f"Score plateaued at {progress.best_scores[-1]:.3f} over "
+                        f"{settings.plateau_patience} iterations, stopping early"
+                    )
+                    return True
+    finally:
+        if next_optimized is not None:
+            next_optimized.cancel()
+    return False
+
+
+async def optimize_for_job_stream(
     source: ResumeSource,
     job_text: str | None = None,
     max_iterations: int | None = None,
-    on_iteration: Callable | None = None,
     job: JobPosting | None = None,
     parallel: bool = False,
     no_shame: bool = False,
-) -> tuple[OptimizedResume, ValidationResult, JobPosting]:
+    candidates: int | None = None,
+    pipelined: bool | None = None,
+    optimizer_mode: str | None = None,
+    cancel: asyncio.Event | None = None,
+    budget: RunBudget | None = None,
+    run_id: str | None = None,
+    priority: str = INTERACTIVE,
+) -> AsyncIterator[RunEvent]:
     """
-    Core optimization loop.
+    Core optimization loop as a stream of typed progress events.
 
-    Args:
-        source: Source resume
-        job_text: Job posting text (required if job not provided)
-        max_iterations: Max optimization iterations (default from settings)
-        on_iteration: Optional callback(iteration, optimized, validation)
-        job: Pre-parsed job posting (optional, skips parsing if provided)
+    Yields JobParsed first, then per iteration OptimizerStarted,
+    OptimizerFinished and RenderFinished (per candidate), a FilterFinished as
+    each filter completes, and IterationFinished. Always ends with RunFinished.
 
-    Returns:
-        (optimized_resume, validation_result, job_posting)
+    RunFinished carries the best iteration (all filters passed, then highest
+    weighted score), not necessarily the last one.
+
+    Cancellation is cooperative: once `cancel` is set the run stops at the
+    next stage boundary and RunFinished(cancelled=True) carries the best
+    completed iteration. Closing the generator early (e.g. leaving an
+    `aclosing()` block) cancels in-flight work immediately.
+
+    The RunBudget (default from settings) is checked the same way, against
+    usage of every LLM call made by the run; when it runs out RunFinished
+    has budget_exhausted set and carries the best completed iteration.
+
+    Unless disabled in settings, every stage is checkpointed under run_id
+    (generated if not given; reported in JobParsed and RunFinished). Passing
+    the run_id of an existing checkpoint continues that run from its last
+    completed stage - see resume_run().
+
+    The run's LLM requests are queued under `priority`, with the run as
+    their session (see llm_governor).
+
+    Arguments are as for optimize_for_job().
     """
+    if job is None and job_text is None:
+        raise ValueError("Either job_text or job must be provided")
+
     settings = get_settings()
     if max_iterations is None:
         max_iterations = settings.max_iterations
-
-    renderer = HTMLRenderer()
-
-    if job is None:
-        if job_text is None:
-            raise ValueError("Either job_text or job must be provided")
-        with log_time("parse_job_posting"):
-            job = await parse_job_posting(job_text)
-    optimized = None
-    validation = None
-    last_attempt: str | None = None
-
+    if candidates is None:
+        candidates = settings.optimizer_candidates
+    candidates = max(1, candidates)
+    if pipelined is None:
+        pipelined = settings.pipelined
+    if pipelined and candidates > 1:
+        logger.debug("Pipelined mode ignored with multiple candidates")
+        pipelined = False
+    if optimizer_mode is None:
+        optimizer_mode = settings.optimizer_mode
     if no_shame:
         logger.debug("No-shame mode enabled")
-
-    for i in range(max_iterations):
-        logger.debug(f"Iteration {i + 1}/{max_iterations}")
-        ctx = IterationContext(
-            iteration=i,
-            original_resume=source.content,
-            last_attempt=last_attempt,
-            validation=validation,
+    if budget is None:
+        budget = _default_budget()
+
+    run_id = run_id or new_run_id()
+    store = CheckpointStore() if settings.checkpoints else None
+    if store:
+        store.prune()
+    checkpoint = store.get(run_id) if store else None
+    if checkpoint is None:
+        checkpoint = RunCheckpoint(
+            run_id=run_id,
+            source=source,
+            job_text=job_text,
+            job=job,
+            max_iterations=max_iterations,
+            parallel=parallel,
+            no_shame=no_shame,
+            candidates=candidates,
+            pipelined=pipelined,
+            optimizer_mode=optimizer_mode,
+        )
+    elif checkpoint.source.checksum != source.checksum:
+        raise ValueError(f"Run {run_id} was checkpointed for a different resume")
+    else:
+        logger.debug(f"Resuming run {run_id}")
+        job = job or checkpoint.job
+        checkpoint.max_iterations = max_iterations
+        checkpoint.finished = False
+    if store:
+        store.put(checkpoint)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    async def produce(run_span: Span) -> None:
+        nonlocal job
+        progress = _Progress()
+        plateaued = False
+        cancelled = False
+        budget_exhausted: str | None = None
+        with (
+            track_usage() as usage,
+            routing_scope(),
+            llm_priority(priority, session=run_id),
+        ):
+            try:
+                if job is None:
+                    _check_stage(cancel, budget, usage)
+                    with log_time("parse_job"):
+                        job = await parse_job_posting(job_text)
+                    checkpoint.job = job
+                    if store:
+                        store.put(checkpoint)
+                queue.put_nowait(JobParsed(job=job, run_id=run_id))
+                run = _Run(
+                    source=source,
+                    job=job,
+                    parallel=parallel,
+                    no_shame=no_shame,
+                    optimizer_mode=optimizer_mode,
+                    emit=queue.put_nowait,
+                    budget=budget,
+                    usage=usage,
+                    cancel=cancel,
+                    checkpoint=checkpoint,
+                    store=store,
+                )
+                plateaued = await _run_iterations(
+                    run, max_iterations, candidates, pipelined, progress
+                )
+                checkpoint.finished = True
+            except _RunCancelled:
+                logger.debug("Optimization cancelled")
+                cancelled = True
+            except _BudgetExhausted as e:
+                logger.warning(f"Run budget exhausted ({e.reason}), returning best so far")
+                budget_exhausted = e.reason
+        if progress.best is not None and progress.best.pdf_bytes is None:
+            # Replayed from a checkpoint, which does not keep the PDF
+            progress.best = await run_cpu(_render_and_extract, progress.best)
+        if store:
+            store.put(checkpoint)
+        logger.debug(
+            f"Run usage: {usage.llm_calls} LLM calls, {usage.input_tokens} in "
+            f"({usage.cache_read_tokens} cached) / "
+            f"{usage.output_tokens} out tokens, ~${usage.cost_usd:.4f}, "
+            f"{usage.elapsed_seconds:.1f}s"
         )
-        with log_time("optimize_resume"):
-            optimized = await optimize_resume(source, job, ctx, no_shame=no_shame)
-        logger.debug(f"Optimizer changes: {optimized.changes}")
-        # Store last attempt for feedback (html or data depending on mode)
-        last_attempt = optimized.html if optimized.html else (
-            optimized.data.model_dump_json() if optimized.data else None
+        if cancelled:
+            outcome = "cancelled"
+        elif budget_exhausted:
+            outcome = "budget_exhausted"
+        elif progress.best_validation is not None and progress.best_validation.passed:
+            outcome = "passed"
+        else:
+            outcome = "failed"
+        run_span.set(
+            outcome=outcome,
+            iterations=progress.iterations,
+            passed=bool(progress.best_validation and progress.best_validation.passed),
+            llm_calls=usage.llm_calls,
+            input_tokens=usage.input_tokens,
+            cache_read_tokens=usage.cache_read_tokens,
+            output_tokens=usage.output_tokens,
+            cost_usd=usage.cost_usd,
         )
+        queue.put_nowait(RunFinished(
+            run_id=run_id,
+            optimized=progress.best,
+            validation=progress.best_validation,
+            job=job,
+            iterations=progress.iterations,
+            best_iteration=progress.best_iteration,
+            plateaued=plateaued,
+            cancelled=cancelled,
+            budget_exhausted=budget_exhausted,
+            usage=usage,
+        ))
+
+    async def traced_produce() -> None:
+        with span("run", run_id=run_id) as run_span:
+            await produce(run_span)
+
+    producer = asyncio.create_task(traced_produce())
+    producer.add_done_callback(lambda _: queue.put_nowait(done))
+    try:
+        while (event := await queue.get()) is not done:
+            yield event
+        await producer  # re-raise errors from the run
+    finally:
+        if not producer.done():
+            producer.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await producer
 
-        # Render PDF and extract text for filters (like real ATS)
-        optimized = _render_and_extract(optimized, renderer)
 
-        if optimized.pdf_text is None:
-            # PDF rendering failed - treat as validation failure
-            validation = ValidationResult(
-                results=[
-                    FilterResult(
-                        filter_name="PDFRender",
-                        passed=False,
-                        score=0.0,
-                        threshold=1.0,
-                        issues=["Failed to render resume to PDF"],
-                        suggestions=["Check resume data structure"],
-                    )
-                ]
-            )
-        else:
-            validation = await run_filters(optimized, job, source, parallel=parallel, no_shame=no_shame)
+async def optimize_for_job(
+    source: ResumeSource,
+    job_text: str | None = None,
+    max_iterations: int | None = None,
+    on_iteration: Callable | None = None,
+    job: JobPosting | None = None,
+    parallel: bool = False,
+    no_shame: bool = False,
+    candidates: int | None = None,
+    pipelined: bool | None = None,
+    optimizer_mode: str | None = None,
+    budget: RunBudget | None = None,
+    run_id: str | None = None,
+    priority: str = INTERACTIVE,
+) -> tuple[OptimizedResume, ValidationResult, JobPosting]:
+    """
+    Core optimization loop.
 
-        if on_iteration:
-            on_iteration(i, optimized, validation)
+    Thin consumer of optimize_for_job_stream().
 
-        if validation.passed:
-            break
+    Args:
+        source: Source resume
+        job_text: Job posting text (required if job not provided)
+        max_iterations: Max optimization iterations (default from settings)
+        on_iteration: Optional callback(iteration, optimized, validation)
+        job: Pre-parsed job posting (optional, skips parsing if provided)
+        candidates: Optimizer candidates generated concurrently per iteration
+            (default from settings). With more than one, all are screened by
+            local filters and only the best go through the LLM filters.
+        pipelined: Start the next optimizer call as soon as a local filter
+            fails, overlapping it with the LLM filters (default from settings).
+        optimizer_mode: How the first draft is written: "single" call or
+            concurrent "sections" (default from settings).
+        budget: Deadline/token/cost/call caps (default from settings). When
+            exhausted, the best completed iteration is returned.
+        run_id: Checkpoint ID for this run (generated if not given). An
+            existing checkpoint with this ID is resumed.
+        priority: Priority class of the run's LLM requests (interactive,
+            batch or background) when requests queue for a model.
+
+    With settings.plateau_patience set, stops early once scores plateau.
 
-    return optimized, validation, job
+    Returns:
+        (best_optimized_resume, its_validation_result, job_posting)
 
+    Raises:
+        BudgetExceeded: The budget ran out before the first iteration completed
+    """
+    finished: RunFinished | None = None
+    stream = optimize_for_job_stream(
+        source,
+        job_text,
+        max_iterations=max_iterations,
+        job=job,
+        parallel=parallel,
+        no_shame=no_shame,
+        candidates=candidates,
+        pipelined=pipelined,
+        optimizer_mode=optimizer_mode,
+        budget=budget,
+        run_id=run_id,
+        priority=priority,
+    )
+    async with aclosing(stream) as events:
+        async for event in events:
+            if isinstance(event, IterationFinished) and on_iteration:
+                on_iteration(event.iteration, event.optimized, event.validation)
+            elif isinstance(event, RunFinished):
+                finished = event
+
+    assert finished is not None
+    if finished.optimized is None or finished.validation is None:
+        # optimize_for_job() has no cancel event: only the budget stops it this early
+        raise BudgetExceeded(finished.budget_exhausted or "unknown")
+    return finished.optimized, finished.validation, finished.job
+
+
+async def resume_run(
+    run_id: str,
+    max_iterations: int | None = None,
+    on_iteration: Callable | None = None,
+    budget: RunBudget | None = None,
+) -> tuple[OptimizedResume, ValidationResult, JobPosting]:
+    """Continue a checkpointed run from its last completed stage.
 
-def _render_and_extract(optimized: OptimizedResume, renderer) -> OptimizedResume:
-    """Render PDF and extract text, updating the OptimizedResume."""
+    Job parsing, optimizer outputs and validations already in the checkpoint
+    are reused, so no LLM call is repeated. A finished run just returns its
+    result. The budget applies to the resumed part only.
+
+    Raises:
+        ValueError: No checkpoint exists for run_id
+    """
+    checkpoint = CheckpointStore().get(run_id)
+    if checkpoint is None:
+        raise ValueError(f"No checkpoint for run {run_id}")
+    return await optimize_for_job(
+        checkpoint.source,
+        checkpoint.job_text,
+        max_iterations=max_iterations or checkpoint.max_iterations,
+        on_iteration=on_iteration,
+        job=checkpoint.job,
+        parallel=checkpoint.parallel,
+        no_shame=checkpoint.no_shame,
+        candidates=checkpoint.candidates,
+        pipelined=checkpoint.pipelined,
+        optimizer_mode=checkpoint.optimizer_mode,
+        budget=budget,
+        run_id=run_id,
+    )
+
+
+def _render_and_extract(optimized: OptimizedResume) -> OptimizedResume:
+    """Render PDF and extract text, updating the OptimizedResume.
+
+    Run in the CPU executor: renders with the worker's own renderer.
+    """
+    renderer = get_renderer()
     try:
-        with log_time("render_pdf"):
+        with RENDERS_IN_FLIGHT.track(), log_time("render"):
             # Use html if available, otherwise fall back to data (legacy)
             if optimized.html is not None:
                 result = renderer.render(optimized.html)
@@ -200,7 +957,7 @@ def _render_and_extract(optimized: OptimizedResume, renderer) -> OptimizedResume
             pdf_path = Path(f.name)
 
         try:
-            with log_time("extract_text_from_pdf"):
+            with log_time("extract"):
                 pdf_text = extract_text_from_pdf(pdf_path)
         finally:
             pdf_path.unlink()
@@ -0,0 +1,414 @@
+"""Sampling profiler and event-loop lag monitor for a whole run.
+
+RunProfiler samples the stacks of every thread (so renders and extraction
+in worker threads show up too) and measures how late the event loop wakes
+up. Output, written next to the iteration PDFs in the debug directory:
+
+    profile.folded   collapsed stacks ("thread;frame;frame count"), the input
+                     format of flamegraph.pl, inferno and speedscope
+    profile_top.txt  functions by self and total samples
+    loop_lag.json    event-loop lag samples and summary
+
+Used by `hr-breaker optimize --profile` and the Streamlit "Profile" toggle.
+
+LoopWatchdog (debug mode) times every event-loop callback. When one runs
+longer than the threshold it captures the loop thread's stack while it is
+still blocked, logs it with the traced stage, and aggregates stall time per
+call site (loop_stalls.json): the calls that should move off the loop.
+"""
+
+import asyncio
+import json
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+from collections.abc import Awaitable
+from pathlib import Path
+from types import FrameType
+from typing import Any, TypeVar
+
+from hr_breaker.config import get_settings, logger
+from hr_breaker.metrics import LOOP_STALLS
+from hr_breaker.tracing import current_span
+
+T = TypeVar("T")
+
+# Stripped from file names in frame labels (longest first)
+_PATH_PREFIXES = sorted(
+    {
+        p
+        for p in (
+            sysconfig.get_paths().get("purelib"),
+            sysconfig.get_paths().get("stdlib"),
+            str(Path(__file__).parents[1]),
+        )
+        if p
+    },
+    key=len,
+    reverse=True,
+)
+
+
+def _short_path(filename: str) -> str:
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):].lstrip("/\\")
+    return filename
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+    # ';' separates frames in the folded format
+    return label.replace(";", ":")
+
+
+class StackSampler:
+    """Samples all thread stacks from a background thread."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: dict[str, int] = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="hr-breaker-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                current: FrameType | None = frame
+                while current is not None:
+                    labels.append(_frame_label(current))
+                    current = current.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                key = ";".join(reversed(labels))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        return "\n".join(
+            f"{stack} {count}"
+            for stack, count in sorted(self.stacks.items(), key=lambda kv: -kv[1])
+        )
+
+    def top(self, n: int = 20) -> list[tuple[str, int, int]]:
+        """(function, self samples, total samples), by self samples.
+
+        Idle threads (e.g. waiting in a selector) count too; read totals
+        for the thread or stage you care about.
+        """
+        self_counts: dict[str, int] = {}
+        total_counts: dict[str, int] = {}
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] = self_counts.get(frames[-1], 0) + count
+            for frame in set(frames):
+                total_counts[frame] = total_counts.get(frame, 0) + count
+        ranked = sorted(self_counts.items(), key=lambda kv: -kv[1])[:n]
+        return [(frame, count, total_counts[frame]) for frame, count in ranked]
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes from a short sleep."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples: list[tuple[float, float]] = []  # (seconds since start, lag)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - before - self.interval)
+            self.samples.append((before - start, lag))
+
+    def summary(self) -> dict[str, Any]:
+        lags = sorted(lag for _, lag in self.samples)
+        if not lags:
+            return {"samples": 0, "max": 0.0, "p95": 0.0, "mean": 0.0, "over_100ms": 0}
+        return {
+            "samples": len(lags),
+            "max": lags[-1],
+            "p95": lags[min(len(lags) - 1, int(len(lags) * 0.95))],
+            "mean": sum(lags) / len(lags),
+            "over_100ms": sum(1 for lag in lags if lag > 0.1),
+        }
+
+
+class RunProfiler:
+    """Stack sampling plus loop lag monitoring for the enclosed async block."""
+
+    def __init__(self, sample_interval: float = 0.005, lag_interval: float = 0.05):
+        self.sampler = StackSampler(sample_interval)
+        self.lag = LoopLagMonitor(lag_interval)
+        self.seconds = 0.0
+        self._start = 0.0
+
+    async def __aenter__(self) -> "RunProfiler":
+        self._start = time.perf_counter()
+        self.sampler.start()
+        self.lag.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.lag.stop()
+        self.sampler.stop()
+        self.seconds = time.perf_counter() - self._start
+
+    async def run(self, coro: Awaitable[T]) -> T:
+        """Await coro while profiling."""
+        async with self:
+            return await coro
+
+    def write(self, out_dir: Path) -> list[Path]:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        folded = out_dir / "profile.folded"
+        folded.write_text(self.sampler.folded() + "\n", encoding="utf-8")
+
+        top = out_dir / "profile_top.txt"
+        lines = [
+            f"{self.sampler.samples} samples over {self.seconds:.1f}s "
+            f"({self.sampler.interval * 1000:g}ms interval, all threads)",
+            f"{'self':>7} {'total':>7}  function",
+        ]
+        lines.extend(
+            f"{own:>7} {total:>7}  {frame}" for frame, own, total in self.sampler.top(40)
+        )
+        top.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        lag = out_dir / "loop_lag.json"
+        lag.write_text(
+            json.dumps(
+                {
+                    "interval": self.lag.interval,
+                    "summary": self.lag.summary(),
+                    "samples": self.lag.samples,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        logger.info(f"Profile written to {out_dir}")
+        return [folded, top, lag]
+
+
+_PACKAGE_DIR = str(Path(__file__).parent)
+_watched: dict[int, "LoopWatchdog"] = {}  # Loop thread id -> watchdog
+_original_handle_run = asyncio.events.Handle._run
+
+
+def _timed_handle_run(self: asyncio.events.Handle) -> None:
+    watchdog = _watched.get(threading.get_ident())
+    if watchdog is None:
+        return _original_handle_run(self)
+    watchdog._begin(self)
+    try:
+        return _original_handle_run(self)
+    finally:
+        watchdog._end(self)
+
+
+def _call_site(stack: traceback.StackSummary) -> str:
+    """Innermost frame in our own code (else innermost frame) of a stack."""
+    frames = [f for f in stack if f.filename != __file__]
+    ours = [f for f in frames if f.filename.startswith(_PACKAGE_DIR)]
+    frame = (ours or frames)[-1]
+    return f"{frame.name} ({_short_path(frame.filename)}:{frame.lineno})"
+
+
+class LoopWatchdog:
+    """Detects event-loop stalls: callbacks that block the loop > threshold.
+
+    Wraps asyncio's Handle._run while active to time each callback on the
+    watched loop's thread; a sampler thread grabs the stack of a callback
+    that is still running past the threshold.
+    """
+
+    def __init__(self, threshold: float | None = None):
+        self.threshold = (
+            threshold if threshold is not None else get_settings().loop_stall_threshold
+        )
+        self.poll = self.threshold / 5
+        self.stalls: list[dict[str, Any]] = []
+        # (sequence, handle, start) of the callback running now; replaced atomically
+        self._running: tuple[int, asyncio.Handle, float] | None = None
+        self._seq = 0
+        # (sequence, stack, stage) sampled while that callback was blocking
+        self._captured: tuple[int, traceback.StackSummary, str | None] | None = None
+        self._ident = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    async def __aenter__(self) -> "LoopWatchdog":
+        self._ident = threading.get_ident()
+        if not _watched:
+            asyncio.events.Handle._run = _timed_handle_run
+        _watched[self._ident] = self
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="hr-breaker-loop-watchdog", daemon=True
+        )
+        self._thread.start()
+        # Callbacks are timed from their start: let the current one end
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        _watched.pop(self._ident, None)
+        if not _watched:
+            asyncio.events.Handle._run = _original_handle_run
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def run(self, coro: Awaitable[T]) -> T:
+        """Await coro while watching the loop."""
+        async with self:
+            return await coro
+
+    def _begin(self, handle: asyncio.Handle) -> None:
+        self._seq += 1
+        self._running = (self._seq, handle, time.perf_counter())
+
+    def _end(self, handle: asyncio.Handle) -> None:
+        running = self._running
+        self._running = None
+        if running is None:
+            return
+        seq, _, start = running
+        duration = time.perf_counter() - start
+        if duration >= self.threshold:
+            captured = self._captured
+            if captured and captured[0] == seq:
+                self._record(handle, duration, captured[1], captured[2])
+            else:
+                self._record(handle, duration, None, None)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll):
+            running = self._running
+            if running is None:
+                continue
+            seq, handle, start = running
+            captured = self._captured
+            if captured and captured[0] == seq:
+                continue
+            if time.perf_counter() - start < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._ident)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            # Keep only the frames below our Handle._run wrapper
+            for i, summary in enumerate(stack):
+                if summary.name == "_timed_handle_run" and summary.filename == __file__:
+                    stack = traceback.StackSummary.from_list(stack[i + 2 :])
+                    break
+            span = current_span(handle._context)
+            self._captured = (seq, stack, span.name if span else None)
+
+    def _record(
+        self,
+        handle: asyncio.Handle,
+        duration: float,
+        stack: traceback.StackSummary | None,
+        stage: str | None,
+    ) -> None:
+        if stage is None:
+            span = current_span(handle._context)
+            stage = span.name if span else "-"
+        if stack:
+            call_site = _call_site(stack)
+        else:
+            # Stall ended before the sampler saw it; name the callback instead
+            callback = handle._callback
+            task = getattr(callback, "__self__", None)
+            coro = task.get_coro() if isinstance(task, asyncio.Task) else None
+            call_site = f"<{getattr(coro or callback, '__qualname__', repr(callback))}>"
+        self.stalls.append({
+            "duration": duration,
+            "stage": stage,
+            "call_site": call_site,
+            "stack": stack.format() if stack else [],
+        })
+        LOOP_STALLS.observe(duration, stage=stage)
+        logger.warning(
+            f"Event loop blocked {duration * 1000:.0f}ms in stage {stage} at {call_site}"
+            + ("\n" + "".join(stack.format()) if stack else "")
+        )
+
+    def by_call_site(self) -> list[dict[str, Any]]:
+        """Stall count and time per call site, most total stall time first."""
+        sites: dict[str, dict[str, Any]] = {}
+        for stall in self.stalls:
+            site = sites.setdefault(
+                stall["call_site"],
+                {
+                    "call_site": stall["call_site"],
+                    "count": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "stages": [],
+                },
+            )
+            site["count"] += 1
+            site["total"] += stall["duration"]
+            site["max"] = max(site["max"], stall["duration"])
+            if stall["stage"] not in site["stages"]:
+                site["stages"].append(stall["stage"])
+        return sorted(sites.values(), key=lambda s: -s["total"])
+
+    def write(self, out_dir: Path) -> Path:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / "loop_stalls.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "threshold": self.threshold,
+                    "total_stall_seconds": sum(s["duration"] for s in self.stalls),
+                    "by_call_site": self.by_call_site(),
+                    "stalls": self.stalls,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        return path
@@ -1,14 +1,66 @@
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from pydantic_ai.exceptions import UnexpectedModelBehavior
 from pydantic_ai.models import Model
 from pydantic_ai.profiles import ModelProfile
 from pydantic_ai.profiles.qwen import qwen_model_profile
 
-from hr_breaker.config import get_settings
+from hr_breaker.cassette import is_replaying
+from hr_breaker.config import get_settings, logger
+from hr_breaker.metrics import LLM_ROUTE_SECONDS, LLM_ROUTES
 from hr_breaker.openai_keys import get_openai_api_keys
-from hr_breaker.openai_rotating_model import RotatingOpenAIModel
+from hr_breaker.openai_rotating_model import RotatingOpenAIModel, hedgeable
+
+T = TypeVar("T")
+
+ModelFactory = Callable[[str], Model]
+Embedder = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+_model_override: ContextVar[ModelFactory | None] = ContextVar(
+    "hr_breaker_model_override", default=None
+)
+_embedder_override: ContextVar[Embedder | None] = ContextVar(
+    "hr_breaker_embedder_override", default=None
+)
+
+
+@contextmanager
+def override_models(
+    model_factory: ModelFactory, embedder: Embedder | None = None
+) -> Iterator[None]:
+    """Serve every agent model (and embeddings) from stand-ins inside the block.
+
+    model_factory receives the configured model name. Used by the offline
+    benchmark to run the real pipeline against canned outputs.
+    """
+    model_token = _model_override.set(model_factory)
+    embedder_token = _embedder_override.set(embedder)
+    try:
+        yield
+    finally:
+        _model_override.reset(model_token)
+        _embedder_override.reset(embedder_token)
+
+
+def model_version() -> tuple:
+    """Changes whenever get_*_model() would resolve differently for the same settings."""
+    return (_model_override.get(), is_replaying(), tuple(get_openai_api_keys()))
+
+
+def get_embedder_override() -> Embedder | None:
+    return _embedder_override.get()
 
 
 def _get_openai_model(model_name: str) -> Model:
     """Create an OpenAI-compatible model with API key rotation."""
+    override = _model_override.get()
+    if override is not None:
+        return override(model_name)
     settings = get_settings()
     api_keys = get_openai_api_keys()
 
@@ -34,6 +86,10 @@ def _get_openai_model(model_name: str) -> Model:
     elif "qwen" in model_name.lower():
         profile = qwen_model_profile(model_name)
 
+    # Replayed traffic never reaches the API; keys are not part of the match.
+    if not api_keys and is_replaying():
+        api_keys = ["replay"]
+
     # For local OpenAI-compatible servers (e.g. Ollama), allow empty keys.
     if not api_keys and not settings.openai_base_url:
         raise RuntimeError(
@@ -48,6 +104,21 @@ def _get_openai_model(model_name: str) -> Model:
     )
 
 
+def prompt_cache_settings(
+    key: str, model_settings: dict[str, Any] | None = None
+) -> dict[str, Any] | None:
+    """model_settings plus an OpenAI prompt_cache_key.
+
+    Requests sharing a key (and a prompt prefix) are routed to the same
+    cache, which raises prefix cache hits. Only sent to the OpenAI API
+    itself: compatible servers may reject unknown parameters.
+    """
+    settings = get_settings()
+    if settings.llm_provider != "openai" or settings.openai_base_url:
+        return model_settings
+    return {**(model_settings or {}), "openai_prompt_cache_key": key}
+
+
 def get_agent_model() -> str | Model:
     """Get the smart model for complex tasks (optimization)."""
     settings = get_settings()
@@ -64,3 +135,110 @@ def get_vision_model() -> str | Model:
     """Get the vision model for visual reviews."""
     settings = get_settings()
     return _get_openai_model(settings.openai_vision_model)
+
+
+# Model routing (settings.model_routing = "adaptive")
+
+FLASH = "flash"
+PRO = "pro"
+
+# Failures a refinement can fix on the flash model: add keywords, trim
+# length, fix structure. Anything judged by an LLM filter needs pro.
+MINOR_FILTERS = frozenset({"KeywordMatcher", "ContentLengthChecker", "DataValidator"})
+
+
+@dataclass
+class _RouteHistory:
+    """Per-run routing state (see routing_scope())."""
+
+    escalated: set[str] = field(default_factory=set)  # stages pinned to pro
+    # stage -> (iteration, filters) of the last flash attempt, checked once
+    # by the first call of a later iteration
+    pending: dict[str, tuple[int, frozenset[str]]] = field(default_factory=dict)
+
+
+_route_history: ContextVar[_RouteHistory | None] = ContextVar(
+    "hr_breaker_route_history", default=None
+)
+
+
+@contextmanager
+def routing_scope() -> Iterator[None]:
+    """Routing state for one optimization run.
+
+    Inside the block, a flash refinement whose target filters still fail at
+    the next iteration pins that stage to pro for the rest of the run.
+    """
+    token = _route_history.set(_RouteHistory())
+    try:
+        yield
+    finally:
+        _route_history.reset(token)
+
+
+def choose_route(
+    stage: str,
+    iteration: int = 0,
+    failed_filters: Iterable[str] = (),
+    prompt_chars: int = 0,
+) -> str:
+    """FLASH or PRO for one call of `stage`.
+
+    Pro unless routing is adaptive. Flash for prompts up to
+    routing_flash_max_prompt_chars; for the optimizer only on refinement
+    iterations whose failed filters are all MINOR_FILTERS. A stage escalated
+    earlier in the run (see routing_scope()) stays on pro. The result depends
+    only on the run's state before `iteration`, so concurrent candidates of
+    one iteration get the same route.
+    """
+    settings = get_settings()
+    if settings.model_routing != "adaptive":
+        return PRO
+    failed = frozenset(failed_filters)
+    history = _route_history.get()
+    if history is not None:
+        asked = history.pending.get(stage)
+        if asked is not None and asked[0] < iteration:
+            del history.pending[stage]
+            if asked[1] & failed:
+                # The flash attempt didn't fix what it was asked to
+                LLM_ROUTES.inc(stage=stage, route=FLASH, outcome="failed")
+                history.escalated.add(stage)
+        if stage in history.escalated:
+            return PRO
+    if prompt_chars > settings.routing_flash_max_prompt_chars:
+        return PRO
+    if stage == "optimizer" and (iteration == 0 or not failed or not failed <= MINOR_FILTERS):
+        return PRO
+    if history is not None and stage == "optimizer":
+        history.pending[stage] = (iteration, failed)
+    return FLASH
+
+
+async def run_routed(
+    stage: str,
+    route: str,
+    attempt: Callable[[Model | None], Awaitable[T]],
+) -> T:
+    """Run attempt(model) on the route's model, escalating flash to pro.
+
+    attempt receives the flash model, or None for the agent's own (pro)
+    model. A flash attempt that raises UnexpectedModelBehavior is repeated
+    on pro. Latency and outcome are recorded per stage and route.
+    """
+    start = time.perf_counter()
+    try:
+        result = await attempt(get_flash_model() if route == FLASH else None)
+    except UnexpectedModelBehavior as e:
+        _record_route(stage, route, "error", start)
+        if route == PRO:
+            raise
+        logger.debug(f"{stage}: flash attempt failed ({e}), escalating to pro")
+        return await run_routed(stage, PRO, attempt)
+    _record_route(stage, route, "ok", start)
+    return result
+
+
+def _record_route(stage: str, route: str, outcome: str, start: float) -> None:
+    LLM_ROUTES.inc(stage=stage, route=route, outcome=outcome)
+    LLM_ROUTE_SECONDS.observe(time.perf_counter() - start, stage=stage, route=route)
@@ -1,16 +1,40 @@
-from .job_scraper import scrape_job_posting, ScrapingError, CloudflareBlockedError
-from .cache import ResumeCache
-from .pdf_storage import PDFStorage
-from .renderer import get_renderer, BaseRenderer, HTMLRenderer, RenderError
-
-__all__ = [
-    "scrape_job_posting",
-    "ScrapingError",
-    "CloudflareBlockedError",
-    "ResumeCache",
-    "PDFStorage",
-    "get_renderer",
-    "BaseRenderer",
-    "HTMLRenderer",
-    "RenderError",
-]
+"""Services (scraping, rendering, storage).
+
+Imported on first attribute access (PEP 562) so that e.g. listing saved PDFs
+doesn't load the scrapers or the renderer.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cache import ResumeCache
+    from .checkpoint import CheckpointStore, new_run_id
+    from .job_scraper import CloudflareBlockedError, ScrapingError, scrape_job_posting
+    from .pdf_storage import PDFStorage
+    from .renderer import BaseRenderer, HTMLRenderer, RenderError, get_renderer
+
+_LAZY = {
+    "scrape_job_posting": ".job_scraper",
+    "ScrapingError": ".job_scraper",
+    "CloudflareBlockedError": ".job_scraper",
+    "ResumeCache": ".cache",
+    "CheckpointStore": ".checkpoint",
+    "new_run_id": ".checkpoint",
+    "PDFStorage": ".pdf_storage",
+    "get_renderer": ".renderer",
+    "BaseRenderer": ".renderer",
+    "HTMLRenderer": ".renderer",
+    "RenderError": ".renderer",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = list(_LAZY)
@@ -2,6 +2,7 @@ import json
 from pathlib import Path
 
 from hr_breaker.config import get_settings
+from hr_breaker.metrics import record_cache
 from hr_breaker.models import ResumeSource
 
 
@@ -17,13 +18,15 @@ class ResumeCache:
 
     def get(self, checksum: str) -> ResumeSource | None:
         path = self._path(checksum)
+        resume = None
         if path.exists():
             try:
                 data = json.loads(path.read_text(encoding="utf-8"))
-                return ResumeSource(**data)
+                resume = ResumeSource(**data)
             except (json.JSONDecodeError, KeyError, TypeError, ValueError):
-                return None
-        return None
+                pass
+        record_cache("resume", hit=resume is not None)
+        return resume
 
     def put(self, resume: ResumeSource) -> None:
         path = self._path(resume.checksum)
@@ -0,0 +1,80 @@
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+from hr_breaker.config import get_settings
+from hr_breaker.models import RunCheckpoint
+
+# Rendered output is large and cheap to recreate - keep checkpoints compact
+_EXCLUDE = {"iterations": {"__all__": {"optimized": {"pdf_bytes", "pdf_text", "pdf_path"}}}}
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+class CheckpointStore:
+    """File-based store of run checkpoints, one JSON file per run ID."""
+
+    def __init__(self):
+        self.checkpoint_dir = get_settings().checkpoint_dir
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, run_id: str) -> Path:
+        return self.checkpoint_dir / f"{run_id}.json"
+
+    def get(self, run_id: str) -> RunCheckpoint | None:
+        path = self._path(run_id)
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                return RunCheckpoint(**data)
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                return None
+        return None
+
+    def put(self, checkpoint: RunCheckpoint) -> None:
+        path = self._path(checkpoint.run_id)
+        # Write-then-rename so a crash mid-write never corrupts the checkpoint
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(checkpoint.model_dump_json(exclude=_EXCLUDE), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def delete(self, run_id: str) -> None:
+        self._path(run_id).unlink(missing_ok=True)
+
+    def prune(self) -> int:
+        """Delete checkpoints past the retention age or beyond the newest N.
+
+        Returns the number deleted.
+        """
+        settings = get_settings()
+        cutoff = time.time() - settings.checkpoint_retention_days * 86400
+        paths = sorted(
+            self.checkpoint_dir.glob("*.json"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        expired = [
+            p
+            for i, p in enumerate(paths)
+            if i >= settings.checkpoint_max_runs or p.stat().st_mtime < cutoff
+        ]
+        for path in expired:
+            path.unlink(missing_ok=True)
+        return len(expired)
+
+    def list_all(self) -> list[RunCheckpoint]:
+        checkpoints = []
+        paths = sorted(
+            self.checkpoint_dir.glob("*.json"), key=lambda p: p.stat().st_mtime
+        )
+        for path in paths:
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                checkpoints.append(RunCheckpoint(**data))
+            except Exception:
+                continue
+        return checkpoints
@@ -2,8 +2,6 @@
 
 from pathlib import Path
 
-import fitz  # pymupdf
-
 
 def extract_text_from_pdf(pdf_path: Path) -> str:
     """Extract text from PDF file.
@@ -14,6 +12,8 @@ def extract_text_from_pdf(pdf_path: Path) -> str:
     Returns:
         Extracted text content
     """
+    import fitz  # pymupdf
+
     doc = fitz.open(pdf_path)
     text_parts = []
 
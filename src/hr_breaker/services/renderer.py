@@ -2,11 +2,13 @@
 
 import os
 import sys
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
 
 from jinja2 import Environment, FileSystemLoader
 
+from hr_breaker.metrics import RENDERS
 from hr_breaker.models.resume_data import ResumeData, RenderResult
 
 
@@ -146,6 +148,7 @@ class HTMLRenderer(BaseRenderer):
         html = HTML(string=html_content, base_url=str(self.template_dir))
         doc = html.render(font_config=self.font_config)
         pdf_bytes = doc.write_pdf()
+        RENDERS.inc(kind="html")
         page_count = len(doc.pages)
 
         warnings = []
@@ -175,6 +178,7 @@ class HTMLRenderer(BaseRenderer):
 
         doc = html.render(stylesheets=stylesheets, font_config=self.font_config)
         pdf_bytes = doc.write_pdf()
+        RENDERS.inc(kind="data")
         page_count = len(doc.pages)
 
         warnings = []
@@ -188,6 +192,16 @@ class HTMLRenderer(BaseRenderer):
         )
 
 
+_local = threading.local()
+
+
 def get_renderer() -> HTMLRenderer:
-    """Get the HTML renderer."""
-    return HTMLRenderer()
+    """Get this thread's HTML renderer, created on first use.
+
+    One per thread (and so per CPU executor worker, thread or process): the
+    WeasyPrint FontConfiguration is built once and stays warm.
+    """
+    renderer = getattr(_local, "renderer", None)
+    if renderer is None:
+        renderer = _local.renderer = HTMLRenderer()
+    return renderer
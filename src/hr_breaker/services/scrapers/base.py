@@ -1,7 +1,5 @@
 from abc import ABC, abstractmethod
 
-from bs4 import BeautifulSoup
-
 from hr_breaker.config import get_settings
 
 
@@ -40,6 +38,8 @@ class BaseScraper(ABC):
 
     def extract_job_text(self, html: str) -> str:
         """Extract job posting text from HTML."""
+        from bs4 import BeautifulSoup
+
         settings = get_settings()
         soup = BeautifulSoup(html, "html.parser")
 
@@ -3,6 +3,7 @@ import time
 
 import httpx
 
+from hr_breaker.cassette import http_transport
 from hr_breaker.config import get_settings
 
 from .base import BaseScraper, CloudflareBlockedError, ScrapingError
@@ -61,7 +62,7 @@ class HttpxScraper(BaseScraper):
         }
 
         with httpx.Client(
-            follow_redirects=True, timeout=self.timeout
+            follow_redirects=True, timeout=self.timeout, transport=http_transport()
         ) as client:
             response = client.get(url, headers=headers)
             html = response.text
@@ -1,17 +1,12 @@
+import importlib.util
 import logging
 
 from .base import BaseScraper, CloudflareBlockedError, ScrapingError
 
 logger = logging.getLogger(__name__)
 
-try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
-
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
-    sync_playwright = None
-    PlaywrightTimeout = None
+# Checked without importing: playwright is only loaded when a scrape needs it
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec("playwright") is not None
 
 
 class PlaywrightScraper(BaseScraper):
@@ -30,6 +25,8 @@ class PlaywrightScraper(BaseScraper):
                 "uv pip install 'hr-breaker[browser]' && playwright install chromium"
             )
 
+        from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+
         try:
             with sync_playwright() as p:
                 browser = p.chromium.launch(headless=True)
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta, timezone
 
 import httpx
 
+from hr_breaker.cassette import http_transport
 from hr_breaker.config import get_settings
 
 from .base import BaseScraper, ScrapingError
@@ -31,7 +32,7 @@ class WaybackScraper(BaseScraper):
         logger.info(f"Using Wayback snapshot: {snapshot_url}")
 
         with httpx.Client(
-            follow_redirects=True, timeout=self.timeout
+            follow_redirects=True, timeout=self.timeout, transport=http_transport()
         ) as client:
             response = client.get(snapshot_url)
             response.raise_for_status()
@@ -50,7 +51,7 @@ class WaybackScraper(BaseScraper):
         }
 
         try:
-            with httpx.Client(timeout=self.timeout) as client:
+            with httpx.Client(timeout=self.timeout, transport=http_transport()) as client:
                 response = client.get(WAYBACK_CDX_API, params=params)
                 response.raise_for_status()
                 data = response.json()
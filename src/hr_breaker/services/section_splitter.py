@@ -0,0 +1,175 @@
+"""Split a source resume (plain text, Markdown, LaTeX) into sections.
+
+Used by the section-parallel optimizer: each section (and each experience
+entry) is optimized by its own concurrent LLM call. Headings are recognised
+as Markdown (#), LaTeX (\\section) or short plain-text lines (ALL CAPS, a
+trailing colon, or a known section name). Everything before the first
+heading is the header (name, contacts).
+"""
+
+import re
+from dataclasses import dataclass
+
+from hr_breaker.config import get_settings
+
+__all__ = [
+    "ResumeSection",
+    "split_sections",
+    "section_budgets",
+]
+
+# Section kind -> normalized headings that map to it
+SECTION_KINDS: dict[str, tuple[str, ...]] = {
+    "summary": (
+        "summary",
+        "professional summary",
+        "profile",
+        "professional profile",
+        "about",
+        "about me",
+        "objective",
+    ),
+    "experience": (
+        "experience",
+        "work experience",
+        "professional experience",
+        "employment",
+        "employment history",
+        "work history",
+        "relevant experience",
+    ),
+    "education": ("education", "academic background", "education and training"),
+    "skills": (
+        "skills",
+        "technical skills",
+        "core skills",
+        "key skills",
+        "core competencies",
+        "technologies",
+        "tech stack",
+    ),
+    "projects": ("projects", "personal projects", "selected projects", "side projects"),
+}
+
+_KNOWN_HEADINGS = {h: kind for kind, hs in SECTION_KINDS.items() for h in hs}
+
+_MARKDOWN_HEADING = re.compile(r"^#{1,2}\s+(.+?)\s*#*$")
+_LATEX_HEADING = re.compile(r"^\\section\*?\{(.+?)\}")
+# Start of an experience entry inside a section
+_ENTRY_START = re.compile(r"^(#{3,}\s|\\(cventry|resumeSubheading|subsection)\b)")
+_BULLET = re.compile(r"^([-*\u2022\u25cf]\s|\\(item|resumeItem)\b|\\(begin|end)\{)")
+
+
+@dataclass
+class ResumeSection:
+    kind: str  # header | summary | experience | education | skills | projects | other
+    title: str  # Heading as written ("" for the header)
+    text: str
+    group: int  # Index of the source section; experience entries share one
+
+
+def _normalize(heading: str) -> str:
+    return re.sub(r"[^a-z ]+", "", heading.lower()).strip()
+
+
+def _heading(line: str) -> str | None:
+    """The heading text if `line` is a section heading."""
+    stripped = line.strip()
+    for pattern in (_MARKDOWN_HEADING, _LATEX_HEADING):
+        match = pattern.match(stripped)
+        if match:
+            return match.group(1).strip()
+    title = stripped.rstrip(":").strip()
+    if not title or len(title) > 40 or len(title.split()) > 4:
+        return None
+    if _normalize(title) in _KNOWN_HEADINGS:
+        return title
+    # ALL CAPS words only ("CERTIFICATIONS", "AWARDS & HONORS"), not e.g.
+    # "MIT BS CS 2018"
+    words = title.replace("&", " ").split()
+    if (
+        title.isupper()
+        and all(w.isalpha() for w in words)
+        and max(len(w) for w in words) >= 5
+    ):
+        return title
+    return None
+
+
+def _entries(text: str) -> list[str]:
+    """Experience entries: blank-line separated blocks or explicit entry starts.
+
+    A block that starts with a bullet belongs to the entry before it.
+    """
+    entries: list[list[str]] = [[]]
+    blank = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            blank = True
+            continue
+        starts_entry = _ENTRY_START.match(stripped) or (
+            blank and not _BULLET.match(stripped)
+        )
+        if starts_entry and entries[-1]:
+            entries.append([])
+        entries[-1].append(line)
+        blank = False
+    return ["\n".join(e).strip() for e in entries if e]
+
+
+def split_sections(text: str) -> list[ResumeSection]:
+    """Split a resume into header, sections and experience entries.
+
+    Returns [] when the resume has no header or fewer than two headed
+    sections, i.e. when it can't be split usefully.
+    """
+    header: list[str] = []
+    sections: list[tuple[str, list[str]]] = []
+    for line in text.splitlines():
+        title = _heading(line)
+        if title is not None:
+            sections.append((title, []))
+        elif sections:
+            sections[-1][1].append(line)
+        else:
+            header.append(line)
+
+    header_text = "\n".join(header).strip()
+    if not header_text or len(sections) < 2:
+        return []
+
+    result = [ResumeSection("header", "", header_text, 0)]
+    for group, (title, lines) in enumerate(sections, 1):
+        body = "\n".join(lines).strip()
+        if not body:
+            continue
+        kind = _KNOWN_HEADINGS.get(_normalize(title), "other")
+        if kind == "experience":
+            result.extend(ResumeSection(kind, title, e, group) for e in _entries(body))
+        else:
+            result.append(ResumeSection(kind, title, body, group))
+    return result
+
+
+def section_budgets(sections: list[ResumeSection], summary_words: int = 50) -> list[int]:
+    """Word budget per section: resume_max_words shared by source length.
+
+    The header gets no budget (0: contacts are kept as they are), the
+    summary a fixed `summary_words`, the rest in proportion to their source
+    word counts with a floor of 15 words.
+    """
+    total = get_settings().resume_max_words
+    words = [len(s.text.split()) for s in sections]
+    fixed = sum(summary_words for s in sections if s.kind == "summary")
+    shared = sum(w for s, w in zip(sections, words) if s.kind not in ("header", "summary"))
+    remaining = max(0, total - fixed)
+    budgets = []
+    for s, w in zip(sections, words):
+        if s.kind == "header":
+            budgets.append(0)
+        elif s.kind == "summary":
+            budgets.append(summary_words)
+        else:
+            budgets.append(max(15, round(remaining * w / shared)) if shared else 15)
+    return budgets
@@ -0,0 +1,312 @@
+"""Nested per-stage tracing spans.
+
+A run is traced as a tree of spans: run -> iteration -> optimizer (-> tool:*,
+llm_request) -> render -> extract -> filter:* (-> llm_request). The current
+span is a context variable, so tasks spawned inside a span (asyncio.gather,
+to_thread) nest under it.
+
+Finished spans go to registered listeners, to the JSONL file in
+settings.trace_file (appended by a writer thread, see flush_traces()) and,
+batched per trace, to an OTLP/HTTP collector at settings.otlp_endpoint. Both
+exports are off unless configured. `hr-breaker trace-summary` reads the JSONL
+file back (see summarize()).
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from hr_breaker.config import get_settings, logger
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    start_time: float = field(default_factory=time.time)  # Unix seconds
+    end_time: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        end = self.end_time if self.end_time is not None else time.time()
+        return end - self.start_time
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+_current_span: ContextVar[Span | None] = ContextVar(
+    "hr_breaker_current_span", default=None
+)
+_listeners: list[Callable[[Span], None]] = []
+_writer_lock = threading.Lock()
+_writer: threading.Thread | None = None
+_write_queue: "queue.Queue[tuple[Path, dict[str, Any]]]" = queue.Queue()
+_pending: dict[str, list[Span]] = defaultdict(list)  # OTLP batches per trace
+# Traces whose root already finished (most recent): their late spans are
+# exported on their own instead of waiting in _pending forever
+_exported: OrderedDict[str, None] = OrderedDict()
+_EXPORTED_MAX = 1024
+# Spans finish on executor threads too (run_cpu copies the context)
+_pending_lock = threading.Lock()
+
+
+def current_span(context: Context | None = None) -> Span | None:
+    """Current span, or the one current in another context (e.g. a task's)."""
+    if context is not None:
+        return context.get(_current_span)
+    return _current_span.get()
+
+
+def add_span_listener(listener: Callable[[Span], None]) -> None:
+    """Call listener with every finished span."""
+    _listeners.append(listener)
+
+
+def remove_span_listener(listener: Callable[[Span], None]) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Trace the enclosed block as a child of the current span."""
+    parent = _current_span.get()
+    s = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent else None,
+        attributes=attributes,
+    )
+    token = _current_span.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        s.end_time = time.time()
+        _current_span.reset(token)
+        _finish(s)
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Decorator: run each call of a sync or async function in a span."""
+
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _finish(s: Span) -> None:
+    for listener in list(_listeners):
+        try:
+            listener(s)
+        except Exception as e:
+            logger.debug(f"Span listener failed: {e}")
+
+    settings = get_settings()
+    if settings.trace_file is not None:
+        _write_queue.put((settings.trace_file, s.to_dict()))
+        _ensure_writer()
+    if settings.otlp_endpoint:
+        with _pending_lock:
+            if s.trace_id in _exported:
+                # Finished after its root (e.g. a task left running)
+                batch = [s]
+            elif s.parent_id is None:
+                _exported[s.trace_id] = None
+                if len(_exported) > _EXPORTED_MAX:
+                    _exported.popitem(last=False)
+                batch = _pending.pop(s.trace_id, []) + [s]
+            else:
+                _pending[s.trace_id].append(s)
+                return
+        _send_otlp(settings.otlp_endpoint, batch)
+
+
+def _send_otlp(endpoint: str, batch: list[Span]) -> None:
+    threading.Thread(target=_export_otlp, args=(endpoint, batch), daemon=True).start()
+
+
+def _ensure_writer() -> None:
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(
+                target=_write_loop, name="hr-breaker-trace-writer", daemon=True
+            )
+            _writer.start()
+
+
+def _write_loop() -> None:
+    """Append queued spans to their JSONL files, one open per file and batch."""
+    while True:
+        batch = [_write_queue.get()]
+        while True:
+            try:
+                batch.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        lines: dict[Path, list[str]] = defaultdict(list)
+        for path, data in batch:
+            lines[path].append(json.dumps(data, default=str) + "\n")
+        for path, path_lines in lines.items():
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with path.open("a", encoding="utf-8") as f:
+                    f.writelines(path_lines)
+            except OSError as e:
+                logger.debug(f"Could not write trace file: {e}")
+        for _ in batch:
+            _write_queue.task_done()
+
+
+def flush_traces() -> None:
+    """Block until every finished span is written to its trace file."""
+    if _writer is not None and _writer.is_alive():
+        _write_queue.join()
+
+
+atexit.register(flush_traces)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: Iterable[Span]) -> dict[str, Any]:
+    """Spans as an OTLP/HTTP JSON ExportTraceServiceRequest."""
+    otlp_spans = []
+    for s in spans:
+        otlp_span: dict[str, Any] = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(int(s.start_time * 1e9)),
+            "endTimeUnixNano": str(int((s.end_time or s.start_time) * 1e9)),
+            "attributes": [
+                {"key": k, "value": _otlp_value(v)}
+                for k, v in s.attributes.items()
+                if v is not None
+            ],
+            # STATUS_CODE_OK / STATUS_CODE_ERROR
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            otlp_span["parentSpanId"] = s.parent_id
+        otlp_spans.append(otlp_span)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": "hr-breaker"}}
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": "hr_breaker"}, "spans": otlp_spans}],
+            }
+        ]
+    }
+
+
+def _export_otlp(endpoint: str, spans: list[Span]) -> None:
+    import httpx
+
+    url = endpoint.rstrip("/") + "/v1/traces"
+    try:
+        httpx.post(url, json=to_otlp(spans), timeout=5.0).raise_for_status()
+    except httpx.HTTPError as e:
+        logger.debug(f"OTLP export to {url} failed: {e}")
+
+
+def load_spans(path: Path) -> list[dict[str, Any]]:
+    """Read spans written to a JSONL trace file (skipping corrupt lines)."""
+    spans = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                spans.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return spans
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    # Nearest-rank percentile
+    index = max(0, min(len(sorted_values) - 1, round(p * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(spans: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Per-stage latency stats: count, p50, p95, max and total seconds.
+
+    Sorted by total time, so the stages where latency goes come first.
+    """
+    durations: dict[str, list[float]] = defaultdict(list)
+    for s in spans:
+        durations[s["name"]].append(s["duration"])
+    rows = []
+    for name, values in durations.items():
+        values.sort()
+        rows.append({
+            "stage": name,
+            "count": len(values),
+            "p50": _percentile(values, 0.50),
+            "p95": _percentile(values, 0.95),
+            "max": values[-1],
+            "total": sum(values),
+        })
+    return sorted(rows, key=lambda r: r["total"], reverse=True)
@@ -0,0 +1,86 @@
+"""Per-run LLM usage accounting.
+
+Every model response passes through RotatingOpenAIModel, which reports it
+here. Usage lands in the UsageTotals of the run currently being tracked (a
+context variable, so concurrent runs in one process stay separate and tasks
+spawned by a run share its totals).
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from pydantic_ai.messages import ModelResponse
+
+from hr_breaker.config import get_settings, logger
+from hr_breaker.models.budget import UsageTotals
+
+_current_usage: ContextVar[UsageTotals | None] = ContextVar(
+    "hr_breaker_run_usage", default=None
+)
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageTotals]:
+    """Collect usage of all LLM calls made inside the block."""
+    totals = UsageTotals()
+    token = _current_usage.set(totals)
+    try:
+        yield totals
+    finally:
+        _current_usage.reset(token)
+
+
+def current_usage() -> UsageTotals | None:
+    return _current_usage.get()
+
+
+def estimate_cost(response: ModelResponse) -> float:
+    """Estimated USD cost of a response.
+
+    Configured LLM_PRICE_*_PER_MTOK override genai-prices; models unknown to
+    genai-prices without configured prices count as free. Input tokens read
+    from the provider's prompt cache are billed at the cached-input price.
+    """
+    settings = get_settings()
+    usage = response.usage
+    if settings.llm_price_input_per_mtok is not None or settings.llm_price_output_per_mtok is not None:
+        input_price = settings.llm_price_input_per_mtok or 0.0
+        cached_price = settings.llm_price_cached_input_per_mtok
+        if cached_price is None:
+            cached_price = input_price
+        return (
+            (usage.input_tokens - usage.cache_read_tokens) * input_price
+            + usage.cache_read_tokens * cached_price
+            + usage.output_tokens * (settings.llm_price_output_per_mtok or 0.0)
+        ) / 1_000_000
+    try:
+        return float(response.cost().total_price)
+    except (LookupError, AssertionError):
+        logger.debug(f"No price known for {response.model_name}, counting as free")
+        return 0.0
+
+
+def record_response(response: ModelResponse) -> None:
+    """Add a model response's usage to the current run (if any)."""
+    totals = _current_usage.get()
+    if totals is None:
+        return
+    usage = response.usage
+    totals.input_tokens += usage.input_tokens
+    totals.output_tokens += usage.output_tokens
+    totals.cache_read_tokens += usage.cache_read_tokens
+    totals.llm_calls += 1
+    totals.cost_usd += estimate_cost(response)
+
+
+def record_embedding(input_tokens: int) -> None:
+    """Add an embeddings API call to the current run (if any)."""
+    totals = _current_usage.get()
+    if totals is None:
+        return
+    settings = get_settings()
+    totals.input_tokens += input_tokens
+    totals.llm_calls += 1
+    if settings.embedding_price_per_mtok is not None:
+        totals.cost_usd += input_tokens * settings.embedding_price_per_mtok / 1_000_000
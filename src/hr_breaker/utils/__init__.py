@@ -1,5 +1,11 @@
+from .html_patch import PatchError, PatchOp, annotate_ids, apply_patch, strip_ids
 from .html_text import extract_text_from_html
 
 __all__ = [
+    "PatchError",
+    "PatchOp",
+    "annotate_ids",
+    "apply_patch",
     "extract_text_from_html",
+    "strip_ids",
 ]
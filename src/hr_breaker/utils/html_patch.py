@@ -0,0 +1,117 @@
+"""Element-level patches for resume HTML.
+
+annotate_ids() gives every block element of a resume a stable data-id
+("section-3", "li-12"); a model can then describe an edit as a short list of
+PatchOps against those ids instead of returning the whole document, and
+apply_patch() applies it locally.
+"""
+
+from collections.abc import Iterable
+from typing import Literal
+
+from pydantic import BaseModel
+
+ID_ATTR = "data-id"
+
+# Elements that get an id: everything a patch may reasonably replace, delete
+# or insert next to (sections, entries, bullets, paragraphs, headings)
+ADDRESSABLE_TAGS = (
+    "header",
+    "section",
+    "div",
+    "p",
+    "ul",
+    "ol",
+    "li",
+    "h1",
+    "h2",
+    "h3",
+    "table",
+    "tr",
+    "style",
+)
+
+
+class PatchError(ValueError):
+    """A patch op references an unknown id or is malformed."""
+
+
+class PatchOp(BaseModel):
+    op: Literal["replace", "delete", "insert_before", "insert_after"]
+    id: str  # data-id of the target element
+    html: str = ""  # New element(s); unused for delete
+
+
+def _parse(html: str):
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, "html.parser")
+
+
+def annotate_ids(html: str) -> str:
+    """Return html with a unique data-id on every addressable element.
+
+    Ids are "<tag>-<n>" in document order; existing data-id attributes are
+    replaced.
+    """
+    soup = _parse(html)
+    for n, tag in enumerate(soup.find_all(ADDRESSABLE_TAGS), 1):
+        tag[ID_ATTR] = f"{tag.name}-{n}"
+    return str(soup)
+
+
+def strip_ids(html: str) -> str:
+    """Remove data-id attributes added by annotate_ids()."""
+    soup = _parse(html)
+    for tag in soup.find_all(attrs={ID_ATTR: True}):
+        del tag[ID_ATTR]
+    return str(soup)
+
+
+def apply_patch(html: str, ops: Iterable[PatchOp]) -> str:
+    """Apply ops to annotated html; returns html without data-ids.
+
+    Ids refer to the html as given, so ops may come in any order: inserts are
+    applied first, then replacements and deletions. Raises PatchError for
+    unknown ids, an id replaced/deleted twice, an op targeting an element
+    inside one that another op replaces or deletes (its edit would be lost),
+    or an insert/replace with empty html.
+    """
+    soup = _parse(html)
+    ops = list(ops)
+    targets = {tag[ID_ATTR]: tag for tag in soup.find_all(attrs={ID_ATTR: True})}
+    unknown = sorted({op.id for op in ops} - set(targets))
+    if unknown:
+        raise PatchError(f"no element with {ID_ATTR} {', '.join(unknown)}")
+    removed = [op.id for op in ops if op.op in ("replace", "delete")]
+    twice = sorted({i for i in removed if removed.count(i) > 1})
+    if twice:
+        raise PatchError(f"replaced or deleted more than once: {', '.join(twice)}")
+
+    removed_tags = {id(targets[i]): i for i in removed}
+    for op in ops:
+        outer = next(
+            (removed_tags[id(p)] for p in targets[op.id].parents if id(p) in removed_tags),
+            None,
+        )
+        if outer is not None:
+            raise PatchError(f"{op.op} {op.id}: element is inside {outer}, which is removed")
+
+    inserts = [op for op in ops if op.op.startswith("insert")]
+    for op in inserts + [op for op in ops if not op.op.startswith("insert")]:
+        target = targets[op.id]
+        if op.op == "delete":
+            target.decompose()
+            continue
+        if not op.html.strip():
+            raise PatchError(f"{op.op} {op.id}: html is empty, use delete to remove")
+        nodes = list(_parse(op.html).contents)
+        if op.op == "replace":
+            target.replace_with(*nodes)
+        elif op.op == "insert_before":
+            target.insert_before(*nodes)
+        else:
+            target.insert_after(*nodes)
+    for tag in soup.find_all(attrs={ID_ATTR: True}):
+        del tag[ID_ATTR]
+    return str(soup)
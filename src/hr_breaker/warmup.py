@@ -0,0 +1,179 @@
+"""Warm-up: pay cold-start costs before the first real optimization.
+
+A fresh process imports WeasyPrint (and builds the fontconfig cache on a new
+container), initializes FontConfiguration, loads PyMuPDF and sklearn, starts
+the CPU executor and builds pydantic-ai agents (output schemas, provider
+SDKs). warmup() does all of that on a small sample resume so the first user
+request doesn't, and reports how long each step took.
+
+Steps never raise: a failing step (e.g. missing API keys for the agents) is
+reported with its error and the remaining steps still run.
+
+Rendering happens in the CPU executor's workers, each with its own
+renderer, so the sample is rendered once per worker: settings.cpu_workers
+tasks that wait for each other at a barrier, which makes each one occupy a
+different worker (and starts every process of a process pool).
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from hr_breaker.config import get_settings, logger
+from hr_breaker.models import JobPosting, OptimizedResume, ResumeSource
+
+SAMPLE_SOURCE = """Jane Doe
+Backend engineer, 6 years of Python, Django and PostgreSQL.
+Built REST APIs serving 2M requests/day; led migration to Kubernetes."""
+
+SAMPLE_HTML = """<div class="header"><h1>Jane Doe</h1></div>
+<div class="section"><h2>Experience</h2>
+<p><strong>Senior Backend Engineer</strong>, Acme (2019-2025)</p>
+<ul><li>Built Python/Django REST APIs serving 2M requests/day</li>
+<li>Led migration of 40 services to Kubernetes</li></ul></div>
+<div class="section"><h2>Skills</h2><p>Python, Django, PostgreSQL, Kubernetes</p></div>"""
+
+SAMPLE_JOB = JobPosting(
+    title="Backend Engineer",
+    company="Acme",
+    requirements=["Python", "Django", "PostgreSQL"],
+    keywords=["python", "django", "postgresql", "kubernetes", "rest"],
+    description="Build and run Python services.",
+)
+
+
+@dataclass
+class WarmupStep:
+    name: str
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_BARRIER_TIMEOUT = 60.0  # Seconds a worker waits for the others to start
+
+
+def _render_sample(optimized: OptimizedResume) -> OptimizedResume:
+    from hr_breaker.orchestration import _render_and_extract
+
+    return _render_and_extract(optimized)
+
+
+def _sample() -> OptimizedResume:
+    from hr_breaker.utils import extract_text_from_html
+
+    source = ResumeSource(content=SAMPLE_SOURCE, first_name="Jane", last_name="Doe")
+    # pdf_text from the HTML so the filters still run if rendering fails
+    return OptimizedResume(
+        html=SAMPLE_HTML,
+        source_checksum=source.checksum,
+        pdf_text=extract_text_from_html(SAMPLE_HTML),
+    )
+
+
+def _warm_worker(optimized: OptimizedResume, barrier) -> OptimizedResume:
+    """Render and rasterize the sample in this worker, then wait at barrier."""
+    from hr_breaker.agents.combined_reviewer import pdf_to_image
+
+    try:
+        rendered = _render_sample(optimized)
+        if rendered.pdf_bytes is not None:
+            pdf_to_image(rendered.pdf_bytes)
+        return rendered
+    finally:
+        # Held until every warm-up task has a worker of its own
+        try:
+            barrier.wait(timeout=_BARRIER_TIMEOUT)
+        except threading.BrokenBarrierError:
+            logger.debug("Not every CPU worker took a warm-up task")
+
+
+async def _warm_workers(optimized: OptimizedResume) -> list[OptimizedResume]:
+    """_warm_worker() once on each of the CPU executor's workers."""
+    from hr_breaker.executor import run_cpu
+
+    settings = get_settings()
+    workers = max(1, settings.cpu_workers)
+    manager = None
+    if settings.cpu_executor == "process":
+        import multiprocessing
+
+        # Worker processes share the barrier through a manager process
+        manager = await asyncio.to_thread(multiprocessing.get_context("spawn").Manager)
+        barrier = manager.Barrier(workers)
+    else:
+        barrier = threading.Barrier(workers)
+    try:
+        return await asyncio.gather(
+            *(run_cpu(_warm_worker, optimized, barrier) for _ in range(workers))
+        )
+    finally:
+        if manager is not None:
+            manager.shutdown()
+
+
+@contextmanager
+def _step(steps: list[WarmupStep], name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        logger.warning(f"Warm-up step {name} failed: {e}")
+        error = f"{type(e).__name__}: {next(iter(str(e).splitlines()), '')}"
+    steps.append(WarmupStep(name, time.perf_counter() - start, error))
+
+
+async def warmup() -> list[WarmupStep]:
+    """Render a sample resume, run the local filters and build every agent."""
+    from hr_breaker.agents.ai_generated_detector import get_ai_generated_agent
+    from hr_breaker.agents.combined_reviewer import get_combined_reviewer_agent
+    from hr_breaker.agents.hallucination_detector import get_hallucination_agent
+    from hr_breaker.agents.job_parser import get_job_parser_agent
+    from hr_breaker.agents.name_extractor import get_name_extractor_agent
+    from hr_breaker.agents.optimizer import get_optimizer_agent, get_refiner_agent
+    from hr_breaker.agents.section_optimizer import get_section_agent
+    from hr_breaker.filters import FilterRegistry
+    from hr_breaker.services.renderer import RenderError
+
+    steps: list[WarmupStep] = []
+    source = ResumeSource(content=SAMPLE_SOURCE, first_name="Jane", last_name="Doe")
+    optimized = _sample()
+
+    with _step(steps, "render"):
+        # WeasyPrint import, fontconfig, FontConfiguration, PyMuPDF, in
+        # every CPU worker
+        rendered = (await _warm_workers(optimized))[0]
+        if rendered.pdf_bytes is None:
+            raise RenderError("sample resume did not render")
+        optimized = rendered
+
+    for filter_cls in sorted(FilterRegistry.all(), key=lambda f: f.priority):
+        if filter_cls.local:
+            with _step(steps, f"filter:{filter_cls.name}"):
+                await filter_cls().evaluate(optimized, SAMPLE_JOB, source)
+
+    with _step(steps, "agents"):
+        # Cached (agents.factory): the first real run reuses these
+        get_name_extractor_agent()
+        get_job_parser_agent()
+        get_optimizer_agent()
+        get_refiner_agent()
+        get_section_agent()
+        get_combined_reviewer_agent()
+        get_hallucination_agent()
+        get_ai_generated_agent()
+
+    logger.info(
+        f"Warm-up done in {sum(s.seconds for s in steps):.2f}s: "
+        + ", ".join(
+            f"{s.name} {s.seconds:.2f}s" + ("" if s.ok else " (failed)") for s in steps
+        )
+    )
+    return steps
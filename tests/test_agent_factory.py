@@ -0,0 +1,70 @@
+"""Tests for agent caching (agents.factory)."""
+
+import json
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import FunctionModel
+from pydantic_ai.models.test import TestModel
+
+from hr_breaker.agents.factory import clear_agent_cache
+from hr_breaker.agents.hallucination_detector import get_hallucination_agent
+from hr_breaker.agents.optimizer import get_optimizer_agent, optimize_resume
+from hr_breaker.config import get_settings
+from hr_breaker.models import IterationContext, JobPosting, ResumeSource
+from hr_breaker.provider import override_models
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_agent_cache()
+    yield
+    clear_agent_cache()
+
+
+def test_agent_built_once_per_variant(monkeypatch):
+    def test_model(name):
+        return TestModel()
+
+    with override_models(test_model):
+        agent = get_hallucination_agent()
+        assert get_hallucination_agent() is agent
+        assert get_hallucination_agent(no_shame=True) is not agent
+
+        monkeypatch.setattr(get_settings(), "openai_model", "other-model")
+        rebuilt = get_hallucination_agent()
+        assert rebuilt is not agent
+        assert get_hallucination_agent() is rebuilt
+
+    # A different model override is a different agent
+    with override_models(lambda name: TestModel()):
+        assert get_hallucination_agent() is not rebuilt
+
+
+@pytest.mark.asyncio
+async def test_optimizer_tools_read_job_from_deps():
+    """One cached optimizer agent serves runs for different jobs."""
+    missing: list[list[str]] = []
+
+    def respond(messages, info):
+        returns = [
+            p for m in messages for p in m.parts if isinstance(p, ToolReturnPart)
+        ]
+        if not returns:
+            call = ToolCallPart("check_keywords_tool", {"html": "<p>Python</p>"})
+            return ModelResponse(parts=[call])
+        missing.append(returns[-1].content["missing_keywords"])
+        return ModelResponse(
+            parts=[TextPart(json.dumps({"html": "<p>Python</p>", "changes": []}))]
+        )
+
+    source = ResumeSource(content="Python developer")
+    context = IterationContext(iteration=0, original_resume=source.content)
+    with override_models(lambda name: FunctionModel(respond)):
+        for keyword in ("kubernetes", "terraform"):
+            job = JobPosting(title="Engineer", company="Acme", keywords=["python", keyword])
+            await optimize_resume(source, job, context)
+        assert get_optimizer_agent() is get_optimizer_agent()
+
+    assert "kubernetes" in missing[0] and "terraform" not in missing[0]
+    assert "terraform" in missing[1] and "kubernetes" not in missing[1]
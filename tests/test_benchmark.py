@@ -0,0 +1,100 @@
+"""Tests for the offline benchmark (fake LLM, runner, comparison)."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hr_breaker.benchmark import (
+    FakeLLM,
+    compare,
+    load_corpus,
+    resume_to_html,
+    run_benchmark,
+)
+from hr_breaker.filters.data_validator import validate_html
+from hr_breaker.models import RenderResult
+
+CORPUS = Path(__file__).parents[1] / "benchmarks" / "corpus"
+
+
+def _fake_renderer():
+    renderer = MagicMock()
+    renderer.render.return_value = RenderResult(pdf_bytes=b"%PDF", page_count=1)
+    return renderer
+
+
+def test_corpus_loads_and_canned_html_is_valid():
+    cases = load_corpus(CORPUS)
+    assert len(cases) >= 3
+    for case in cases:
+        valid, issues = validate_html(resume_to_html(case.resume))
+        assert valid, issues
+
+
+@pytest.mark.asyncio
+async def test_fake_llm_serves_canned_outputs():
+    from hr_breaker.agents import extract_name, parse_job_posting
+    from hr_breaker.benchmark import _current_case
+    from hr_breaker.provider import override_models
+
+    case = load_corpus(CORPUS)[0]
+    fake = FakeLLM()
+    _current_case.set(case)
+    with override_models(fake.model, fake.embed):
+        job = await parse_job_posting(case.job_text)
+        name = await extract_name(case.resume)
+        vectors = await fake.embed(["python redis", "python redis"])
+
+    assert job.title == case.job_posting["title"]
+    assert job.keywords == case.job_posting["keywords"]
+    assert name == (case.first_name, case.last_name)
+    assert vectors[0] == vectors[1]
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_reports_stages(tmp_path):
+    from hr_breaker import orchestration
+
+    def fake_render(optimized):
+        return optimized.model_copy(
+            update={"pdf_text": optimized.html, "pdf_bytes": b"%PDF"}
+        )
+
+    cases = load_corpus(CORPUS)[:2]
+    with (
+        patch.object(orchestration, "_render_and_extract", fake_render),
+        patch("hr_breaker.agents.optimizer.HTMLRenderer", _fake_renderer),
+        patch("hr_breaker.agents.optimizer.pdf_to_image", return_value=(b"png", 1)),
+        patch("hr_breaker.agents.combined_reviewer.get_renderer", _fake_renderer),
+        patch("hr_breaker.agents.combined_reviewer.pdf_to_image", return_value=(b"png", 1)),
+    ):
+        results = await run_benchmark(
+            cases, FakeLLM(), concurrency=2, max_iterations=1, trace_memory=False
+        )
+
+    assert [r["case"] for r in results["runs"]] == [c.name for c in cases]
+    assert all(r["iterations"] == 1 for r in results["runs"])
+    stages = {row["stage"] for row in results["stages"]}
+    assert {"run", "parse_job", "optimizer", "llm_request"} <= stages
+    assert "tool:check_keywords_tool" in stages
+    assert any(s.startswith("filter:") for s in stages)
+    assert results["runs_per_minute"] > 0
+
+
+def test_compare_flags_regressions():
+    baseline = {
+        "total_seconds": 10.0,
+        "runs_per_minute": 6.0,
+        "stages": [{"stage": "render", "p50": 1.0, "p95": 2.0}],
+    }
+    current = {
+        "total_seconds": 10.5,
+        "runs_per_minute": 4.0,
+        "stages": [{"stage": "render", "p50": 1.5, "p95": 2.0}],
+    }
+    rows = {r["metric"]: r for r in compare(baseline, current, threshold=0.1)}
+    assert not rows["total_seconds"]["regressed"]
+    assert rows["runs_per_minute"]["regressed"]
+    assert rows["render p50"]["regressed"]
+    assert not rows["render p95"]["regressed"]
@@ -0,0 +1,100 @@
+"""Tests for cassette record/replay of HTTP traffic."""
+
+import gzip
+import json
+import time
+
+import httpx
+import pytest
+from pydantic import BaseModel
+from pydantic_ai import Agent
+
+from hr_breaker.cassette import (
+    RECORD,
+    REPLAY,
+    http_transport,
+    llm_http_client,
+    use_cassette,
+)
+from hr_breaker.mock_openai import MockConfig, start_mock_server
+from hr_breaker.openai_rotating_model import RotatingOpenAIModel
+
+
+class Verdict(BaseModel):
+    looks_good: bool
+    score: float
+
+
+@pytest.fixture
+def upstream():
+    server = start_mock_server(
+        MockConfig(
+            latency=0.2,
+            exhausted_keys={"k1"},
+            outputs={"Verdict": {"looks_good": True, "score": 0.7}},
+        )
+    )
+    yield server, f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+async def _review(base_url: str) -> Verdict:
+    model = RotatingOpenAIModel("gpt-4o", api_keys=["k1", "k2"], base_url=base_url)
+    result = await Agent(model, output_type=Verdict).run("Review this")
+    return result.output
+
+
+@pytest.mark.asyncio
+async def test_replay_serves_recorded_llm_traffic_offline(upstream, tmp_path):
+    server, base_url = upstream
+    path = tmp_path / "session.json.gz"
+    with use_cassette(path, RECORD):
+        recorded = await _review(base_url)
+        with httpx.Client(transport=http_transport()) as client:
+            models = client.get(f"{base_url}/models").json()
+    server.shutdown()
+
+    with gzip.open(path, "rt") as f:
+        entries = json.load(f)["entries"]
+    # 429 on the exhausted key, 200 on the next one, then the scraper-style GET
+    assert [e["status"] for e in entries] == [429, 200, 200]
+
+    with use_cassette(path, REPLAY, latency="zero"):
+        start = time.perf_counter()
+        assert await _review(base_url) == recorded
+        assert time.perf_counter() - start < 0.2
+        with httpx.Client(transport=http_transport()) as client:
+            assert client.get(f"{base_url}/models").json() == models
+
+
+@pytest.mark.asyncio
+async def test_replay_with_original_latency(upstream, tmp_path):
+    _, base_url = upstream
+    path = tmp_path / "session.json.gz"
+    with use_cassette(path, RECORD):
+        await _review(base_url)
+
+    with use_cassette(path, REPLAY, latency="original"):
+        start = time.perf_counter()
+        await _review(base_url)
+        assert time.perf_counter() - start >= 0.35
+
+
+def test_replay_miss_is_a_404(tmp_path):
+    path = tmp_path / "empty.json.gz"
+    with use_cassette(path, RECORD):
+        pass
+
+    with use_cassette(path, REPLAY):
+        with httpx.Client(transport=http_transport()) as client:
+            response = client.get("http://example.invalid/job")
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "cassette_miss"
+
+
+def test_llm_client_is_shared_and_closed_with_the_cassette(tmp_path):
+    with use_cassette(tmp_path / "session.json.gz", RECORD):
+        client = llm_http_client()
+        assert llm_http_client() is client
+    assert client.is_closed
@@ -253,6 +253,6 @@ class TestPdfToImage:
         mock_doc.__len__ = MagicMock(return_value=1)
         mock_doc.__getitem__ = MagicMock(return_value=mock_page)
 
-        with patch("hr_breaker.agents.combined_reviewer.fitz.open", return_value=mock_doc):
+        with patch("fitz.open", return_value=mock_doc):
             pdf_to_image(b"fake pdf bytes")
             mock_doc.close.assert_called_once()
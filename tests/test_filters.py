@@ -74,6 +74,39 @@ async def test_keyword_matcher_no_pdf_text(source_resume, job_posting):
     assert "No PDF text available" in result.issues[0]
 
 
+@pytest.mark.asyncio
+async def test_keyword_matcher_in_process_executor(source_resume, job_posting, monkeypatch):
+    from hr_breaker.config import get_settings
+    from hr_breaker.executor import shutdown_cpu_executor
+
+    optimized = OptimizedResume(
+        html="<div>x</div>",
+        source_checksum=source_resume.checksum,
+        pdf_text="Python Django PostgreSQL REST API",
+    )
+    in_thread = await KeywordMatcher().evaluate(optimized, job_posting, source_resume)
+
+    shutdown_cpu_executor()
+    monkeypatch.setattr(get_settings(), "cpu_executor", "process")
+    monkeypatch.setattr(get_settings(), "cpu_workers", 1)
+    try:
+        in_process = await KeywordMatcher().evaluate(optimized, job_posting, source_resume)
+    finally:
+        shutdown_cpu_executor()
+
+    assert in_process == in_thread
+
+
+@pytest.mark.parametrize("base", ["BaseFilter", "CPUFilter"])
+def test_filter_without_evaluate_is_abstract(base):
+    """A filter implementing neither evaluate() nor evaluate_sync() can't be built."""
+    from hr_breaker import filters
+
+    Incomplete = type("Incomplete", (getattr(filters, base),), {})
+    with pytest.raises(TypeError, match="abstract"):
+        Incomplete()
+
+
 def test_filter_registry():
     """Test that filters are registered."""
     names = FilterRegistry.names()
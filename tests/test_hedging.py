@@ -0,0 +1,134 @@
+"""Tests for hedged LLM requests across API keys."""
+
+import asyncio
+import time
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from hr_breaker import metrics
+from hr_breaker import openai_rotating_model as rotating
+from hr_breaker.config import get_settings
+from hr_breaker.openai_rotating_model import RotatingOpenAIModel, hedgeable
+from hr_breaker.tracing import span
+
+
+@pytest.fixture
+def keyed_model(monkeypatch):
+    """RotatingOpenAIModel whose keys answer after the given delays."""
+    monkeypatch.setattr(get_settings(), "hedge_requests", True)
+    monkeypatch.setattr(get_settings(), "hedge_budget", 1.0)
+    monkeypatch.setattr(rotating, "_latencies", rotating._LatencyWindow())
+    monkeypatch.setattr(rotating, "_hedge_budget", rotating._HedgeBudget())
+    monkeypatch.setattr(rotating, "_key_failed_at", {})
+    for _ in range(rotating._HEDGE_MIN_SAMPLES):
+        rotating._latencies.add(("gpt-4o", "parse_job"), 0.05)
+
+    calls = []
+    cancelled = []
+
+    def make(delays: dict[str, float]) -> Agent:
+        model = RotatingOpenAIModel("gpt-4o", api_keys=list(delays), base_url=None)
+
+        def make_model(key):
+            async def respond(messages, info):
+                calls.append(key)
+                try:
+                    await asyncio.sleep(delays[key])
+                except asyncio.CancelledError:
+                    cancelled.append(key)
+                    raise
+                return ModelResponse(parts=[TextPart(key)])
+
+            return FunctionModel(respond)
+
+        monkeypatch.setattr(model, "_make_model", make_model)
+        return Agent(model)
+
+    make.calls = calls
+    make.cancelled = cancelled
+    return make
+
+
+@pytest.mark.asyncio
+async def test_slow_request_hedged_on_another_key(keyed_model):
+    agent = keyed_model({"k1": 2.0, "k2": 0.01})
+    won_before = metrics.LLM_HEDGES.value(model="gpt-4o", outcome="won")
+
+    start = time.perf_counter()
+    with span("parse_job"), hedgeable():
+        result = await agent.run("Parse this")
+
+    assert result.output == "k2"
+    assert time.perf_counter() - start < 0.5
+    assert keyed_model.calls == ["k1", "k2"]
+    assert keyed_model.cancelled == ["k1"]
+    assert metrics.LLM_HEDGES.value(model="gpt-4o", outcome="won") == won_before + 1
+
+
+@pytest.mark.asyncio
+async def test_fast_request_not_hedged(keyed_model):
+    agent = keyed_model({"k1": 0.01, "k2": 0.01})
+    with span("parse_job"), hedgeable():
+        result = await agent.run("Parse this")
+
+    assert result.output == "k1"
+    assert keyed_model.calls == ["k1"]
+
+
+@pytest.mark.asyncio
+async def test_only_hedgeable_requests_hedged(keyed_model):
+    agent = keyed_model({"k1": 0.2, "k2": 0.01})
+    with span("parse_job"):
+        result = await agent.run("Parse this")
+
+    assert result.output == "k1"
+    assert keyed_model.calls == ["k1"]
+
+
+@pytest.mark.asyncio
+async def test_hedges_capped_by_budget(keyed_model, monkeypatch):
+    monkeypatch.setattr(get_settings(), "hedge_budget", 0.5)
+    agent = keyed_model({"k1": 0.2, "k2": 0.2})
+    skipped_before = metrics.LLM_HEDGES.value(model="gpt-4o", outcome="skipped")
+
+    with span("parse_job"), hedgeable():
+        # Keys alternate per request: both runs start slow
+        await asyncio.gather(agent.run("one"), agent.run("two"))
+
+    assert len(keyed_model.calls) == 3  # one hedge for two requests
+    assert (
+        metrics.LLM_HEDGES.value(model="gpt-4o", outcome="skipped") == skipped_before + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_hedge_needs_its_own_governor_slot(keyed_model, monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_max_concurrency", 1)
+    agent = keyed_model({"k1": 0.2, "k2": 0.01})
+    skipped_before = metrics.LLM_HEDGES.value(model="gpt-4o", outcome="skipped")
+
+    with span("parse_job"), hedgeable():
+        result = await agent.run("Parse this")
+
+    assert result.output == "k1"
+    assert keyed_model.calls == ["k1"]
+    assert (
+        metrics.LLM_HEDGES.value(model="gpt-4o", outcome="skipped") == skipped_before + 1
+    )
+    assert metrics.LLM_IN_FLIGHT.value(model="gpt-4o") == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_hedge_loser_usage_recorded(keyed_model):
+    from hr_breaker.usage import track_usage
+
+    agent = keyed_model({"k1": 2.0, "k2": 0.01})
+    with span("parse_job"), hedgeable(), track_usage() as usage:
+        result = await agent.run("Parse this")
+
+    assert keyed_model.cancelled == ["k1"]
+    assert usage.llm_calls == 2
+    assert usage.input_tokens == 2 * result.usage().input_tokens
@@ -0,0 +1,146 @@
+"""Tests for HTML patches (utils.html_patch) and patch-based refinement."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import FunctionModel
+
+from hr_breaker.agents.factory import clear_agent_cache
+from hr_breaker.agents.optimizer import optimize_resume
+from hr_breaker.config import get_settings
+from hr_breaker.models import IterationContext, JobPosting, RenderResult, ResumeSource
+from hr_breaker.provider import override_models
+from hr_breaker.utils import PatchError, PatchOp, annotate_ids, apply_patch, strip_ids
+
+RESUME = """<header class="header"><h1 class="name">Jane Doe</h1></header>
+<section class="section"><h2 class="section-title">Experience</h2>
+<ul class="bullets"><li>Built Django APIs</li><li>Ran on-call</li></ul></section>"""
+
+
+def test_annotate_ids_in_document_order():
+    annotated = annotate_ids(RESUME)
+    assert 'data-id="header-1"' in annotated
+    assert 'data-id="li-6"' in annotated and 'data-id="li-7"' in annotated
+    assert strip_ids(annotated) == RESUME
+    assert annotate_ids(annotated) == annotated
+
+
+def test_apply_patch_ops_refer_to_original_ids():
+    annotated = annotate_ids(RESUME)
+    html = apply_patch(
+        annotated,
+        [
+            PatchOp(op="replace", id="li-6", html="<li>Built Django and Kubernetes APIs</li>"),
+            PatchOp(op="insert_after", id="li-6", html="<li>Mentored 3 engineers</li>"),
+            PatchOp(op="delete", id="li-7"),
+        ],
+    )
+    assert "data-id" not in html
+    assert (
+        '<ul class="bullets"><li>Built Django and Kubernetes APIs</li>'
+        "<li>Mentored 3 engineers</li></ul>"
+    ) in html
+    assert apply_patch(annotated, []) == RESUME
+
+
+@pytest.mark.parametrize(
+    "ops, message",
+    [
+        ([PatchOp(op="delete", id="li-99")], "li-99"),
+        (
+            [PatchOp(op="delete", id="li-6"), PatchOp(op="replace", id="li-6", html="<li/>")],
+            "more than once",
+        ),
+        (
+            [PatchOp(op="delete", id="section-3"), PatchOp(op="delete", id="li-6")],
+            "inside section-3",
+        ),
+        (
+            [
+                PatchOp(op="insert_after", id="li-6", html="<li>Mentored</li>"),
+                PatchOp(op="replace", id="ul-5", html="<ul><li>New</li></ul>"),
+            ],
+            "insert_after li-6: element is inside ul-5",
+        ),
+        (
+            [
+                PatchOp(op="replace", id="li-7", html="<li>Led on-call</li>"),
+                PatchOp(op="delete", id="section-3"),
+            ],
+            "inside section-3",
+        ),
+        ([PatchOp(op="replace", id="li-6")], "html is empty"),
+    ],
+)
+def test_apply_patch_rejects_bad_ops(ops, message):
+    with pytest.raises(PatchError, match=message):
+        apply_patch(annotate_ids(RESUME), ops)
+
+
+@pytest.fixture
+def refine_run(monkeypatch):
+    """Patch-mode settings, no WeasyPrint, fresh agents."""
+    monkeypatch.setattr(get_settings(), "refine_mode", "patch")
+    renderer = MagicMock()
+    renderer.render.return_value = RenderResult(pdf_bytes=b"%PDF", page_count=1)
+    monkeypatch.setattr("hr_breaker.agents.optimizer.HTMLRenderer", lambda: renderer)
+    clear_agent_cache()
+    yield
+    clear_agent_cache()
+
+
+def _context() -> IterationContext:
+    return IterationContext(
+        iteration=1, original_resume="Jane Doe, Django engineer", last_attempt=RESUME
+    )
+
+
+@pytest.mark.asyncio
+async def test_refinement_applies_patch_locally(refine_run):
+    prompts = []
+    patch = {
+        "ops": [{"op": "replace", "id": "li-7", "html": "<li>Ran Kubernetes on-call</li>"}],
+        "changes": ["Added Kubernetes"],
+    }
+
+    def respond(messages, info):
+        prompts.append(messages[0].parts[-1].content)
+        returns = [p for m in messages for p in m.parts if isinstance(p, ToolReturnPart)]
+        if not returns:
+            return ModelResponse(parts=[ToolCallPart("check_patch", {"ops": patch["ops"]})])
+        assert returns[-1].content["applies"] and returns[-1].content["fits_one_page"]
+        assert "kubernetes" not in returns[-1].content["keywords"]["missing_keywords"]
+        return ModelResponse(parts=[TextPart(json.dumps(patch))])
+
+    source = ResumeSource(content="Jane Doe, Django engineer")
+    job = JobPosting(title="Engineer", company="Acme", keywords=["django", "kubernetes"])
+    with override_models(lambda name: FunctionModel(respond)):
+        optimized = await optimize_resume(source, job, _context())
+
+    assert 'data-id="li-7"' in prompts[0]
+    assert "<li>Ran Kubernetes on-call</li>" in optimized.html
+    assert "<li>Built Django APIs</li>" in optimized.html
+    assert "data-id" not in optimized.html
+    assert optimized.changes == ["Added Kubernetes"]
+
+
+@pytest.mark.asyncio
+async def test_refinement_falls_back_to_full_rewrite(refine_run):
+    def respond(messages, info):
+        prompt = messages[0].parts[-1].content
+        if "- ops:" in prompt:
+            # Never applies: the refiner gives up after its retries
+            bad = {"ops": [{"op": "delete", "id": "li-99"}], "changes": []}
+            return ModelResponse(parts=[TextPart(json.dumps(bad))])
+        return ModelResponse(
+            parts=[TextPart(json.dumps({"html": RESUME, "changes": ["Rewrote"]}))]
+        )
+
+    source = ResumeSource(content="Jane Doe, Django engineer")
+    job = JobPosting(title="Engineer", company="Acme")
+    with override_models(lambda name: FunctionModel(respond)):
+        optimized = await optimize_resume(source, job, _context())
+
+    assert optimized.changes == ["Rewrote"]
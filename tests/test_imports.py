@@ -0,0 +1,77 @@
+"""Import-time budget: heavy dependencies must stay lazy."""
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = [
+    "sklearn",
+    "pydantic_ai",
+    "openai",
+    "fitz",
+    "pymupdf",
+    "bs4",
+    "playwright",
+    "weasyprint",
+]
+
+# Cumulative import time of hr_breaker.cli; ~0.3s locally, ~4s before the
+# package __init__s went lazy
+CLI_BUDGET_SECONDS = 1.5
+
+
+def _importtime(statement: str) -> dict[str, int]:
+    """Cumulative import time (us) per module imported by `statement`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import hr_breaker.cli",
+        "import hr_breaker.filters, hr_breaker.services, hr_breaker.agents",
+    ],
+)
+def test_heavy_dependencies_not_imported(statement):
+    times = _importtime(statement)
+    loaded = sorted({m.split(".")[0] for m in times} & set(HEAVY))
+    assert loaded == []
+
+
+def test_cli_import_budget():
+    times = _importtime("import hr_breaker.cli")
+    assert times["hr_breaker.cli"] / 1e6 < CLI_BUDGET_SECONDS
+
+
+def test_lazy_exports_resolve():
+    import hr_breaker.agents
+    import hr_breaker.filters
+    import hr_breaker.services
+
+    for package in (hr_breaker.agents, hr_breaker.filters, hr_breaker.services):
+        for name in package.__all__:
+            assert getattr(package, name) is not None
+    with pytest.raises(AttributeError):
+        hr_breaker.services.missing
+
+
+def test_registry_loads_builtin_filters():
+    from hr_breaker.filters import FilterRegistry
+
+    assert {"KeywordMatcher", "LLMChecker", "ContentLengthChecker"} <= set(
+        FilterRegistry.names()
+    )
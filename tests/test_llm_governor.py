@@ -0,0 +1,138 @@
+"""Tests for the process-wide LLM concurrency governor."""
+
+import asyncio
+import threading
+
+import pytest
+
+from hr_breaker import metrics
+from hr_breaker.config import get_settings
+from hr_breaker.llm_governor import (
+    BACKGROUND,
+    BATCH,
+    INTERACTIVE,
+    LLMGovernor,
+    llm_priority,
+)
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_max_concurrency", 1)
+    return LLMGovernor()
+
+
+async def _served_order(governor, requests) -> list[str]:
+    """Queue (name, priority, session) requests behind a held slot; serve order."""
+    order = []
+    release = asyncio.Event()
+
+    async def hold():
+        async with governor.slot("gpt-4o"):
+            await release.wait()
+
+    async def request(name, priority, session):
+        with llm_priority(priority, session=session):
+            async with governor.slot("gpt-4o"):
+                order.append(name)
+
+    holder = asyncio.ensure_future(hold())
+    await asyncio.sleep(0)
+    tasks = []
+    for r in requests:
+        tasks.append(asyncio.ensure_future(request(*r)))
+        await asyncio.sleep(0)  # Enqueue in this order
+    assert governor.depth("gpt-4o") == len(requests)
+    release.set()
+    await asyncio.gather(holder, *tasks)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_concurrency_bounded_per_model(governor, monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_max_concurrency", 2)
+    active = {"gpt-4o": 0, "gpt-4o-mini": 0}
+    peak = dict(active)
+
+    async def request(model):
+        async with governor.slot(model):
+            active[model] += 1
+            peak[model] = max(peak[model], active[model])
+            await asyncio.sleep(0.01)
+            active[model] -= 1
+
+    await asyncio.gather(*(request(m) for m in active for _ in range(5)))
+
+    assert peak == {"gpt-4o": 2, "gpt-4o-mini": 2}
+    assert governor.depth("gpt-4o") == 0
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_served_first(governor):
+    order = await _served_order(
+        governor,
+        [
+            ("background", BACKGROUND, "a"),
+            ("batch", BATCH, "b"),
+            ("interactive", INTERACTIVE, "c"),
+        ],
+    )
+    assert order == ["interactive", "batch", "background"]
+
+
+@pytest.mark.asyncio
+async def test_sessions_served_round_robin(governor):
+    order = await _served_order(
+        governor,
+        [("a1", BATCH, "a"), ("a2", BATCH, "a"), ("a3", BATCH, "a"), ("b1", BATCH, "b")],
+    )
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue(governor):
+    release = asyncio.Event()
+
+    async def hold():
+        async with governor.slot("gpt-4o"):
+            await release.wait()
+
+    async def request():
+        async with governor.slot("gpt-4o"):
+            pass
+
+    holder = asyncio.ensure_future(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(request())
+    await asyncio.sleep(0)
+    assert metrics.LLM_QUEUE_DEPTH.value(model="gpt-4o", priority=INTERACTIVE) == 1
+    waiter.cancel()
+    await asyncio.sleep(0)
+
+    assert governor.depth("gpt-4o") == 0
+    assert metrics.LLM_QUEUE_DEPTH.value(model="gpt-4o", priority=INTERACTIVE) == 0
+    release.set()
+    await holder
+    await asyncio.wait_for(request(), 1)  # The slot is free again
+
+
+@pytest.mark.asyncio
+async def test_slot_handed_to_other_event_loop(governor):
+    acquired = []
+
+    def other_loop():
+        async def run():
+            async with governor.slot("gpt-4o"):
+                acquired.append("thread")
+
+        asyncio.run(run())
+
+    async with governor.slot("gpt-4o"):
+        thread = threading.Thread(target=other_loop)
+        thread.start()
+        while not governor.depth("gpt-4o"):
+            await asyncio.sleep(0.01)
+        assert not acquired
+    await asyncio.to_thread(thread.join, 5)
+
+    assert acquired == ["thread"]
@@ -0,0 +1,80 @@
+"""Tests for metrics derived from spans and their exposition."""
+
+import json
+import urllib.request
+
+import pytest
+
+from hr_breaker import metrics
+from hr_breaker.tracing import add_span_listener, remove_span_listener, span
+
+
+@pytest.fixture
+def observed():
+    add_span_listener(metrics.observe_span)
+    yield
+    remove_span_listener(metrics.observe_span)
+
+
+def test_counter_and_histogram_prometheus_text():
+    counter = metrics.Counter("t_requests_total", "Requests")
+    counter.inc(model="m", key=0)
+    counter.inc(2, model="m", key=0)
+    hist = metrics.Histogram("t_seconds", "Latency", (0.1, 1.0))
+    hist.observe(0.05, stage="render")
+    hist.observe(0.5, stage="render")
+    hist.observe(5.0, stage="render")
+
+    assert counter.value(model="m", key=0) == 3
+    text = counter.render() + "\n" + hist.render()
+    assert "# TYPE t_requests_total counter" in text
+    assert 't_requests_total{key="0",model="m"} 3' in text
+    assert 't_seconds_bucket{stage="render",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="render",le="1"} 2' in text
+    assert 't_seconds_bucket{stage="render",le="+Inf"} 3' in text
+    assert 't_seconds_count{stage="render"} 3' in text
+
+
+def test_gauge_track():
+    gauge = metrics.Gauge("t_in_flight", "In flight")
+    with gauge.track():
+        assert gauge.value() == 1
+    assert gauge.value() == 0
+
+
+def test_spans_update_metrics(observed):
+    runs = metrics.RUNS.value(outcome="passed")
+    passes = metrics.FILTER_RESULTS.value(filter="KeywordMatcher", result="pass")
+    tokens = metrics.LLM_TOKENS.value(model="gpt-x", key="1", type="input")
+
+    with span("run") as run:
+        with span("filter:KeywordMatcher", passed=True):
+            pass
+        with span("llm_request", model="gpt-x", key_index=1, input_tokens=120):
+            pass
+        run.set(outcome="passed", iterations=2)
+
+    assert metrics.RUNS.value(outcome="passed") == runs + 1
+    assert (
+        metrics.FILTER_RESULTS.value(filter="KeywordMatcher", result="pass")
+        == passes + 1
+    )
+    assert metrics.LLM_TOKENS.value(model="gpt-x", key="1", type="input") == tokens + 120
+    assert 'stage="filter:KeywordMatcher"' in metrics.STAGE_SECONDS.render()
+
+
+def test_server_exposes_prometheus_and_json():
+    metrics.record_cache("resume", hit=True)
+    server = metrics.start_server(0, host="127.0.0.1")
+    try:
+        base = f"http://127.0.0.1:{server.server_port}"
+        text = urllib.request.urlopen(base + "/metrics").read().decode()
+        assert "# TYPE hr_breaker_cache_lookups_total counter" in text
+        data = json.loads(urllib.request.urlopen(base + "/metrics.json").read())
+        assert data["hr_breaker_stage_seconds"]["type"] == "histogram"
+        assert any(
+            s["labels"] == {"cache": "resume", "result": "hit"}
+            for s in data["hr_breaker_cache_lookups_total"]["samples"]
+        )
+    finally:
+        server.shutdown()
@@ -0,0 +1,157 @@
+"""Tests for the OpenAI-compatible mock server."""
+
+from pathlib import Path
+
+import httpx
+import pytest
+from pydantic import BaseModel
+from pydantic_ai import Agent, BinaryContent, PromptedOutput
+
+from hr_breaker.benchmark import load_corpus
+from hr_breaker.config import get_settings
+from hr_breaker.mock_openai import MockConfig, start_mock_server
+from hr_breaker.models import JobPosting, OptimizedResume, ResumeSource
+from hr_breaker.openai_rotating_model import RotatingOpenAIModel
+
+CORPUS = Path(__file__).parents[1] / "benchmarks" / "corpus"
+
+
+class Verdict(BaseModel):
+    looks_good: bool
+    score: float
+
+
+@pytest.fixture
+def mock_server():
+    servers = []
+
+    def start(**config):
+        server = start_mock_server(MockConfig(**config))
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_port}/v1"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_rotation_skips_exhausted_key(mock_server):
+    server, base_url = mock_server(
+        exhausted_keys={"k1"}, outputs={"Verdict": {"looks_good": True, "score": 0.7}}
+    )
+    model = RotatingOpenAIModel("gpt-4o", api_keys=["k1", "k2"], base_url=base_url)
+    agent = Agent(model, output_type=Verdict)
+
+    result = await agent.run("Review this")
+
+    assert result.output == Verdict(looks_good=True, score=0.7)
+    stats = server.stats.snapshot()
+    assert stats["by_key"]["k1"] == {"429": 1}
+    assert stats["by_key"]["k2"] == {"200": 1}
+
+
+@pytest.mark.asyncio
+async def test_prompted_output_with_image_and_corpus_case(mock_server):
+    case = load_corpus(CORPUS)[0]
+    server, base_url = mock_server(cases=[case])
+    model = RotatingOpenAIModel("gpt-4o", api_keys=["k1"], base_url=base_url)
+    agent = Agent(model, output_type=PromptedOutput(JobPosting))
+
+    result = await agent.run(
+        [case.job_text, BinaryContent(data=b"\x89PNG fake", media_type="image/png")]
+    )
+
+    assert result.output.title == case.job_posting["title"]
+    assert result.usage().input_tokens > 0
+    assert server.stats.snapshot()["images"] == 1
+
+
+@pytest.mark.asyncio
+async def test_vector_matcher_uses_mock_embeddings(mock_server, monkeypatch):
+    from hr_breaker.filters.vector_similarity_matcher import VectorSimilarityMatcher
+
+    server, base_url = mock_server()
+    monkeypatch.setattr(get_settings(), "openai_base_url", base_url)
+    monkeypatch.setenv("OPENAI_API_KEYS", "k1")
+    source = ResumeSource(content="Python engineer")
+    optimized = OptimizedResume(
+        html="<p>x</p>", pdf_text="Python Redis engineer", source_checksum=source.checksum
+    )
+    job = JobPosting(title="Engineer", company="Acme", description="Python Redis")
+
+    result = await VectorSimilarityMatcher().evaluate(optimized, job, source)
+
+    assert not result.issues
+    assert 0.5 < result.score <= 1.0
+    assert server.stats.snapshot()["requests"] == {"embeddings": 2}
+
+
+def test_models_and_rpm_limit(mock_server):
+    server, base_url = mock_server(rpm_per_key=1, retry_after=0.5)
+    models = httpx.get(f"{base_url}/models").json()
+    assert "gpt-4o" in [m["id"] for m in models["data"]]
+
+    headers = {"Authorization": "Bearer k1"}
+    body = {"input": "hello", "model": "text-embedding-3-small"}
+    assert httpx.post(f"{base_url}/embeddings", json=body, headers=headers).status_code == 200
+    limited = httpx.post(f"{base_url}/embeddings", json=body, headers=headers)
+    assert limited.status_code == 429
+    assert limited.json()["error"]["code"] == "rate_limit_exceeded"
+    assert limited.headers["retry-after"] == "0.5"
+
+
+@pytest.mark.asyncio
+async def test_optimizer_prompt_prefix_is_cached_across_iterations(mock_server, monkeypatch):
+    from unittest.mock import MagicMock
+
+    from hr_breaker import metrics
+    from hr_breaker.agents.optimizer import optimize_resume
+    from hr_breaker.models import IterationContext, RenderResult
+    from hr_breaker.tracing import add_span_listener, remove_span_listener, span
+
+    case = load_corpus(CORPUS)[0]
+    server, base_url = mock_server(cases=[case])
+    monkeypatch.setattr(get_settings(), "openai_base_url", base_url)
+    monkeypatch.setenv("OPENAI_API_KEYS", "k1")
+    # Full rewrites: a patch refinement is a different agent (system prompt)
+    monkeypatch.setattr(get_settings(), "refine_mode", "full")
+    # The optimizer's tools render; no WeasyPrint needed here
+    renderer = MagicMock()
+    renderer.render.return_value = RenderResult(pdf_bytes=b"%PDF", page_count=1)
+    monkeypatch.setattr("hr_breaker.agents.optimizer.HTMLRenderer", lambda: renderer)
+    monkeypatch.setattr(
+        "hr_breaker.agents.optimizer.pdf_to_image", lambda pdf: (b"png", 1)
+    )
+    source = ResumeSource(content=case.resume)
+    job = JobPosting(**case.job_posting)
+
+    requests = []
+
+    def collect(s):
+        if s.name == "llm_request":
+            requests.append(s.attributes)
+
+    add_span_listener(collect)
+    add_span_listener(metrics.observe_span)
+    try:
+        first = IterationContext(iteration=0, original_resume=source.content)
+        with span("optimizer", iteration=0):
+            optimized = await optimize_resume(source, job, first)
+        second = IterationContext(
+            iteration=1, original_resume=source.content, last_attempt=optimized.html
+        )
+        with span("optimizer", iteration=1):
+            await optimize_resume(source, job, second)
+    finally:
+        remove_span_listener(collect)
+        remove_span_listener(metrics.observe_span)
+
+    first_call = next(r for r in requests if r["iteration"] == 0)
+    second_call = next(r for r in requests if r["iteration"] == 1)
+    assert second_call["stage"] == "optimizer"
+    # Iteration 1 only appends to iteration 0's prompt: all of it is a cache hit
+    assert second_call["cache_read_tokens"] >= first_call["input_tokens"] - 128
+    assert server.stats.snapshot()["cached_tokens"] > 0
+    assert metrics.LLM_CACHED_INPUT_RATIO.snapshot()
@@ -0,0 +1,142 @@
+"""Tests for the optimizer's tools: per-run memoization, concurrent turns."""
+
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import FunctionModel
+
+from hr_breaker import metrics
+from hr_breaker.agents.factory import clear_agent_cache
+from hr_breaker.agents.optimizer import ToolMemo, html_key, optimize_resume
+from hr_breaker.config import get_settings
+from hr_breaker.executor import shutdown_cpu_executor
+from hr_breaker.models import IterationContext, JobPosting, RenderResult, ResumeSource
+from hr_breaker.provider import override_models
+from hr_breaker.tracing import add_span_listener, remove_span_listener, span
+
+HTML = """<header class="header"><h1 class="name">Jane Doe</h1></header>
+<section class="section"><p>Python and Django</p></section>"""
+
+
+@pytest.fixture
+def renderer(monkeypatch):
+    renderer = MagicMock()
+    renderer.render.return_value = RenderResult(pdf_bytes=b"%PDF", page_count=1)
+    monkeypatch.setattr("hr_breaker.agents.optimizer.HTMLRenderer", lambda: renderer)
+    monkeypatch.setattr(
+        "hr_breaker.agents.optimizer.pdf_to_image", lambda pdf: (b"png", 1)
+    )
+    clear_agent_cache()
+    yield renderer
+    clear_agent_cache()
+
+
+def test_html_key_ignores_whitespace():
+    assert html_key("<p>a  b</p>\n") == html_key(" <p>a b</p>")
+    assert html_key("<p>a b</p>") != html_key("<p>a c</p>")
+
+
+@pytest.mark.asyncio
+async def test_tool_memo_counts_calls_and_hits():
+    memo = ToolMemo()
+    calls = []
+    hits_before = metrics.CACHE_LOOKUPS.value(cache="tool:check", result="hit")
+
+    async def check(html):
+        calls.append(html)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    # The first two are identical and concurrent: one computation
+    results = await asyncio.gather(
+        *(memo.call("check", h, lambda h=h: check(h)) for h in ("<p>x</p>", "<p>x</p>\n"))
+    )
+    results.append(await memo.call("check", "<p>y</p>", lambda: check("<p>y</p>")))
+
+    assert calls == ["<p>x</p>", "<p>y</p>"]
+    assert results == [1, 1, 2]
+    assert memo.calls["check"] == 3 and memo.hits["check"] == 1
+    assert metrics.CACHE_LOOKUPS.value(cache="tool:check", result="hit") == hits_before + 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_tool_calls_render_once(renderer):
+    turns = [
+        [("check_content_length", HTML), ("preview_resume", HTML)],
+        [("check_content_length", HTML.replace("\n", "\n  ")), ("validate_structure", HTML)],
+        [("validate_structure", HTML), ("check_keywords_tool", HTML)],
+    ]
+    returns: list[ToolReturnPart] = []
+
+    def respond(messages, info):
+        returns[:] = [p for m in messages for p in m.parts if isinstance(p, ToolReturnPart)]
+        turn = sum(isinstance(m, ModelResponse) for m in messages)
+        if turn < len(turns):
+            return ModelResponse(
+                parts=[ToolCallPart(name, {"html": html}) for name, html in turns[turn]]
+            )
+        return ModelResponse(parts=[TextPart(json.dumps({"html": HTML, "changes": []}))])
+
+    source = ResumeSource(content="Jane Doe, Python and Django")
+    context = IterationContext(iteration=0, original_resume=source.content)
+    job = JobPosting(title="Engineer", company="Acme", keywords=["python"])
+    with override_models(lambda name: FunctionModel(respond)):
+        with span("optimizer") as s:
+            await optimize_resume(source, job, context)
+
+    assert len(returns) == 6
+    renderer.render.assert_called_once()
+    assert returns[2].content == returns[0].content  # page count from the memo
+    assert s.attributes["tool_calls"] == 6
+    assert s.attributes["tool_cache_hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_turn_runs_calls_concurrently(renderer, monkeypatch):
+    shutdown_cpu_executor()
+    monkeypatch.setattr(get_settings(), "cpu_workers", 4)
+
+    def slow_render(html):
+        time.sleep(0.2)
+        return RenderResult(pdf_bytes=b"%PDF", page_count=1)
+
+    renderer.render.side_effect = slow_render
+    other = HTML.replace("Django", "FastAPI")
+    turn = [
+        ToolCallPart("check_content_length", {"html": HTML}),
+        ToolCallPart("check_content_length", {"html": other}),
+        ToolCallPart("preview_resume", {"html": other}),
+    ]
+
+    def respond(messages, info):
+        if len(messages) == 1:
+            return ModelResponse(parts=turn)
+        return ModelResponse(parts=[TextPart(json.dumps({"html": HTML, "changes": []}))])
+
+    spans = []
+    add_span_listener(spans.append)
+    try:
+        source = ResumeSource(content="Jane Doe, Python and Django")
+        context = IterationContext(iteration=0, original_resume=source.content)
+        with override_models(lambda name: FunctionModel(respond)):
+            await optimize_resume(source, JobPosting(title="Dev", company="Acme"), context)
+    finally:
+        remove_span_listener(spans.append)
+        shutdown_cpu_executor()
+
+    (tool_turn,) = [s for s in spans if s.name == "tool_turn"]
+    assert tool_turn.attributes == {
+        "turn": 1,
+        "calls": 3,
+        "tools": "check_content_length,preview_resume",
+    }
+    # Two distinct renders in parallel, the preview shares the second one
+    assert renderer.render.call_count == 2
+    assert tool_turn.duration < 0.35
+    tool_spans = [s for s in spans if s.name.startswith("tool:")]
+    assert len(tool_spans) == 3
+    assert all(s.parent_id == tool_turn.span_id for s in tool_spans)
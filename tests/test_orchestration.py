@@ -1,5 +1,9 @@
 """Tests for orchestration module."""
 
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
 import pytest
 from unittest.mock import patch
 
@@ -12,6 +16,14 @@ from hr_breaker.models import (
 from hr_breaker.orchestration import run_filters
 
 
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    from hr_breaker.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "checkpoint_dir", tmp_path / "runs")
+    return tmp_path / "runs"
+
+
 @pytest.fixture
 def source_resume():
     return ResumeSource(content="Test resume content")
@@ -87,3 +99,578 @@ class TestRunFiltersParallel:
             good_results = [r for r in validation.results if r.filter_name == "GoodFilter"]
             assert len(good_results) == 1
             assert good_results[0].passed
+
+    @pytest.mark.asyncio
+    async def test_cpu_bound_filters_overlap_network_waits(
+        self, source_resume, job_posting, optimized_resume
+    ):
+        """evaluate_sync() runs off the loop, concurrently with awaiting filters."""
+        import asyncio
+        import threading
+
+        from hr_breaker.filters.base import BaseFilter, CPUFilter
+
+        local_started = threading.Event()
+        remote_started = threading.Event()
+        overlapped = {}
+
+        def result(name):
+            return FilterResult(filter_name=name, passed=True, score=1.0, threshold=0.5)
+
+        class LocalFilter(CPUFilter):
+            name = "LocalFilter"
+
+            def evaluate_sync(self, optimized, job, source):
+                local_started.set()
+                # Only reachable if the loop kept running the remote filter
+                overlapped[self.name] = remote_started.wait(timeout=5)
+                return result(self.name)
+
+        class RemoteFilter(BaseFilter):
+            name = "RemoteFilter"
+            local = False
+
+            async def evaluate(self, optimized, job, source):
+                remote_started.set()
+                overlapped[self.name] = await asyncio.to_thread(
+                    local_started.wait, 5
+                )
+                return result(self.name)
+
+        validation = await run_filters(
+            optimized_resume,
+            job_posting,
+            source_resume,
+            parallel=True,
+            filters=[LocalFilter, RemoteFilter],
+        )
+
+        assert validation.passed
+        assert overlapped == {"LocalFilter": True, "RemoteFilter": True}
+
+
+@dataclass
+class Pipeline:
+    """Stand-in optimizer, renderer and filter registry (see patched_pipeline).
+
+    Each optimizer call records its iteration, model_settings and
+    optimizer_mode, sleeps
+    `delay` and returns "<p>{iteration}</p>" unless `on_optimize(ctx)`
+    returns other HTML (or raises).
+    """
+
+    filters: list = field(default_factory=list)
+    on_optimize: Callable | None = None
+    delay: float = 0.0
+    calls: list[int] = field(default_factory=list)
+    model_settings: list = field(default_factory=list)
+    optimizer_modes: list = field(default_factory=list)
+
+
+@pytest.fixture
+def patched_pipeline():
+    from hr_breaker import orchestration
+
+    pipeline = Pipeline()
+
+    async def fake_optimize(
+        source, job, ctx, no_shame=False, model_settings=None, optimizer_mode=None
+    ):
+        pipeline.calls.append(ctx.iteration)
+        pipeline.model_settings.append(model_settings)
+        pipeline.optimizer_modes.append(optimizer_mode)
+        await asyncio.sleep(pipeline.delay)
+        html = pipeline.on_optimize(ctx) if pipeline.on_optimize else None
+        return OptimizedResume(
+            html=html or f"<p>{ctx.iteration}</p>",
+            source_checksum=source.checksum,
+            changes=["tweak"],
+        )
+
+    def fake_render(optimized):
+        return optimized.model_copy(
+            update={"pdf_text": optimized.html, "pdf_bytes": b"%PDF"}
+        )
+
+    def get_filter(name):
+        return {f.name: f for f in pipeline.filters}.get(name)
+
+    with (
+        patch.object(orchestration, "optimize_resume", fake_optimize),
+        patch.object(orchestration, "_render_and_extract", fake_render),
+        patch.object(orchestration.FilterRegistry, "all", lambda: pipeline.filters),
+        patch.object(orchestration.FilterRegistry, "get", get_filter),
+    ):
+        yield pipeline
+
+
+def _make_filter(name, priority, local, score_fn, calls=None, weight=1.0):
+    class _Filter:
+        threshold = 0.5
+
+        def __init__(self, **kwargs):
+            pass
+
+        async def evaluate(self, optimized, job, source):
+            if calls is not None:
+                calls.append(optimized.html)
+            score = score_fn(optimized)
+            return FilterResult(
+                filter_name=name,
+                passed=score >= 0.5,
+                score=score,
+                threshold=0.5,
+            )
+
+    _Filter.name = name
+    _Filter.priority = priority
+    _Filter.local = local
+    _Filter.weight = weight
+    return _Filter
+
+
+class TestSpeculativeCandidates:
+    @pytest.mark.asyncio
+    async def test_only_best_local_candidate_gets_remote_filters(
+        self, source_resume, job_posting, patched_pipeline
+    ):
+        from hr_breaker import orchestration
+
+        local_scores = {"<p>a</p>": 0.2, "<p>b</p>": 0.9, "<p>c</p>": 0.6}
+        remote_calls = []
+        htmls = iter(local_scores)
+        patched_pipeline.on_optimize = lambda ctx: next(htmls)
+        patched_pipeline.filters = [
+            _make_filter("Local", 1, True, lambda o: local_scores[o.html]),
+            _make_filter("Remote", 5, False, lambda o: 0.8, calls=remote_calls),
+        ]
+
+        optimized, validation, _ = await orchestration.optimize_for_job(
+            source_resume,
+            job=job_posting,
+            max_iterations=1,
+            parallel=True,
+            candidates=3,
+        )
+
+        assert optimized.html == "<p>b</p>"
+        assert remote_calls == ["<p>b</p>"]
+        assert validation.passed
+        assert [r.filter_name for r in validation.results] == ["Local", "Remote"]
+        assert len({s["seed"] for s in patched_pipeline.model_settings}) == 3
+
+
+class TestPipelinedIterations:
+    @pytest.mark.asyncio
+    async def test_next_optimizer_starts_before_llm_filters_finish(
+        self, source_resume, job_posting, patched_pipeline
+    ):
+        from hr_breaker import orchestration
+
+        remote_done = []
+        optimizer_calls = []
+
+        class SlowRemote:
+            name = "Remote"
+            priority = 5
+            local = False
+            weight = 1.0
+            threshold = 0.5
+
+            def __init__(self, **kwargs):
+                pass
+
+            async def evaluate(self, optimized, job, source):
+                await asyncio.sleep(0.05)
+                remote_done.append(optimized.html)
+                return FilterResult(
+                    filter_name="Remote", passed=True, score=0.9, threshold=0.5
+                )
+
+        def on_optimize(ctx):
+            names = (
+                [r.filter_name for r in ctx.validation.results]
+                if ctx.validation
+                else None
+            )
+            optimizer_calls.append((ctx.iteration, names, len(remote_done)))
+
+        patched_pipeline.on_optimize = on_optimize
+        patched_pipeline.filters = [
+            _make_filter("Local", 1, True, lambda o: 1.0 if o.html == "<p>2</p>" else 0.0),
+            SlowRemote,
+        ]
+
+        optimized, validation, _ = await orchestration.optimize_for_job(
+            source_resume,
+            job=job_posting,
+            max_iterations=3,
+            parallel=True,
+            pipelined=True,
+        )
+
+        assert optimized.html == "<p>2</p>"
+        assert validation.passed
+        # Iteration 2 started on local feedback only, before any LLM filter finished
+        assert optimizer_calls[1] == (1, ["Local"], 0)
+        # Iteration 3 got the late LLM feedback from iteration 1
+        assert optimizer_calls[2][1] == ["Local", "Remote"]
+        assert remote_done == ["<p>0</p>", "<p>1</p>", "<p>2</p>"]
+
+
+class TestOptimizeForJobStream:
+    @pytest.mark.asyncio
+    async def test_event_sequence(self, source_resume, job_posting, patched_pipeline):
+        from hr_breaker.orchestration import optimize_for_job_stream
+
+        patched_pipeline.delay = 0.01  # let the consumer run, like a real LLM call
+        patched_pipeline.filters = [
+            _make_filter("A", 1, True, lambda o: 1.0),
+            _make_filter("B", 2, False, lambda o: 0.9),
+        ]
+        kinds = [
+            e.kind
+            async for e in optimize_for_job_stream(
+                source_resume, job=job_posting, max_iterations=3, parallel=True
+            )
+        ]
+
+        assert kinds == [
+            "job_parsed",
+            "optimizer_started",
+            "optimizer_finished",
+            "render_finished",
+            "filter_finished",
+            "filter_finished",
+            "iteration_finished",
+            "run_finished",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cooperative_cancel_returns_last_iteration(
+        self, source_resume, job_posting, patched_pipeline
+    ):
+        import asyncio
+
+        from hr_breaker.models import FilterFinished, RunFinished
+        from hr_breaker.orchestration import optimize_for_job_stream
+
+        patched_pipeline.delay = 0.01
+        patched_pipeline.filters = [_make_filter("A", 1, True, lambda o: 0.0)]
+        cancel = asyncio.Event()
+        events = []
+        async for event in optimize_for_job_stream(
+            source_resume, job=job_posting, max_iterations=5, cancel=cancel
+        ):
+            events.append(event)
+            if isinstance(event, FilterFinished):
+                cancel.set()
+
+        final = events[-1]
+        assert isinstance(final, RunFinished)
+        assert final.cancelled
+        assert final.iterations == 1
+        assert final.optimized.html == "<p>0</p>"
+
+
+class TestRunBudget:
+    @pytest.mark.asyncio
+    async def test_llm_call_budget_stops_run_with_last_result(
+        self, source_resume, job_posting, patched_pipeline
+    ):
+        from pydantic_ai.messages import ModelResponse, TextPart
+        from pydantic_ai.usage import RequestUsage
+
+        from hr_breaker import orchestration
+        from hr_breaker.models import RunBudget, RunFinished
+        from hr_breaker.usage import record_response
+
+        def on_optimize(ctx):
+            record_response(ModelResponse(
+                parts=[TextPart("{}")],
+                usage=RequestUsage(input_tokens=1000, output_tokens=200),
+                model_name="unknown-test-model",
+            ))
+
+        patched_pipeline.on_optimize = on_optimize
+        patched_pipeline.filters = [_make_filter("A", 1, True, lambda o: 0.0)]
+        events = [
+            e
+            async for e in orchestration.optimize_for_job_stream(
+                source_resume,
+                job=job_posting,
+                max_iterations=5,
+                budget=RunBudget(max_output_tokens=300),
+            )
+        ]
+
+        final = events[-1]
+        assert isinstance(final, RunFinished)
+        assert "output token" in final.budget_exhausted
+        # Second call pushed output tokens to 400 - stopped before its filters
+        assert patched_pipeline.calls == [0, 1]
+        assert final.iterations == 1
+        assert final.optimized.html == "<p>0</p>"
+        assert final.usage.llm_calls == 2
+        assert final.usage.output_tokens == 400
+
+    @pytest.mark.asyncio
+    async def test_exhausted_before_first_iteration_raises(
+        self, source_resume, job_posting, patched_pipeline
+    ):
+        from hr_breaker import orchestration
+        from hr_breaker.models import RunBudget
+
+        with pytest.raises(orchestration.BudgetExceeded, match="deadline"):
+            await orchestration.optimize_for_job(
+                source_resume, job=job_posting, budget=RunBudget(deadline_seconds=0)
+            )
+        assert patched_pipeline.calls == []
+
+    def test_zero_deadline_through_cli(
+        self, tmp_path, monkeypatch, job_posting, patched_pipeline
+    ):
+        from click.testing import CliRunner
+
+        from hr_breaker import agents
+        from hr_breaker.cli import cli
+        from hr_breaker.config import get_settings
+
+        async def extract_name(content):
+            return "Jane", "Doe"
+
+        async def parse_job_posting(text):
+            return job_posting
+
+        monkeypatch.setattr(get_settings(), "llm_provider", "openai")
+        monkeypatch.setattr(get_settings(), "openai_api_key", "test-key")
+        monkeypatch.setattr(agents, "extract_name", extract_name)
+        monkeypatch.setattr(agents, "parse_job_posting", parse_job_posting)
+        resume = tmp_path / "resume.md"
+        resume.write_text("Jane Doe, Python engineer")
+        job = tmp_path / "job.txt"
+        job.write_text("Python engineer at Test Corp")
+
+        result = CliRunner().invoke(
+            cli,
+            ["optimize", str(resume), str(job), "--deadline", "0",
+             "-o", str(tmp_path / "out.pdf")],
+        )
+
+        assert result.exit_code == 1
+        assert "Budget exhausted before any iteration completed" in result.output
+        assert "No result saved" in result.output
+        assert not (tmp_path / "out.pdf").exists()
+        assert patched_pipeline.calls == []
+
+
+@pytest.mark.asyncio
+async def test_optimizer_mode_passed_per_run(
+    source_resume, job_posting, patched_pipeline, monkeypatch
+):
+    from hr_breaker import orchestration
+    from hr_breaker.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "optimizer_mode", "single")
+    patched_pipeline.filters = [_make_filter("A", 1, True, lambda o: 0.0)]
+
+    await orchestration.optimize_for_job(
+        source_resume, job=job_posting, max_iterations=2, optimizer_mode="sections"
+    )
+    await orchestration.optimize_for_job(source_resume, job=job_posting, max_iterations=1)
+
+    assert patched_pipeline.optimizer_modes == ["sections", "sections", "single"]
+    assert get_settings().optimizer_mode == "single"
+
+
+class TestBestIterationAndPlateau:
+    async def _run(self, pipeline, source_resume, job_posting, scores):
+        from hr_breaker import orchestration
+        from hr_breaker.models import RunFinished
+
+        pipeline.filters = [_make_filter("A", 1, True, lambda o: scores[int(o.html[3])])]
+        events = [
+            e
+            async for e in orchestration.optimize_for_job_stream(
+                source_resume, job=job_posting, max_iterations=len(scores)
+            )
+        ]
+        final = events[-1]
+        assert isinstance(final, RunFinished)
+        return final
+
+    @pytest.mark.asyncio
+    async def test_returns_best_iteration_not_last(
+        self, source_resume, job_posting, patched_pipeline
+    ):
+        final = await self._run(
+            patched_pipeline, source_resume, job_posting, [0.3, 0.45, 0.1]
+        )
+        assert final.iterations == 3
+        assert final.best_iteration == 1
+        assert final.optimized.html == "<p>1</p>"
+        assert not final.plateaued
+
+    @pytest.mark.asyncio
+    async def test_plateau_stop_is_opt_in(
+        self, source_resume, job_posting, patched_pipeline, monkeypatch
+    ):
+        from hr_breaker.config import get_settings
+
+        scores = [0.3, 0.305, 0.3, 0.31, 0.4]
+        final = await self._run(patched_pipeline, source_resume, job_posting, scores)
+        assert not final.plateaued
+        assert final.iterations == 5
+
+        monkeypatch.setattr(get_settings(), "plateau_patience", 2)
+        final = await self._run(patched_pipeline, source_resume, job_posting, scores)
+        assert final.plateaued
+        assert final.iterations == 3
+        assert final.best_iteration == 1
+
+    def test_aggregate_score_is_weighted_over_all_filters(self):
+        from hr_breaker import orchestration
+        from hr_breaker.models import ValidationResult
+
+        light = _make_filter("Light", 1, True, lambda o: 1.0)
+        heavy = _make_filter("Heavy", 2, False, lambda o: 1.0, weight=3.0)
+        validation = ValidationResult(results=[
+            FilterResult(filter_name="Light", passed=True, score=1.0, threshold=0.5),
+        ])
+        with patch("hr_breaker.orchestration.FilterRegistry.all") as mock_all:
+            mock_all.return_value = [light, heavy]
+            # Heavy never ran (early exit): counts as 0 with weight 3
+            assert orchestration._aggregate_score(validation) == pytest.approx(0.25)
+
+
+class TestResumeRun:
+    @pytest.fixture(autouse=True)
+    def checkpoints_on(self, monkeypatch):
+        from hr_breaker.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "checkpoints", True)
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_checkpointed_stages(
+        self, patched_pipeline, source_resume, job_posting
+    ):
+        from hr_breaker import orchestration
+        from hr_breaker.services import CheckpointStore
+
+        crash_at = {1}
+
+        def crash(ctx):
+            if ctx.iteration in crash_at:
+                raise RuntimeError("process died")
+
+        filter_calls = []
+        score_fn = lambda o: 1.0 if o.html == "<p>2</p>" else 0.2 * int(o.html[3])
+        patched_pipeline.on_optimize = crash
+        patched_pipeline.filters = [
+            _make_filter("A", 1, True, score_fn, calls=filter_calls)
+        ]
+        with pytest.raises(RuntimeError):
+            await orchestration.optimize_for_job(
+                source_resume, job=job_posting, max_iterations=3, run_id="r1"
+            )
+        checkpoint = CheckpointStore().get("r1")
+        assert [e.iteration for e in checkpoint.iterations] == [0]
+        assert checkpoint.iterations[0].optimized.pdf_bytes is None
+        assert not checkpoint.finished
+
+        crash_at.clear()
+        seen = []
+        optimized, validation, _ = await orchestration.resume_run(
+            "r1", on_iteration=lambda i, o, v: seen.append(i)
+        )
+
+        # Iteration 0 replayed from the checkpoint, not re-run
+        assert patched_pipeline.calls == [0, 1, 1, 2]
+        assert filter_calls == ["<p>0</p>", "<p>1</p>", "<p>2</p>"]
+        assert seen == [0, 1, 2]
+        assert validation.passed
+        assert optimized.html == "<p>2</p>"
+        assert CheckpointStore().get("r1").finished
+
+    @pytest.mark.asyncio
+    async def test_resume_reuses_optimizer_output_without_validation(
+        self, patched_pipeline, source_resume, job_posting
+    ):
+        from hr_breaker import orchestration
+        from hr_breaker.models import RunCheckpoint
+        from hr_breaker.services import CheckpointStore
+
+        checkpoint = RunCheckpoint(
+            run_id="r2", source=source_resume, job=job_posting, max_iterations=2
+        )
+        checkpoint.record(
+            0, OptimizedResume(html="<p>saved</p>", source_checksum=source_resume.checksum)
+        )
+        CheckpointStore().put(checkpoint)
+        patched_pipeline.filters = [_make_filter("A", 1, True, lambda o: 1.0)]
+
+        optimized, validation, _ = await orchestration.resume_run("r2")
+
+        assert patched_pipeline.calls == []
+        assert optimized.html == "<p>saved</p>"
+        assert validation.passed
+
+    @pytest.mark.asyncio
+    async def test_unknown_run_id_raises(self):
+        from hr_breaker import orchestration
+
+        with pytest.raises(ValueError, match="No checkpoint"):
+            await orchestration.resume_run("missing")
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_are_opt_in(
+        self, patched_pipeline, source_resume, job_posting, checkpoint_dir, monkeypatch
+    ):
+        from hr_breaker import orchestration
+        from hr_breaker.config import get_settings
+
+        monkeypatch.setattr(get_settings(), "checkpoints", False)
+        patched_pipeline.filters = [_make_filter("A", 1, True, lambda o: 1.0)]
+
+        await orchestration.optimize_for_job(
+            source_resume, job=job_posting, max_iterations=1, run_id="r3"
+        )
+
+        assert not checkpoint_dir.exists() or not any(checkpoint_dir.iterdir())
+
+    def test_prune_drops_expired_and_excess_runs(
+        self, source_resume, job_posting, monkeypatch
+    ):
+        import os
+        import time
+
+        from hr_breaker.config import get_settings
+        from hr_breaker.models import RunCheckpoint
+        from hr_breaker.services import CheckpointStore
+
+        monkeypatch.setattr(get_settings(), "checkpoint_retention_days", 1)
+        monkeypatch.setattr(get_settings(), "checkpoint_max_runs", 2)
+        store = CheckpointStore()
+        now = time.time()
+        for i, age in enumerate([0, 10, 20, 2 * 86400]):
+            run_id = f"r{i}"
+            store.put(
+                RunCheckpoint(
+                    run_id=run_id, source=source_resume, job=job_posting, max_iterations=1
+                )
+            )
+            os.utime(store._path(run_id), (now - age, now - age))
+
+        assert store.prune() == 2
+        assert [c.run_id for c in store.list_all()] == ["r1", "r0"]
+
+
+def test_run_budget_exhausted_by():
+    from hr_breaker.models import RunBudget, UsageTotals
+
+    usage = UsageTotals(input_tokens=10, llm_calls=3, cost_usd=0.5)
+    assert RunBudget().exhausted_by(usage) is None
+    assert RunBudget(max_llm_calls=4).exhausted_by(usage) is None
+    assert "call" in RunBudget(max_llm_calls=3).exhausted_by(usage)
+    assert "cost" in RunBudget(max_cost_usd=0.25).exhausted_by(usage)
+    assert "deadline" in RunBudget(deadline_seconds=0).exhausted_by(usage)
@@ -0,0 +1,68 @@
+"""Tests for the run profiler (stack sampling and event-loop lag)."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from hr_breaker.profiling import RunProfiler
+
+
+def busy_render(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_profiler_captures_blocking_work_and_loop_lag(tmp_path):
+    async def run():
+        await asyncio.sleep(0.1)
+        busy_render(0.3)  # Blocks the loop
+        await asyncio.to_thread(busy_render, 0.1)
+        return "done"
+
+    profiler = RunProfiler(sample_interval=0.002, lag_interval=0.02)
+    assert await profiler.run(run()) == "done"
+    files = profiler.write(tmp_path)
+
+    assert [f.name for f in files] == ["profile.folded", "profile_top.txt", "loop_lag.json"]
+    folded = (tmp_path / "profile.folded").read_text().splitlines()
+    busy = [line for line in folded if "busy_render (" in line.rsplit(";", 1)[-1]]
+    assert busy
+    # Worker-thread samples are attributed to that thread
+    assert any(not line.startswith("MainThread;") for line in busy)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+
+    lag = json.loads((tmp_path / "loop_lag.json").read_text())["summary"]
+    assert lag["max"] >= 0.2
+    assert "busy_render" in (tmp_path / "profile_top.txt").read_text()
+
+
+@pytest.mark.asyncio
+async def test_watchdog_reports_stall_with_stage_and_call_site(tmp_path):
+    from hr_breaker.profiling import LoopWatchdog
+    from hr_breaker.tracing import span
+
+    async def run():
+        with span("render"):
+            busy_render(0.25)
+        await asyncio.sleep(0.01)
+        await asyncio.to_thread(busy_render, 0.25)  # Off the loop: no stall
+
+    watchdog = LoopWatchdog(threshold=0.1)
+    await watchdog.run(run())
+
+    assert asyncio.events.Handle._run.__name__ == "_run"  # Unpatched again
+    assert len(watchdog.stalls) == 1
+    stall = watchdog.stalls[0]
+    assert stall["stage"] == "render"
+    assert stall["duration"] >= 0.25
+    assert stall["call_site"].startswith("busy_render (")
+    assert any("busy_render(0.25)" in line for line in stall["stack"])
+
+    [site] = watchdog.by_call_site()
+    assert site["count"] == 1 and site["stages"] == ["render"]
+    data = json.loads(watchdog.write(tmp_path).read_text())
+    assert data["by_call_site"][0]["call_site"] == stall["call_site"]
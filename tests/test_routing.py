@@ -0,0 +1,166 @@
+"""Tests for adaptive routing between the flash and pro models."""
+
+import json
+
+import pytest
+from pydantic_ai import UnexpectedModelBehavior
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from hr_breaker import metrics
+from hr_breaker.agents.factory import clear_agent_cache
+from hr_breaker.agents.hallucination_detector import detect_hallucinations
+from hr_breaker.agents.optimizer import optimize_resume
+from hr_breaker.config import get_settings
+from hr_breaker.models import (
+    FilterResult,
+    IterationContext,
+    JobPosting,
+    OptimizedResume,
+    ResumeSource,
+    ValidationResult,
+)
+from hr_breaker.provider import (
+    FLASH,
+    PRO,
+    choose_route,
+    override_models,
+    routing_scope,
+    run_routed,
+)
+
+HTML = '<header class="header"><h1 class="name">Jane Doe</h1></header>'
+
+
+@pytest.fixture
+def adaptive(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "model_routing", "adaptive")
+    monkeypatch.setattr(settings, "refine_mode", "full")
+    monkeypatch.setattr(settings, "openai_model", "pro-model")
+    monkeypatch.setattr(settings, "openai_flash_model", "flash-model")
+    clear_agent_cache()
+    yield
+    clear_agent_cache()
+
+
+def _failed(*names: str) -> ValidationResult:
+    return ValidationResult(
+        results=[
+            FilterResult(filter_name=n, passed=False, score=0.0, threshold=1.0)
+            for n in names
+        ]
+    )
+
+
+def test_routing_off_always_pro(monkeypatch):
+    monkeypatch.setattr(get_settings(), "model_routing", "off")
+    assert choose_route("optimizer", 2, ["KeywordMatcher"]) == PRO
+
+
+def test_choose_route(adaptive, monkeypatch):
+    assert choose_route("optimizer", 0) == PRO
+    assert choose_route("optimizer", 1, ["KeywordMatcher", "ContentLengthChecker"]) == FLASH
+    assert choose_route("optimizer", 1, ["KeywordMatcher", "LLMChecker"]) == PRO
+    monkeypatch.setattr(get_settings(), "routing_flash_max_prompt_chars", 500)
+    assert choose_route("optimizer", 1, ["KeywordMatcher"], prompt_chars=1000) == PRO
+
+
+def test_unfixed_flash_refinement_pins_stage_to_pro(adaptive):
+    failed_before = metrics.LLM_ROUTES.value(stage="optimizer", route=FLASH, outcome="failed")
+    with routing_scope():
+        assert choose_route("optimizer", 1, ["KeywordMatcher"]) == FLASH
+        # Fixed: stays on flash
+        assert choose_route("optimizer", 2, ["ContentLengthChecker"]) == FLASH
+        # ContentLengthChecker still failing: pro from now on
+        assert choose_route("optimizer", 3, ["ContentLengthChecker"]) == PRO
+        assert choose_route("optimizer", 4, ["DataValidator"]) == PRO
+    assert choose_route("optimizer", 1, ["KeywordMatcher"]) == FLASH
+    assert (
+        metrics.LLM_ROUTES.value(stage="optimizer", route=FLASH, outcome="failed")
+        == failed_before + 1
+    )
+
+
+def test_candidates_of_one_iteration_share_route(adaptive):
+    with routing_scope():
+        assert choose_route("optimizer", 1, ["KeywordMatcher"]) == FLASH
+        # Three concurrent candidates of iteration 2, KeywordMatcher fixed
+        routes = [choose_route("optimizer", 2, ["ContentLengthChecker"]) for _ in range(3)]
+        assert routes == [FLASH] * 3
+        # ContentLengthChecker still failing: every candidate escalates
+        routes = [choose_route("optimizer", 3, ["ContentLengthChecker"]) for _ in range(3)]
+        assert routes == [PRO] * 3
+
+
+@pytest.mark.asyncio
+async def test_run_routed_escalates_flash_errors(adaptive):
+    models = []
+
+    async def attempt(model):
+        models.append(model.model_name if model is not None else None)
+        if model is not None:
+            raise UnexpectedModelBehavior("bad output")
+        return "ok"
+
+    errors_before = metrics.LLM_ROUTES.value(stage="test", route=FLASH, outcome="error")
+    with override_models(lambda name: FunctionModel(lambda m, i: None, model_name=name)):
+        assert await run_routed("test", FLASH, attempt) == "ok"
+
+    assert models == ["flash-model", None]
+    assert metrics.LLM_ROUTES.value(stage="test", route=FLASH, outcome="error") == errors_before + 1
+    assert metrics.LLM_ROUTES.value(stage="test", route=PRO, outcome="ok") >= 1
+
+
+@pytest.mark.asyncio
+async def test_minor_refinement_runs_on_flash(adaptive):
+    served = []
+
+    def factory(name):
+        def respond(messages, info):
+            served.append(name)
+            return ModelResponse(
+                parts=[TextPart(json.dumps({"html": HTML, "changes": ["Added keywords"]}))]
+            )
+
+        return FunctionModel(respond, model_name=name)
+
+    source = ResumeSource(content="Jane Doe, Python developer")
+    job = JobPosting(title="Dev", company="Acme", keywords=["python"])
+    with override_models(factory):
+        await optimize_resume(
+            source, job, IterationContext(iteration=0, original_resume=source.content)
+        )
+        await optimize_resume(
+            source,
+            job,
+            IterationContext(
+                iteration=1,
+                original_resume=source.content,
+                last_attempt=HTML,
+                validation=_failed("KeywordMatcher"),
+            ),
+        )
+
+    assert served == ["pro-model", "flash-model"]
+
+
+@pytest.mark.asyncio
+async def test_hallucination_check_stays_on_pro(adaptive):
+    served = []
+
+    def factory(name):
+        def respond(messages, info):
+            served.append(name)
+            result = {"no_hallucination_score": 0.95, "concerns": [], "reasoning": "."}
+            return ModelResponse(parts=[TextPart(json.dumps(result))])
+
+        return FunctionModel(respond, model_name=name)
+
+    source = ResumeSource(content="Jane Doe, Python developer")
+    optimized = OptimizedResume(html=HTML, iteration=0, source_checksum=source.checksum)
+    with override_models(factory):
+        result = await detect_hallucinations(optimized, source)
+
+    assert served == ["pro-model"]
+    assert result.passed
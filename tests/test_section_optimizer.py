@@ -0,0 +1,224 @@
+"""Tests for section splitting and section-parallel optimization."""
+
+import asyncio
+import json
+import re
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from hr_breaker.agents.factory import clear_agent_cache
+from hr_breaker.agents.optimizer import optimize_resume
+from hr_breaker.agents.section_optimizer import assemble_sections
+from hr_breaker.config import get_settings
+from hr_breaker.filters.data_validator import validate_html
+from hr_breaker.models import IterationContext, JobPosting, RenderResult, ResumeSource
+from hr_breaker.provider import override_models
+from hr_breaker.services.section_splitter import section_budgets, split_sections
+
+RESUME = """Jane Doe
+jane@example.com | https://github.com/jane
+
+EXPERIENCE
+Acme - Senior Backend Engineer (2020-2024)
+- Built Django REST APIs serving 2M requests/day
+
+- Led migration of 40 services to Kubernetes
+
+Beta - Software Engineer (2018-2020)
+- Maintained PostgreSQL data pipelines
+
+Skills:
+Python, Django, PostgreSQL, Kubernetes
+
+## Education
+MIT BS CS 2018
+"""
+
+
+def test_split_sections():
+    sections = split_sections(RESUME)
+
+    assert [(s.kind, s.group) for s in sections] == [
+        ("header", 0),
+        ("experience", 1),
+        ("experience", 1),
+        ("skills", 2),
+        ("education", 3),
+    ]
+    # A bullet after a blank line stays in its entry
+    assert "Led migration" in sections[1].text
+    assert sections[2].text.startswith("Beta")
+    assert sections[4].text == "MIT BS CS 2018"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Jane Doe\nPython developer with 6 years of experience.",
+        "EXPERIENCE\nAcme\n\nSKILLS\nPython",  # no header
+    ],
+)
+def test_split_sections_unsplittable(text):
+    assert split_sections(text) == []
+
+
+def test_latex_headings():
+    latex = "\n".join([
+        r"\name{Jane Doe}",
+        r"\section{Experience}",
+        r"\cventry{2020}{Engineer}",
+        r"\cventry{2018}{Intern}",
+        r"\section*{Skills}",
+        "Python",
+    ])
+    kinds = [(s.kind, s.title) for s in split_sections(latex)]
+    assert kinds == [
+        ("header", ""),
+        ("experience", "Experience"),
+        ("experience", "Experience"),
+        ("skills", "Skills"),
+    ]
+
+
+def test_section_budgets_share_max_words():
+    sections = split_sections(RESUME)
+    budgets = section_budgets(sections)
+
+    assert budgets[0] == 0
+    assert budgets[1] > budgets[2] > 0
+    assert sum(budgets) <= get_settings().resume_max_words + 15 * len(sections)
+
+
+def test_assemble_wraps_experience_entries():
+    sections = split_sections(RESUME)
+    fragments = [
+        '<header class="header"><h1 class="name">Jane Doe</h1></header>',
+        '<div class="entry">Acme</div>',
+        '<div class="entry">Beta</div>',
+        '<section class="section"><h2 class="section-title">Skills</h2></section>',
+        '<section class="section"><h2 class="section-title">Education</h2></section>',
+    ]
+    html = assemble_sections(sections, fragments)
+
+    assert html.count("<section") == 3
+    assert re.search(
+        r'EXPERIENCE</h2>\s*<div class="section-content">\s*'
+        r'<div class="entry">Acme</div>\s*<div class="entry">Beta</div>',
+        html,
+    )
+    assert validate_html(html)[0]
+
+
+FRAGMENTS = {
+    "header": '<header class="header"><h1 class="name">Jane Doe</h1></header>',
+    "summary": '<section class="section"><h2 class="section-title">Summary</h2>'
+    '<div class="summary">Backend engineer</div></section>',
+    "experience": '<div class="entry"><ul class="bullets"><li>Built APIs</li></ul></div>',
+}
+OTHER = '<section class="section"><h2 class="section-title">{}</h2><p>...</p></section>'
+
+
+@pytest.fixture
+def section_mode(monkeypatch):
+    monkeypatch.setattr(get_settings(), "optimizer_mode", "sections")
+    renderer = MagicMock()
+    renderer.render.return_value = RenderResult(pdf_bytes=b"%PDF", page_count=1)
+    monkeypatch.setattr("hr_breaker.agents.optimizer.HTMLRenderer", lambda: renderer)
+    clear_agent_cache()
+    yield renderer
+    clear_agent_cache()
+
+
+def _part(messages) -> tuple[str, str]:
+    prompt = messages[0].parts[-1].content
+    kind, title = re.search(r"## Part To Write: (\w+) \((.+)\)", prompt).groups()
+    return kind, title
+
+
+@pytest.mark.asyncio
+async def test_sections_written_concurrently_and_assembled(section_mode):
+    active = 0
+    peak = 0
+    parts = []
+
+    async def respond(messages, info):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        kind, title = _part(messages)
+        parts.append(kind)
+        html = FRAGMENTS.get(kind, OTHER.format(title))
+        return ModelResponse(
+            parts=[TextPart(json.dumps({"html": html, "changes": [f"Wrote {kind}"]}))]
+        )
+
+    source = ResumeSource(content=RESUME)
+    context = IterationContext(iteration=0, original_resume=RESUME)
+    job = JobPosting(title="Backend Engineer", company="Acme")
+    with override_models(lambda name: FunctionModel(respond)):
+        optimized = await optimize_resume(source, job, context)
+
+    # header, summary (added), 2 entries, skills, education
+    assert sorted(parts) == sorted(
+        ["header", "summary", "experience", "experience", "skills", "education"]
+    )
+    assert peak == 6
+    html = optimized.html
+    assert html.index("Jane Doe") < html.index("Summary") < html.index("EXPERIENCE")
+    assert html.count('<div class="entry">') == 2
+    assert validate_html(html)[0]
+    assert "Wrote summary" in optimized.changes
+    section_mode.render.assert_called_once()  # fit pass: fits, no patch
+
+
+@pytest.mark.asyncio
+async def test_unsplittable_resume_uses_single_call(section_mode):
+    def respond(messages, info):
+        prompt = messages[0].parts[-1].content
+        assert "## Part To Write" not in prompt
+        return ModelResponse(
+            parts=[TextPart(json.dumps({"html": FRAGMENTS["header"], "changes": []}))]
+        )
+
+    content = "Jane Doe\nPython developer with 6 years of experience."
+    source = ResumeSource(content=content)
+    context = IterationContext(iteration=0, original_resume=content)
+    with override_models(lambda name: FunctionModel(respond)):
+        optimized = await optimize_resume(
+            source, JobPosting(title="Dev", company="Acme"), context
+        )
+
+    assert optimized.html == FRAGMENTS["header"]
+
+
+@pytest.mark.asyncio
+async def test_fit_pass_patches_overflowing_draft(section_mode):
+    section_mode.render.side_effect = [
+        RenderResult(pdf_bytes=b"%PDF", page_count=2),
+        RenderResult(pdf_bytes=b"%PDF", page_count=1),
+    ]
+
+    def respond(messages, info):
+        prompt = messages[0].parts[-1].content
+        if "- ops:" in prompt:
+            bullet = re.search(r'data-id="(li-\d+)"', prompt).group(1)
+            patch = {"ops": [{"op": "delete", "id": bullet}], "changes": ["Trimmed"]}
+            return ModelResponse(parts=[TextPart(json.dumps(patch))])
+        kind, title = _part(messages)
+        html = FRAGMENTS.get(kind, OTHER.format(title))
+        return ModelResponse(parts=[TextPart(json.dumps({"html": html, "changes": []}))])
+
+    source = ResumeSource(content=RESUME)
+    context = IterationContext(iteration=0, original_resume=RESUME)
+    with override_models(lambda name: FunctionModel(respond)):
+        optimized = await optimize_resume(
+            source, JobPosting(title="Dev", company="Acme"), context
+        )
+
+    assert optimized.html.count("<li>Built APIs</li>") == 1
+    assert optimized.changes == ["Trimmed"]
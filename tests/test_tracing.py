@@ -0,0 +1,128 @@
+"""Tests for tracing spans and their exports."""
+
+import asyncio
+
+import pytest
+
+from hr_breaker import tracing
+from hr_breaker.config import get_settings
+
+
+@pytest.fixture
+def finished_spans():
+    spans = []
+    tracing.add_span_listener(spans.append)
+    yield spans
+    tracing.remove_span_listener(spans.append)
+
+
+class TestSpans:
+    def test_nested_spans_share_trace_and_link_parent(self, finished_spans):
+        with tracing.span("run") as run:
+            with tracing.span("iteration", iteration=0) as iteration:
+                iteration.set(score=0.5)
+
+        assert [s.name for s in finished_spans] == ["iteration", "run"]
+        assert iteration.trace_id == run.trace_id
+        assert iteration.parent_id == run.span_id
+        assert run.parent_id is None
+        assert iteration.attributes == {"iteration": 0, "score": 0.5}
+        assert tracing.current_span() is None
+
+    @pytest.mark.asyncio
+    async def test_tasks_nest_under_spawning_span(self, finished_spans):
+        async def child(name):
+            with tracing.span(name):
+                await asyncio.sleep(0)
+
+        with tracing.span("filters") as parent:
+            await asyncio.gather(child("filter:A"), child("filter:B"))
+
+        children = [s for s in finished_spans if s.name.startswith("filter:")]
+        assert len(children) == 2
+        assert all(s.parent_id == parent.span_id for s in children)
+
+    def test_error_is_recorded_and_reraised(self, finished_spans):
+        with pytest.raises(ValueError):
+            with tracing.span("render"):
+                raise ValueError("boom")
+        assert finished_spans[0].error == "ValueError: boom"
+
+    @pytest.mark.asyncio
+    async def test_traced_decorator_keeps_signature(self, finished_spans):
+        @tracing.traced("tool:check")
+        def check(html: str) -> dict:
+            """Docstring."""
+            return {"len": len(html)}
+
+        @tracing.traced("tool:acheck")
+        async def acheck(html: str) -> int:
+            return len(html)
+
+        assert check("abc") == {"len": 3}
+        assert await acheck("ab") == 2
+        assert check.__doc__ == "Docstring."
+        assert check.__annotations__ == {"html": str, "return": dict}
+        assert [s.name for s in finished_spans] == ["tool:check", "tool:acheck"]
+
+
+def test_jsonl_export_and_summary(tmp_path, monkeypatch):
+    trace_file = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(get_settings(), "trace_file", trace_file)
+
+    for _ in range(2):
+        with tracing.span("run"):
+            with tracing.span("optimizer"):
+                pass
+    tracing.flush_traces()
+    trace_file.open("a").write("{corrupt\n")
+
+    spans = tracing.load_spans(trace_file)
+    assert [s["name"] for s in spans] == ["optimizer", "run"] * 2
+    rows = {r["stage"]: r for r in tracing.summarize(spans)}
+    assert rows["run"]["count"] == 2
+    assert rows["optimizer"]["p50"] <= rows["optimizer"]["p95"] <= rows["optimizer"]["max"]
+
+
+def test_summary_percentiles():
+    spans = [{"name": "filter:A", "duration": float(d)} for d in range(1, 101)]
+    (row,) = tracing.summarize(spans)
+    assert row["p50"] == 50.0
+    assert row["p95"] == 95.0
+    assert row["max"] == 100.0
+    assert row["total"] == 5050.0
+
+
+def test_otlp_payload():
+    with tracing.span("run", run_id="r1") as run:
+        with tracing.span("llm_request", key_index=1, input_tokens=10) as request:
+            pass
+
+    payload = tracing.to_otlp([request, run])
+    spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert spans[0]["parentSpanId"] == run.span_id
+    assert "parentSpanId" not in spans[1]
+    assert len(spans[0]["traceId"]) == 32 and len(spans[0]["spanId"]) == 16
+    assert {"key": "key_index", "value": {"intValue": "1"}} in spans[0]["attributes"]
+    assert spans[1]["status"] == {"code": 1}
+
+
+@pytest.mark.asyncio
+async def test_late_span_exported_after_its_root(monkeypatch):
+    batches = []
+    monkeypatch.setattr(get_settings(), "otlp_endpoint", "http://collector:4318")
+    monkeypatch.setattr(
+        tracing, "_send_otlp", lambda endpoint, spans: batches.append([s.name for s in spans])
+    )
+
+    async def late():
+        await asyncio.sleep(0.01)
+        with tracing.span("late"):
+            pass
+
+    with tracing.span("run") as run:
+        task = asyncio.ensure_future(late())
+    await task
+
+    assert batches == [["run"], ["late"]]
+    assert run.trace_id not in tracing._pending
@@ -0,0 +1,69 @@
+"""Tests for the warm-up routine."""
+
+from unittest.mock import patch
+
+import pytest
+from pydantic_ai.models.test import TestModel
+
+from hr_breaker.provider import override_models
+from hr_breaker.warmup import warmup
+
+
+def _sample_pdf(optimized):
+    import fitz
+
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), optimized.pdf_text)
+    return optimized.model_copy(update={"pdf_bytes": doc.tobytes()})
+
+
+@pytest.mark.asyncio
+async def test_warmup_runs_every_step():
+    with patch("hr_breaker.warmup._render_sample", _sample_pdf):
+        with override_models(lambda name: TestModel()):
+            steps = await warmup()
+
+    names = [s.name for s in steps]
+    assert names[0] == "render" and names[-1] == "agents"
+    assert "filter:KeywordMatcher" in names
+    assert all(s.ok for s in steps), [s.error for s in steps if not s.ok]
+    assert all(s.seconds >= 0 for s in steps)
+
+
+@pytest.mark.asyncio
+async def test_warmup_reports_failed_steps_and_continues():
+    def no_keys(name):
+        raise RuntimeError("no keys")
+
+    with override_models(no_keys):
+        steps = await warmup()
+
+    agents = steps[-1]
+    assert agents.name == "agents" and agents.error == "RuntimeError: no keys"
+    assert any(s.name.startswith("filter:") and s.ok for s in steps)
+
+
+@pytest.mark.asyncio
+async def test_warmup_renders_on_every_cpu_worker(monkeypatch):
+    import threading
+
+    from hr_breaker.config import get_settings
+    from hr_breaker.executor import shutdown_cpu_executor
+
+    threads = set()
+
+    def sample_pdf(optimized):
+        threads.add(threading.current_thread().name)
+        return _sample_pdf(optimized)
+
+    monkeypatch.setattr(get_settings(), "cpu_workers", 3)
+    shutdown_cpu_executor()
+    try:
+        with patch("hr_breaker.warmup._render_sample", sample_pdf):
+            with override_models(lambda name: TestModel()):
+                steps = await warmup()
+    finally:
+        shutdown_cpu_executor()
+
+    assert steps[0].name == "render" and steps[0].ok
+    assert len(threads) == 3